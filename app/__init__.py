@@ -3,7 +3,12 @@ from flask_cors import CORS
 from app.config import Config
 from app.routes import register_routes
 from app.models.base import db
-from app.models import User, LLM, Usage
+from app.models import User, LLM, Usage, ApiKey, UserUsage
+from app.services.llm_routing_table import register_routing_table_hooks
+from app.services.auth_cache_service import register_auth_cache_hooks
+from app.middleware.metrics_middleware import register_metrics_middleware
+from app.middleware.tracing_middleware import register_tracing_middleware
+from app.utils.json_codec import JsonCodecProvider, json_backend
 from app.utils.logger import setup_logger
 
 logger = setup_logger('app')
@@ -13,12 +18,21 @@ __all__ = ['create_app', 'db', 'logger']
 def create_app(config_class=Config):
     app = Flask(__name__)
     app.config.from_object(config_class)
+    app.json = JsonCodecProvider(app)
     
-    logger.info('Inicializando aplicación Flask')
+    logger.info('Inicializando aplicación Flask (backend JSON: %s)', json_backend.name)
     
     db.init_app(app)
+    register_routing_table_hooks()
+    register_auth_cache_hooks()
     CORS(app)
     
+    if app.config['METRICS_ENABLED']:
+        register_metrics_middleware(app)
+    
+    if app.config['TRACING_ENABLED']:
+        register_tracing_middleware(app)
+    
     register_routes(app)
     
     logger.info('Aplicación Flask inicializada correctamente')
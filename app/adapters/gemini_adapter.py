@@ -1,8 +1,164 @@
-from typing import Dict, Any, List
+from typing import Dict, Any, List, Callable, Optional, Sequence, Tuple
+from app.utils.response_fields import RESPONSE_FIELDS
 from app.utils.logger import get_logger
 
 logger = get_logger(__name__)
 
+INTERACTION_ATTRIBUTES = (
+    'outputs',
+    'response',
+    'text',
+    'model',
+    'usage',
+    'finish_reason',
+    'safety_ratings',
+    'citations',
+    'grounding_metadata'
+)
+
+USAGE_ATTRIBUTES = (
+    ('prompt_tokens', 'prompt_token_count', 'prompt_tokens'),
+    ('completion_tokens', 'completion_token_count', 'completion_tokens'),
+    ('total_tokens', 'total_token_count', 'total_tokens')
+)
+
+MAX_CACHED_PLANS = 1024
+
+_STREAM_FIELDS = ('model', 'usage', 'finish_reason')
+
+_FIELD_DEFAULTS: Dict[str, Callable[[], Any]] = {
+    'text': lambda: None,
+    'content': lambda: None,
+    'outputs': list,
+    'model': lambda: None,
+    'usage': dict,
+    'finish_reason': lambda: None,
+    'safety_ratings': list,
+    'citations': list,
+    'grounding_metadata': lambda: None
+}
+
+_plan_cache: Dict[Any, List[Tuple[str, Callable[[Any], Any]]]] = {}
+
+
+def _shape(obj: Any) -> Any:
+    instance_dict = getattr(obj, '__dict__', None)
+    return type(obj) if instance_dict is None else (type(obj), tuple(instance_dict))
+
+
+def _map_ratings(ratings: Any) -> List[Dict[str, Any]]:
+    return [
+        {
+            'category': getattr(rating, 'category', None),
+            'probability': getattr(rating, 'probability', None),
+            'blocked': getattr(rating, 'blocked', None)
+        } for rating in ratings
+    ]
+
+
+def _map_citations(citations: Any) -> List[Dict[str, Any]]:
+    return [
+        {
+            'start_index': getattr(citation, 'start_index', None),
+            'end_index': getattr(citation, 'end_index', None),
+            'uri': getattr(citation, 'uri', None),
+            'title': getattr(citation, 'title', None),
+            'license': getattr(citation, 'license', None)
+        } for citation in citations
+    ]
+
+
+def _map_outputs(outputs: Any) -> List[Dict[str, Any]]:
+    mapped_outputs = []
+    for output in outputs:
+        output_data = {
+            'type': getattr(output, 'type', None),
+            'text': getattr(output, 'text', None),
+            'content': getattr(output, 'content', None)
+        }
+        
+        if hasattr(output, 'safety_ratings'):
+            output_data['safety_ratings'] = _map_ratings(output.safety_ratings)
+        if hasattr(output, 'citations'):
+            output_data['citations'] = _map_citations(output.citations)
+        
+        mapped_outputs.append(output_data)
+    return mapped_outputs
+
+
+def _outputs_text(interaction: Any) -> Optional[str]:
+    texts = [text for text in (getattr(output, 'text', None) for output in interaction.outputs or ()) if text]
+    return '\n'.join(texts) if texts else None
+
+
+def _response_attribute(name: str, fallback: Callable[[Any], Any]) -> Callable[[Any], Any]:
+    def extract(interaction: Any) -> Any:
+        response = interaction.response
+        if hasattr(response, name):
+            return getattr(response, name)
+        return fallback(interaction)
+    
+    return extract
+
+
+def _map_usage(usage: Any) -> Dict[str, Any]:
+    return {
+        key: getattr(usage, primary, None) or getattr(usage, fallback, None)
+        for key, primary, fallback in USAGE_ATTRIBUTES
+    }
+
+
+def _none(interaction: Any) -> None:
+    return None
+
+
+def _extractor(field: str, present: Tuple[str, ...]) -> Callable[[Any], Any]:
+    if field == 'text':
+        fallback = _outputs_text if 'outputs' in present else _none
+        if 'text' in present:
+            return lambda interaction: interaction.text
+        if 'response' in present:
+            return _response_attribute('text', fallback)
+        return fallback
+    
+    if field == 'content':
+        return _response_attribute('content', _none) if 'response' in present else _none
+    
+    if field not in present:
+        default = _FIELD_DEFAULTS[field]
+        return lambda interaction: default()
+    
+    if field == 'outputs':
+        return lambda interaction: _map_outputs(interaction.outputs or ())
+    if field == 'model':
+        return lambda interaction: str(interaction.model)
+    if field == 'usage':
+        return lambda interaction: _map_usage(interaction.usage)
+    if field == 'finish_reason':
+        return lambda interaction: str(interaction.finish_reason)
+    if field == 'safety_ratings':
+        return lambda interaction: _map_ratings(interaction.safety_ratings)
+    if field == 'citations':
+        return lambda interaction: _map_citations(interaction.citations)
+    if field == 'grounding_metadata':
+        return lambda interaction: {
+            'web_search_queries': getattr(interaction.grounding_metadata, 'web_search_queries', []),
+            'grounding_chunks': getattr(interaction.grounding_metadata, 'grounding_chunks', [])
+        }
+    raise ValueError(f'Campo de respuesta desconocido: {field}')
+
+
+def _get_plan(interaction: Any, fields: Tuple[str, ...]) -> List[Tuple[str, Callable[[Any], Any]]]:
+    key = (_shape(interaction), fields)
+    plan = _plan_cache.get(key)
+    if plan is None:
+        present = tuple(name for name in INTERACTION_ATTRIBUTES if hasattr(interaction, name))
+        plan = [(field, _extractor(field, present)) for field in fields]
+        if len(_plan_cache) >= MAX_CACHED_PLANS:
+            _plan_cache.clear()
+        _plan_cache[key] = plan
+    return plan
+
 
 class GeminiAdapter:
     @staticmethod
@@ -19,108 +175,45 @@ class GeminiAdapter:
         return mapped_messages
     
     @staticmethod
-    def map_response(interaction: Any) -> Dict[str, Any]:
-        mapped_response = {
+    def map_response(interaction: Any, fields: Optional[Sequence[str]] = None) -> Dict[str, Any]:
+        fields = RESPONSE_FIELDS if fields is None else tuple(fields)
+        mapped_response = {}
+        
+        try:
+            for field, extract in _get_plan(interaction, fields):
+                mapped_response[field] = extract(interaction)
+        except Exception as e:
+            logger.warning('Error al mapear respuesta: %s', e)
+            for field in fields:
+                if field not in mapped_response:
+                    mapped_response[field] = _FIELD_DEFAULTS[field]()
+        
+        return mapped_response
+    
+    @staticmethod
+    def map_stream_event(event: Any) -> Dict[str, Any]:
+        mapped_chunk = {
             'text': None,
-            'content': None,
-            'outputs': [],
             'model': None,
-            'usage': {},
-            'finish_reason': None,
-            'safety_ratings': [],
-            'citations': [],
-            'grounding_metadata': None
+            'usage': None,
+            'finish_reason': None
         }
         
         try:
-            if hasattr(interaction, 'outputs') and interaction.outputs:
-                for output in interaction.outputs:
-                    output_data = {
-                        'type': getattr(output, 'type', None),
-                        'text': getattr(output, 'text', None),
-                        'content': getattr(output, 'content', None)
-                    }
-                    
-                    if hasattr(output, 'safety_ratings'):
-                        output_data['safety_ratings'] = [
-                            {
-                                'category': getattr(rating, 'category', None),
-                                'probability': getattr(rating, 'probability', None),
-                                'blocked': getattr(rating, 'blocked', None)
-                            } for rating in output.safety_ratings
-                        ]
-                    
-                    if hasattr(output, 'citations'):
-                        output_data['citations'] = [
-                            {
-                                'start_index': getattr(citation, 'start_index', None),
-                                'end_index': getattr(citation, 'end_index', None),
-                                'uri': getattr(citation, 'uri', None),
-                                'title': getattr(citation, 'title', None),
-                                'license': getattr(citation, 'license', None)
-                            } for citation in output.citations
-                        ]
-                    
-                    mapped_response['outputs'].append(output_data)
-                    
-                    if output_data['text']:
-                        if mapped_response['text']:
-                            mapped_response['text'] += '\n' + output_data['text']
-                        else:
-                            mapped_response['text'] = output_data['text']
-            
-            if hasattr(interaction, 'response'):
-                response_obj = interaction.response
-                if hasattr(response_obj, 'text'):
-                    mapped_response['text'] = response_obj.text
-                if hasattr(response_obj, 'content'):
-                    mapped_response['content'] = response_obj.content
-            
-            if hasattr(interaction, 'text'):
-                mapped_response['text'] = interaction.text
+            event_type = str(getattr(event, 'event_type', '') or '')
             
-            if hasattr(interaction, 'model'):
-                mapped_response['model'] = str(interaction.model)
-            
-            if hasattr(interaction, 'usage'):
-                usage = interaction.usage
-                mapped_response['usage'] = {
-                    'prompt_tokens': getattr(usage, 'prompt_token_count', None) or getattr(usage, 'prompt_tokens', None),
-                    'completion_tokens': getattr(usage, 'completion_token_count', None) or getattr(usage, 'completion_tokens', None),
-                    'total_tokens': getattr(usage, 'total_token_count', None) or getattr(usage, 'total_tokens', None)
-                }
-            
-            if hasattr(interaction, 'finish_reason'):
-                mapped_response['finish_reason'] = str(interaction.finish_reason)
-            
-            if hasattr(interaction, 'safety_ratings'):
-                mapped_response['safety_ratings'] = [
-                    {
-                        'category': getattr(rating, 'category', None),
-                        'probability': getattr(rating, 'probability', None),
-                        'blocked': getattr(rating, 'blocked', None)
-                    } for rating in interaction.safety_ratings
-                ]
-            
-            if hasattr(interaction, 'citations'):
-                mapped_response['citations'] = [
-                    {
-                        'start_index': getattr(citation, 'start_index', None),
-                        'end_index': getattr(citation, 'end_index', None),
-                        'uri': getattr(citation, 'uri', None),
-                        'title': getattr(citation, 'title', None),
-                        'license': getattr(citation, 'license', None)
-                    } for citation in interaction.citations
-                ]
-            
-            if hasattr(interaction, 'grounding_metadata'):
-                grounding = interaction.grounding_metadata
-                mapped_response['grounding_metadata'] = {
-                    'web_search_queries': getattr(grounding, 'web_search_queries', []),
-                    'grounding_chunks': getattr(grounding, 'grounding_chunks', [])
-                }
+            delta = getattr(event, 'delta', None)
+            if delta is not None and getattr(delta, 'type', 'text') == 'text':
+                mapped_chunk['text'] = getattr(delta, 'text', None)
             
+            if event_type.startswith('interaction.complete'):
+                interaction = getattr(event, 'interaction', None)
+                if interaction is not None:
+                    completed = GeminiAdapter.map_response(interaction, _STREAM_FIELDS)
+                    mapped_chunk['model'] = completed['model']
+                    mapped_chunk['usage'] = completed['usage'] or None
+                    mapped_chunk['finish_reason'] = completed['finish_reason'] or 'stop'
         except Exception as e:
-            logger.warning(f'Error al mapear respuesta: {str(e)}')
+            logger.warning('Error al mapear evento de streaming: %s', e)
         
-        return mapped_response
+        return mapped_chunk
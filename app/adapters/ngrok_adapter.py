@@ -1,4 +1,5 @@
-from typing import Dict, Any, List
+from typing import Dict, Any, List, Optional, Sequence
+from app.utils.response_fields import project_response
 from app.utils.logger import get_logger
 
 logger = get_logger(__name__)
@@ -10,7 +11,7 @@ class NgrokAdapter:
         return messages
     
     @staticmethod
-    def map_response(response: Any) -> Dict[str, Any]:
+    def map_response(response: Any, fields: Optional[Sequence[str]] = None) -> Dict[str, Any]:
         mapped_response = {
             'text': None,
             'content': None,
@@ -28,6 +29,32 @@ class NgrokAdapter:
             else:
                 logger.warning('Respuesta de NGROK en formato no esperado')
         except Exception as e:
-            logger.warning(f'Error al mapear respuesta de NGROK: {str(e)}')
+            logger.warning('Error al mapear respuesta de NGROK: %s', e)
         
-        return mapped_response
+        return project_response(mapped_response, fields)
+    
+    @staticmethod
+    def map_stream_chunk(chunk: Any) -> Dict[str, Any]:
+        mapped_chunk = {
+            'text': None,
+            'model': None,
+            'usage': None,
+            'finish_reason': None
+        }
+        
+        try:
+            if isinstance(chunk, dict):
+                mapped_chunk['model'] = chunk.get('model')
+                mapped_chunk['usage'] = chunk.get('usage') or None
+                choices = chunk.get('choices') or []
+                if choices:
+                    choice = choices[0]
+                    delta = choice.get('delta') or {}
+                    mapped_chunk['text'] = delta.get('content')
+                    mapped_chunk['finish_reason'] = choice.get('finish_reason')
+            else:
+                logger.warning('Chunk de streaming de NGROK en formato no esperado')
+        except Exception as e:
+            logger.warning('Error al mapear chunk de streaming de NGROK: %s', e)
+        
+        return mapped_chunk
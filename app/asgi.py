@@ -0,0 +1,124 @@
+import io
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Awaitable, Callable, Dict, Optional
+from asgiref.sync import SyncToAsync
+from asgiref.wsgi import WsgiToAsgiInstance
+from flask import Flask, Response, request
+from werkzeug.exceptions import HTTPException
+from app.routes.llm import async_views as default_async_views
+from app.services.redis_service import close_async_redis_client
+from app.services.usage_flusher import start_usage_flusher
+from app.utils.http_client import close_async_http_clients
+from app.utils.logger import get_logger
+
+logger = get_logger(__name__)
+
+
+class _WsgiInstance(WsgiToAsgiInstance):
+    def __init__(self, wsgi_application, executor: ThreadPoolExecutor):
+        super().__init__(wsgi_application)
+        self.run_wsgi_app = SyncToAsync(
+            WsgiToAsgiInstance.__dict__['run_wsgi_app'].func.__get__(self),
+            thread_sensitive=False,
+            executor=executor
+        )
+
+
+class AsyncViewDispatcher:
+    def __init__(
+        self,
+        app: Flask,
+        async_views: Optional[Dict[str, Callable[..., Awaitable[Any]]]] = None,
+        wsgi_threads: Optional[int] = None
+    ):
+        self.app = app
+        self.async_views = default_async_views if async_views is None else async_views
+        self.wsgi_executor = ThreadPoolExecutor(
+            max_workers=wsgi_threads or app.config['ASGI_WSGI_THREADS'],
+            thread_name_prefix='asgi-wsgi'
+        )
+    
+    async def __call__(self, scope, receive, send):
+        if scope['type'] == 'lifespan':
+            await self._lifespan(receive, send)
+            return
+        
+        view = self._match(scope) if scope['type'] == 'http' else None
+        if view is None:
+            await _WsgiInstance(self.app, self.wsgi_executor)(scope, receive, send)
+            return
+        
+        await self._dispatch(view, scope, receive, send)
+    
+    def _match(self, scope) -> Optional[Callable[..., Awaitable[Any]]]:
+        adapter = self.app.url_map.bind('localhost', script_name=scope.get('root_path') or None)
+        try:
+            endpoint, _ = adapter.match(scope['path'], method=scope['method'])
+        except HTTPException:
+            return None
+        return self.async_views.get(endpoint)
+    
+    @staticmethod
+    async def _read_body(receive) -> bytes:
+        body = bytearray()
+        while True:
+            message = await receive()
+            body.extend(message.get('body', b''))
+            if not message.get('more_body'):
+                return bytes(body)
+    
+    async def _full_dispatch(self, view: Callable[..., Awaitable[Any]]) -> Response:
+        try:
+            rv = self.app.preprocess_request()
+            if rv is None:
+                rv = await view(**(request.view_args or {}))
+        except Exception as e:
+            rv = self.app.handle_user_exception(e)
+        return self.app.finalize_request(rv)
+    
+    def _build_environ(self, scope, body: bytes) -> Dict[str, Any]:
+        instance = WsgiToAsgiInstance(self.app)
+        instance.scope = scope
+        return instance.build_environ(scope, io.BytesIO(body))
+    
+    async def _dispatch(self, view: Callable[..., Awaitable[Any]], scope, receive, send):
+        ctx = self.app.request_context(self._build_environ(scope, await self._read_body(receive)))
+        error = None
+        ctx.push()
+        try:
+            try:
+                response = await self._full_dispatch(view)
+            except Exception as e:
+                error = e
+                response = self.app.handle_exception(e)
+            data = response.get_data()
+        finally:
+            ctx.pop(error)
+        
+        await send({
+            'type': 'http.response.start',
+            'status': response.status_code,
+            'headers': [
+                (name.lower().encode('latin-1'), value.encode('latin-1'))
+                for name, value in response.headers.items()
+            ]
+        })
+        await send({'type': 'http.response.body', 'body': data})
+    
+    async def _lifespan(self, receive, send):
+        while True:
+            message = await receive()
+            if message['type'] == 'lifespan.startup':
+                start_usage_flusher(self.app)
+                logger.info('Servidor ASGI iniciado (%s vistas asíncronas)', len(self.async_views))
+                await send({'type': 'lifespan.startup.complete'})
+            elif message['type'] == 'lifespan.shutdown':
+                await close_async_http_clients()
+                await close_async_redis_client()
+                self.wsgi_executor.shutdown(wait=False)
+                await send({'type': 'lifespan.shutdown.complete'})
+                return
+
+
+def create_asgi_app(app: Flask) -> AsyncViewDispatcher:
+    return AsyncViewDispatcher(app)
@@ -1,3 +1,4 @@
+import json
 import os
 from datetime import timedelta
 
@@ -16,8 +17,116 @@ class Config:
     EXTERNAL_API_TIMEOUT = int(os.environ.get('EXTERNAL_API_TIMEOUT', '30'))
     EXTERNAL_API_MAX_RETRIES = int(os.environ.get('EXTERNAL_API_MAX_RETRIES', '3'))
     
+    HTTP_POOL_CONNECTIONS = int(os.environ.get('HTTP_POOL_CONNECTIONS', '10'))
+    HTTP_POOL_MAXSIZE = int(os.environ.get('HTTP_POOL_MAXSIZE', '20'))
+    HTTP_CONNECT_TIMEOUT = float(os.environ.get('HTTP_CONNECT_TIMEOUT', '5'))
+    HTTP_RETRY_BACKOFF_FACTOR = float(os.environ.get('HTTP_RETRY_BACKOFF_FACTOR', '0.5'))
+    HTTP_RETRY_STATUS_FORCELIST = tuple(
+        int(status) for status in os.environ.get('HTTP_RETRY_STATUS_FORCELIST', '502,503,504').split(',') if status.strip()
+    )
+    
     RATE_LIMIT_ENABLED = os.environ.get('RATE_LIMIT_ENABLED', 'true').lower() == 'true'
     RATE_LIMIT_PER_MINUTE = int(os.environ.get('RATE_LIMIT_PER_MINUTE', '60'))
     
+    QUOTA_ENABLED = os.environ.get('QUOTA_ENABLED', 'true').lower() == 'true'
+    QUOTA_DEFAULT_TIER = os.environ.get('QUOTA_DEFAULT_TIER', 'free')
+    QUOTA_TIERS = json.loads(os.environ.get('QUOTA_TIERS') or json.dumps({
+        'free': {'rpm': 20, 'burst': 5, 'tpm': 40000},
+        'pro': {'rpm': 120, 'burst': 20, 'tpm': 400000},
+        'unlimited': {'rpm': 0, 'burst': 0, 'tpm': 0}
+    }))
+    
+    BATCH_MAX_ITEMS = int(os.environ.get('BATCH_MAX_ITEMS', '500'))
+    BATCH_MAX_CONCURRENCY = int(os.environ.get('BATCH_MAX_CONCURRENCY', '32'))
+    BATCH_CAPACITY_WAIT = float(os.environ.get('BATCH_CAPACITY_WAIT', '120'))
+    
+    ASGI_WSGI_THREADS = int(os.environ.get('ASGI_WSGI_THREADS', '32'))
+    
+    JOB_STREAM_KEY = os.environ.get('JOB_STREAM_KEY', 'chat:jobs')
+    JOB_CONSUMER_GROUP = os.environ.get('JOB_CONSUMER_GROUP', 'chat-workers')
+    JOB_STREAM_MAXLEN = int(os.environ.get('JOB_STREAM_MAXLEN', '100000'))
+    JOB_RESULT_TTL = int(os.environ.get('JOB_RESULT_TTL', '86400'))
+    JOB_MAX_DELIVERIES = int(os.environ.get('JOB_MAX_DELIVERIES', '3'))
+    JOB_CLAIM_IDLE_MS = int(os.environ.get('JOB_CLAIM_IDLE_MS', '300000'))
+    JOB_RETRY_BACKOFF_MS = int(os.environ.get('JOB_RETRY_BACKOFF_MS', '2000'))
+    JOB_READ_BLOCK_MS = int(os.environ.get('JOB_READ_BLOCK_MS', '5000'))
+    JOB_WORKER_PROCESSES = int(os.environ.get('JOB_WORKER_PROCESSES', '2'))
+    JOB_WEBHOOK_ALLOWED_HOSTS = [
+        host.strip().lower() for host in os.environ.get('JOB_WEBHOOK_ALLOWED_HOSTS', '').split(',') if host.strip()
+    ]
+    JOB_WEBHOOK_ALLOW_PRIVATE = os.environ.get('JOB_WEBHOOK_ALLOW_PRIVATE', 'false').lower() == 'true'
+    JOB_WEBHOOK_POOL_SIZE = int(os.environ.get('JOB_WEBHOOK_POOL_SIZE', '10'))
+    
+    SINGLE_FLIGHT_ENABLED = os.environ.get('SINGLE_FLIGHT_ENABLED', 'true').lower() == 'true'
+    SINGLE_FLIGHT_DISTRIBUTED = os.environ.get('SINGLE_FLIGHT_DISTRIBUTED', 'false').lower() == 'true'
+    SINGLE_FLIGHT_LOCK_TTL = int(os.environ.get('SINGLE_FLIGHT_LOCK_TTL', '60'))
+    SINGLE_FLIGHT_WAIT_TIMEOUT = float(os.environ.get('SINGLE_FLIGHT_WAIT_TIMEOUT', '60'))
+    SINGLE_FLIGHT_RESULT_TTL = int(os.environ.get('SINGLE_FLIGHT_RESULT_TTL', '10'))
+    
+    AUTH_CACHE_ENABLED = os.environ.get('AUTH_CACHE_ENABLED', 'true').lower() == 'true'
+    AUTH_CACHE_TTL = int(os.environ.get('AUTH_CACHE_TTL', '60'))
+    AUTH_CACHE_MAX_ENTRIES = int(os.environ.get('AUTH_CACHE_MAX_ENTRIES', '10000'))
+    AUTH_CACHE_VERSION_CHECK_INTERVAL = float(os.environ.get('AUTH_CACHE_VERSION_CHECK_INTERVAL', '2'))
+    
+    METRICS_ENABLED = os.environ.get('METRICS_ENABLED', 'false').lower() == 'true'
+    METRICS_TOKEN = os.environ.get('METRICS_TOKEN', '')
+    
+    TRACING_ENABLED = os.environ.get('TRACING_ENABLED', 'true').lower() == 'true'
+    PROFILING_TOKEN = os.environ.get('PROFILING_TOKEN', '')
+    PROFILING_DIR = os.environ.get('PROFILING_DIR', os.path.join(basedir, 'profiles'))
+    
+    ROUTING_POLICY = os.environ.get('ROUTING_POLICY', 'priority')
+    ROUTING_EWMA_ALPHA = float(os.environ.get('ROUTING_EWMA_ALPHA', '0.1'))
+    ROUTING_TAIL_WEIGHT = float(os.environ.get('ROUTING_TAIL_WEIGHT', '0.5'))
+    ROUTING_ERROR_PENALTY = float(os.environ.get('ROUTING_ERROR_PENALTY', '3'))
+    ROUTING_PRIORITY_WEIGHT = float(os.environ.get('ROUTING_PRIORITY_WEIGHT', '0.25'))
+    ROUTING_PROBE_RATIO = float(os.environ.get('ROUTING_PROBE_RATIO', '0.05'))
+    ROUTING_MIN_SAMPLES = int(os.environ.get('ROUTING_MIN_SAMPLES', '5'))
+    ROUTING_LATENCY_WINDOW = int(os.environ.get('ROUTING_LATENCY_WINDOW', '50'))
+    
+    CIRCUIT_BREAKER_ENABLED = os.environ.get('CIRCUIT_BREAKER_ENABLED', 'true').lower() == 'true'
+    CIRCUIT_BREAKER_FAILURE_THRESHOLD = int(os.environ.get('CIRCUIT_BREAKER_FAILURE_THRESHOLD', '5'))
+    CIRCUIT_BREAKER_FAILURE_WINDOW = int(os.environ.get('CIRCUIT_BREAKER_FAILURE_WINDOW', '60'))
+    CIRCUIT_BREAKER_RECOVERY_TIMEOUT = float(os.environ.get('CIRCUIT_BREAKER_RECOVERY_TIMEOUT', '30'))
+    CIRCUIT_BREAKER_PROBE_TIMEOUT = int(os.environ.get('CIRCUIT_BREAKER_PROBE_TIMEOUT', '60'))
+    CIRCUIT_BREAKER_SYNC_INTERVAL = float(os.environ.get('CIRCUIT_BREAKER_SYNC_INTERVAL', '1'))
+    
+    CHAT_FAILOVER_MAX_ATTEMPTS = int(os.environ.get('CHAT_FAILOVER_MAX_ATTEMPTS', '3'))
+    CHAT_FAILOVER_DEADLINE = float(os.environ.get('CHAT_FAILOVER_DEADLINE', '60'))
+    
+    RESPONSE_CACHE_ENABLED = os.environ.get('RESPONSE_CACHE_ENABLED', 'false').lower() == 'true'
+    RESPONSE_CACHE_TTL = int(os.environ.get('RESPONSE_CACHE_TTL', '3600'))
+    RESPONSE_CACHE_MAX_ENTRIES = int(os.environ.get('RESPONSE_CACHE_MAX_ENTRIES', '1024'))
+    RESPONSE_CACHE_REDIS_ENABLED = os.environ.get('RESPONSE_CACHE_REDIS_ENABLED', 'true').lower() == 'true'
+    
+    JSON_BACKEND = os.environ.get('JSON_BACKEND', 'auto')
+    
+    REDIS_CONVERSATION_CODEC = os.environ.get('REDIS_CONVERSATION_CODEC', 'json')
+    REDIS_CONVERSATION_COMPRESSION = os.environ.get('REDIS_CONVERSATION_COMPRESSION', 'none')
+    REDIS_CONVERSATION_COMPRESSION_THRESHOLD = int(os.environ.get('REDIS_CONVERSATION_COMPRESSION_THRESHOLD', '1024'))
+    REDIS_CONVERSATION_COMPRESSION_LEVEL = int(os.environ.get('REDIS_CONVERSATION_COMPRESSION_LEVEL', '0')) or None
+    REDIS_ASYNC_MAX_CONNECTIONS = int(os.environ.get('REDIS_ASYNC_MAX_CONNECTIONS', '100'))
+    REDIS_ASYNC_POOL_TIMEOUT = float(os.environ.get('REDIS_ASYNC_POOL_TIMEOUT', '20'))
+    
+    CONTEXT_WINDOW_DEFAULT_TOKENS = int(os.environ.get('CONTEXT_WINDOW_DEFAULT_TOKENS', '8000'))
+    
+    ROUTING_TABLE_TTL = float(os.environ.get('ROUTING_TABLE_TTL', '30'))
+    ROUTING_TABLE_VERSION_CHECK_INTERVAL = float(os.environ.get('ROUTING_TABLE_VERSION_CHECK_INTERVAL', '2'))
+    
+    USAGE_COUNTER_GRACE_SECONDS = int(os.environ.get('USAGE_COUNTER_GRACE_SECONDS', '86400'))
+    USAGE_COUNTER_SYNC_INTERVAL = float(os.environ.get('USAGE_COUNTER_SYNC_INTERVAL', '1'))
+    USAGE_FLUSH_ENABLED = os.environ.get('USAGE_FLUSH_ENABLED', 'true').lower() == 'true'
+    USAGE_FLUSH_INTERVAL = float(os.environ.get('USAGE_FLUSH_INTERVAL', '60'))
+    USAGE_RETENTION_DAYS = int(os.environ.get('USAGE_RETENTION_DAYS', '90'))
+    USAGE_PRUNE_INTERVAL = float(os.environ.get('USAGE_PRUNE_INTERVAL', '3600'))
+    USAGE_DEFAULT_RESET_TIMEZONE = os.environ.get('USAGE_DEFAULT_RESET_TIMEZONE', 'UTC')
+    USAGE_RESET_TIMEZONES = dict(
+        tuple(part.strip() for part in entry.split('=', 1))
+        for entry in os.environ.get('USAGE_RESET_TIMEZONES', 'gemini=America/Los_Angeles').split(',') if '=' in entry
+    )
+    
+    LLM_RATE_LIMIT_ENABLED = os.environ.get('LLM_RATE_LIMIT_ENABLED', 'true').lower() == 'true'
+    LLM_RATE_LIMIT_WINDOW = int(os.environ.get('LLM_RATE_LIMIT_WINDOW', '60'))
+    
     LOG_LEVEL = os.environ.get('LOG_LEVEL', 'INFO')
     LOG_DIR = os.environ.get('LOG_DIR', 'logs')
@@ -2,6 +2,8 @@ from typing import Dict, Optional
 from app.services.llm.base_llm_service import BaseLLMService
 from app.services.llm.gemini_llm_service import GeminiLLMService
 from app.services.llm.ngrok_llm_service import NgrokLLMService
+from app.services.llm.circuit_breaker_llm_service import CircuitBreakerLLMService
+from app.services.circuit_breaker_service import circuit_breakers
 from app.utils.logger import get_logger
 
 logger = get_logger(__name__)
@@ -22,8 +24,10 @@ class LLMServiceFactory:
     @classmethod
     def register_service(cls, service: BaseLLMService):
         integration_name = service.get_integration_name()
+        if circuit_breakers.enabled and not isinstance(service, CircuitBreakerLLMService):
+            service = CircuitBreakerLLMService(service, circuit_breakers.get(integration_name))
         cls._services[integration_name] = service
-        logger.debug(f'Servicio registrado: {integration_name}')
+        logger.debug('Servicio registrado: %s', integration_name)
     
     @classmethod
     def get_service(cls, integration: str) -> Optional[BaseLLMService]:
@@ -31,10 +35,10 @@ class LLMServiceFactory:
         
         service = cls._services.get(integration)
         if service:
-            logger.debug(f'Servicio encontrado para integración: {integration}')
+            logger.debug('Servicio encontrado para integración: %s', integration)
             return service
         
-        logger.warning(f'No se encontró servicio para integración: {integration}')
+        logger.warning('No se encontró servicio para integración: %s', integration)
         return None
     
     @classmethod
@@ -1,3 +1,4 @@
 from app.middleware.auth_middleware import auth_required, get_current_user
+from app.middleware.quota_middleware import quota_required, get_quota_identity
 
-__all__ = ['auth_required', 'get_current_user']
+__all__ = ['auth_required', 'get_current_user', 'quota_required', 'get_quota_identity']
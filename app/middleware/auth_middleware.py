@@ -1,46 +1,96 @@
+import asyncio
+import inspect
+import time
 from functools import wraps
 from flask import request, jsonify, g
 from app.services.auth_service import AuthService
+from app.services.auth_cache_service import UserPrincipal, auth_cache
 from app.models.user import User
 from app.utils.logger import get_logger
 
 logger = get_logger(__name__)
 
+API_KEY_HEADER = 'X-API-Key'
 
-def auth_required(f):
-    @wraps(f)
-    def decorated_function(*args, **kwargs):
-        auth_header = request.headers.get('Authorization')
-        
-        if not auth_header:
-            logger.warning(f'Intento de acceso sin token a {request.path}')
-            return jsonify({'error': 'Token de autenticación requerido'}), 401
+
+def _authenticate_api_key(raw_key: str):
+    principal = auth_cache.get(raw_key)
+    
+    if principal is None:
+        api_key = AuthService.verify_api_key(raw_key)
         
-        try:
-            token = auth_header.split(' ')[1]
-        except IndexError:
-            logger.warning(f'Formato de token inválido en {request.path}')
-            return jsonify({'error': 'Formato de token inválido'}), 401
+        if not api_key:
+            logger.warning('API key inválida en %s', request.path)
+            return jsonify({'error': 'API key inválida o revocada'}), 401
         
+        principal = UserPrincipal.from_user(api_key.user, api_key)
+        auth_cache.set(raw_key, principal, time.time() + auth_cache.ttl)
+    
+    g.current_user = principal
+    logger.debug('API key %s autenticada accediendo a %s', principal.api_key_id, request.path)
+    return None
+
+
+def _authenticate():
+    api_key = request.headers.get(API_KEY_HEADER)
+    if api_key:
+        return _authenticate_api_key(api_key)
+    
+    auth_header = request.headers.get('Authorization')
+    
+    if not auth_header:
+        logger.warning('Intento de acceso sin token a %s', request.path)
+        return jsonify({'error': 'Token de autenticación requerido'}), 401
+    
+    try:
+        token = auth_header.split(' ')[1]
+    except IndexError:
+        logger.warning('Formato de token inválido en %s', request.path)
+        return jsonify({'error': 'Formato de token inválido'}), 401
+    
+    principal = auth_cache.get(token)
+    
+    if principal is None:
         payload = AuthService.verify_token(token, token_type='access')
         
         if not payload:
-            logger.warning(f'Token inválido o expirado en {request.path}')
+            logger.warning('Token inválido o expirado en %s', request.path)
             return jsonify({'error': 'Token inválido o expirado'}), 401
         
         user = User.query.get(payload['user_id'])
         
         if not user or not user.is_active:
-            logger.warning(f'Usuario no encontrado o inactivo: {payload.get("user_id")}')
+            logger.warning('Usuario no encontrado o inactivo: %s', payload.get('user_id'))
             return jsonify({'error': 'Usuario no encontrado o inactivo'}), 401
         
-        g.current_user = user
-        logger.debug(f'Usuario autenticado accediendo a {request.path}: {user.username}')
+        principal = UserPrincipal.from_user(user)
+        auth_cache.set(token, principal, payload['exp'])
+    
+    g.current_user = principal
+    logger.debug('Usuario autenticado accediendo a %s: %s', request.path, principal.username)
+    return None
+
+
+def auth_required(f):
+    if inspect.iscoroutinefunction(f):
+        @wraps(f)
+        async def async_decorated_function(*args, **kwargs):
+            error = await asyncio.to_thread(_authenticate)
+            if error is not None:
+                return error
+            return await f(*args, **kwargs)
         
+        return async_decorated_function
+    
+    @wraps(f)
+    def decorated_function(*args, **kwargs):
+        error = _authenticate()
+        if error is not None:
+            return error
         return f(*args, **kwargs)
     
     return decorated_function
 
 
-def get_current_user() -> User:
+def get_current_user() -> UserPrincipal:
     return g.current_user
@@ -0,0 +1,22 @@
+import time
+from flask import Flask, request, g
+from app.utils.metrics import REQUEST_LATENCY
+
+
+def _start_timer():
+    g.request_started_at = time.perf_counter()
+
+
+def _observe_request(response):
+    started_at = g.pop('request_started_at', None)
+    if started_at is not None:
+        route = request.url_rule.rule if request.url_rule else 'unmatched'
+        REQUEST_LATENCY.labels(request.method, route, response.status_code).observe(
+            time.perf_counter() - started_at
+        )
+    return response
+
+
+def register_metrics_middleware(app: Flask):
+    app.before_request(_start_timer)
+    app.after_request(_observe_request)
@@ -0,0 +1,69 @@
+import asyncio
+import inspect
+from functools import wraps
+from typing import Callable, Optional, Tuple
+from flask import request, jsonify, g
+from app.middleware.auth_middleware import get_current_user
+from app.services.quota_service import QuotaIdentity, bind_identity, quota_service
+from app.utils.token_estimator import estimate_tokens
+from app.utils.logger import get_logger
+
+logger = get_logger(__name__)
+
+
+def _default_cost(data: dict) -> Tuple[int, int]:
+    return 1, estimate_tokens(data.get('message') or '')
+
+
+def _admit(cost: Callable[[dict], Tuple[int, int]]):
+    identity = QuotaIdentity.from_principal(get_current_user())
+    try:
+        requests, estimated_tokens = cost(request.get_json(silent=True) or {})
+    except ValueError as e:
+        return identity, (jsonify({
+            'status': 'error',
+            'message': str(e)
+        }), 400)
+    
+    allowed, retry_after = quota_service.try_acquire(identity, requests, estimated_tokens)
+    if not allowed:
+        logger.warning('Solicitud rechazada por cuota del usuario %s en %s', identity.user_id, request.path)
+        return identity, (jsonify({
+            'status': 'error',
+            'message': 'Cuota de uso excedida, intenta nuevamente más tarde'
+        }), 429, {'Retry-After': str(retry_after)})
+    
+    g.quota_identity = identity
+    return identity, None
+
+
+def quota_required(f: Optional[Callable] = None, cost: Optional[Callable[[dict], Tuple[int, int]]] = None):
+    cost = cost or _default_cost
+    
+    def decorator(func):
+        if inspect.iscoroutinefunction(func):
+            @wraps(func)
+            async def async_wrapper(*args, **kwargs):
+                identity, error = await asyncio.to_thread(_admit, cost)
+                if error is not None:
+                    return error
+                with bind_identity(identity):
+                    return await func(*args, **kwargs)
+            
+            return async_wrapper
+        
+        @wraps(func)
+        def wrapper(*args, **kwargs):
+            identity, error = _admit(cost)
+            if error is not None:
+                return error
+            with bind_identity(identity):
+                return func(*args, **kwargs)
+        
+        return wrapper
+    
+    return decorator(f) if f is not None else decorator
+
+
+def get_quota_identity() -> Optional[QuotaIdentity]:
+    return g.get('quota_identity')
@@ -0,0 +1,67 @@
+import cProfile
+import hmac
+import os
+import time
+import uuid
+from flask import Flask, request, g, current_app
+from app.utils.tracing import start_trace, end_trace, get_spans, format_server_timing
+from app.utils.logger import get_logger
+
+logger = get_logger(__name__)
+
+PROFILE_HEADER = 'X-Profile-Token'
+
+
+def _profiling_requested() -> bool:
+    expected = current_app.config['PROFILING_TOKEN']
+    provided = request.headers.get(PROFILE_HEADER)
+    return bool(expected and provided) and hmac.compare_digest(provided, expected)
+
+
+def _start_request():
+    g.trace_token = start_trace()
+    g.trace_started_at = time.perf_counter()
+    
+    if _profiling_requested():
+        g.profiler = cProfile.Profile()
+        g.profiler.enable()
+
+
+def _store_profile(profiler: cProfile.Profile) -> str:
+    profile_dir = current_app.config['PROFILING_DIR']
+    os.makedirs(profile_dir, exist_ok=True)
+    
+    profile_id = f'{time.strftime("%Y%m%d-%H%M%S")}-{uuid.uuid4().hex[:8]}'
+    profiler.dump_stats(os.path.join(profile_dir, f'{profile_id}.prof'))
+    logger.info('Perfil de %s %s guardado: %s.prof', request.method, request.path, profile_id)
+    return profile_id
+
+
+def _finish_request(response):
+    profiler = g.pop('profiler', None)
+    if profiler is not None:
+        profiler.disable()
+        response.headers['X-Profile-Id'] = _store_profile(profiler)
+    
+    started_at = g.get('trace_started_at')
+    if started_at is not None:
+        response.headers['Server-Timing'] = format_server_timing(
+            get_spans(), total=time.perf_counter() - started_at
+        )
+    return response
+
+
+def _end_request(error=None):
+    profiler = g.pop('profiler', None)
+    if profiler is not None:
+        profiler.disable()
+    
+    token = g.pop('trace_token', None)
+    if token is not None:
+        end_trace(token)
+
+
+def register_tracing_middleware(app: Flask):
+    app.before_request(_start_request)
+    app.after_request(_finish_request)
+    app.teardown_request(_end_request)
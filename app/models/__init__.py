@@ -1,5 +1,7 @@
 from app.models.user import User
 from app.models.llm import LLM
 from app.models.usage import Usage
+from app.models.api_key import ApiKey
+from app.models.user_usage import UserUsage
 
-__all__ = ['User', 'LLM', 'Usage']
+__all__ = ['User', 'LLM', 'Usage', 'ApiKey', 'UserUsage']
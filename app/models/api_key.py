@@ -0,0 +1,30 @@
+from datetime import datetime, timezone
+from app.models.base import db
+
+
+class ApiKey(db.Model):
+    __tablename__ = 'api_keys'
+    
+    id = db.Column(db.Integer, primary_key=True)
+    user_id = db.Column(db.Integer, db.ForeignKey('users.id'), nullable=False, index=True)
+    name = db.Column(db.String(100), nullable=False)
+    key_prefix = db.Column(db.String(16), nullable=False)
+    key_hash = db.Column(db.String(64), unique=True, nullable=False, index=True)
+    tier = db.Column(db.String(32), nullable=True)
+    is_active = db.Column(db.Boolean, default=True, nullable=False)
+    created_at = db.Column(db.DateTime, default=lambda: datetime.now(timezone.utc), nullable=False)
+    last_used_at = db.Column(db.DateTime, nullable=True)
+    
+    def to_dict(self):
+        return {
+            'id': self.id,
+            'name': self.name,
+            'key_prefix': self.key_prefix,
+            'tier': self.tier,
+            'is_active': self.is_active,
+            'created_at': self.created_at.isoformat(),
+            'last_used_at': self.last_used_at.isoformat() if self.last_used_at else None
+        }
+    
+    def __repr__(self):
+        return f'<ApiKey {self.key_prefix} USER_ID={self.user_id}>'
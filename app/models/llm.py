@@ -12,6 +12,7 @@ class LLM(db.Model):
     rpm = db.Column(db.Integer, nullable=False, default=0)
     tpm = db.Column(db.Integer, nullable=False, default=0)
     rpd = db.Column(db.Integer, nullable=False, default=0)
+    context_tokens = db.Column(db.Integer, nullable=False, default=0)
     api_key = db.Column(db.String(255), nullable=True)
     created_at = db.Column(db.DateTime, default=lambda: datetime.now(timezone.utc), nullable=False)
     updated_at = db.Column(db.DateTime, default=lambda: datetime.now(timezone.utc), onupdate=lambda: datetime.now(timezone.utc), nullable=False)
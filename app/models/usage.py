@@ -4,12 +4,17 @@ from app.models.base import db
 
 class Usage(db.Model):
     __tablename__ = 'usage'
+    __table_args__ = (
+        db.UniqueConstraint('llm_id', 'window_start', name='uq_usage_llm_window'),
+        db.Index('ix_usage_window_start', 'window_start')
+    )
     
     id = db.Column(db.Integer, primary_key=True)
-    rpd_count = db.Column(db.Integer, nullable=False, default=0)
     llm_id = db.Column(db.Integer, db.ForeignKey('llm.id'), nullable=False)
+    window_start = db.Column(db.DateTime, nullable=False)
+    rpd_count = db.Column(db.Integer, nullable=False, default=0)
     created_at = db.Column(db.DateTime, default=lambda: datetime.now(timezone.utc), nullable=False)
     updated_at = db.Column(db.DateTime, default=lambda: datetime.now(timezone.utc), onupdate=lambda: datetime.now(timezone.utc), nullable=False)
     
     def __repr__(self):
-        return f'<Usage LLM_ID={self.llm_id} RPD_COUNT={self.rpd_count}>'
+        return f'<Usage LLM_ID={self.llm_id} WINDOW={self.window_start} RPD_COUNT={self.rpd_count}>'
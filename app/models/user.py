@@ -10,9 +10,13 @@ class User(db.Model):
     email = db.Column(db.String(120), unique=True, nullable=False, index=True)
     password_hash = db.Column(db.String(255), nullable=False)
     is_active = db.Column(db.Boolean, default=True, nullable=False)
+    tier = db.Column(db.String(32), default='free', nullable=False)
     created_at = db.Column(db.DateTime, default=lambda: datetime.now(timezone.utc), nullable=False)
     last_login = db.Column(db.DateTime, nullable=True)
     
+    api_keys = db.relationship('ApiKey', backref='user', lazy=True, cascade='all, delete-orphan')
+    usages = db.relationship('UserUsage', backref='user', lazy=True, cascade='all, delete-orphan')
+    
     def set_password(self, password: str):
         self.password_hash = generate_password_hash(password)
     
@@ -25,6 +29,7 @@ class User(db.Model):
             'username': self.username,
             'email': self.email,
             'is_active': self.is_active,
+            'tier': self.tier,
             'created_at': self.created_at.isoformat(),
             'last_login': self.last_login.isoformat() if self.last_login else None
         }
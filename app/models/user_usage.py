@@ -0,0 +1,31 @@
+from datetime import datetime, timezone
+from app.models.base import db
+
+
+class UserUsage(db.Model):
+    __tablename__ = 'user_usage'
+    __table_args__ = (
+        db.UniqueConstraint('user_id', 'day', name='uq_user_usage_user_day'),
+        db.Index('ix_user_usage_day', 'day')
+    )
+    
+    id = db.Column(db.Integer, primary_key=True)
+    user_id = db.Column(db.Integer, db.ForeignKey('users.id'), nullable=False)
+    day = db.Column(db.Date, nullable=False)
+    requests = db.Column(db.Integer, nullable=False, default=0)
+    prompt_tokens = db.Column(db.Integer, nullable=False, default=0)
+    completion_tokens = db.Column(db.Integer, nullable=False, default=0)
+    total_tokens = db.Column(db.Integer, nullable=False, default=0)
+    updated_at = db.Column(db.DateTime, default=lambda: datetime.now(timezone.utc), onupdate=lambda: datetime.now(timezone.utc), nullable=False)
+    
+    def to_dict(self):
+        return {
+            'day': self.day.isoformat(),
+            'requests': self.requests,
+            'prompt_tokens': self.prompt_tokens,
+            'completion_tokens': self.completion_tokens,
+            'total_tokens': self.total_tokens
+        }
+    
+    def __repr__(self):
+        return f'<UserUsage USER_ID={self.user_id} DAY={self.day} REQUESTS={self.requests}>'
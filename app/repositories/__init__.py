@@ -1,4 +1,5 @@
 from app.repositories.llm import LLMRepository
 from app.repositories.usage import UsageRepository
+from app.repositories.user_usage import UserUsageRepository
 
-__all__ = ['LLMRepository', 'UsageRepository']
+__all__ = ['LLMRepository', 'UsageRepository', 'UserUsageRepository']
@@ -1,22 +1,14 @@
 from typing import Optional, List, Tuple
 from app.models.llm import LLM
-from app.models.usage import Usage
-from app.models.base import db
+from app.repositories.usage import UsageRepository
+from app.utils.usage_windows import current_window_start
 
 class LLMRepository:
     @staticmethod
-    def find_available_llms() -> List[Tuple[LLM, Usage]]:
-        return db.session.query(LLM, Usage).join(
-            Usage, LLM.id == Usage.llm_id
-        ).filter(
-            Usage.rpd_count < LLM.rpd
-        ).order_by(LLM.priority.asc()).all()
-    
-    @staticmethod
-    def find_all_llms_ordered() -> List[Tuple[LLM, Usage]]:
-        return db.session.query(LLM, Usage).join(
-            Usage, LLM.id == Usage.llm_id
-        ).order_by(LLM.priority.asc()).all()
+    def find_all_with_usage() -> List[Tuple[LLM, int]]:
+        llms = LLM.query.order_by(LLM.priority.asc()).all()
+        counts = UsageRepository.find_counts({llm.id: current_window_start(llm.integration) for llm in llms})
+        return [(llm, counts.get(llm.id, 0)) for llm in llms]
     
     @staticmethod
     def find_by_id(llm_id: int) -> Optional[LLM]:
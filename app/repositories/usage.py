@@ -1,4 +1,7 @@
-from typing import Optional
+from datetime import datetime
+from typing import Optional, Dict, Tuple
+from sqlalchemy import and_, or_
+from sqlalchemy.exc import IntegrityError
 from app.models.usage import Usage
 from app.models.base import db
 from app.utils.logger import get_logger
@@ -6,35 +9,95 @@ from app.utils.logger import get_logger
 logger = get_logger(__name__)
 
 
+def _windows_filter(windows):
+    return or_(*[
+        and_(Usage.llm_id == llm_id, Usage.window_start == window_start)
+        for llm_id, window_start in windows
+    ])
+
+
 class UsageRepository:
     @staticmethod
-    def find_by_llm_id(llm_id: int) -> Optional[Usage]:
-        return Usage.query.filter_by(llm_id=llm_id).first()
+    def find_by_llm_id(llm_id: int, window_start: datetime) -> Optional[Usage]:
+        return Usage.query.filter_by(llm_id=llm_id, window_start=window_start).first()
+    
+    @staticmethod
+    def find_counts(windows: Dict[int, datetime]) -> Dict[int, int]:
+        if not windows:
+            return {}
+        
+        rows = db.session.query(Usage.llm_id, Usage.rpd_count).filter(
+            _windows_filter(windows.items())
+        ).all()
+        return {llm_id: rpd_count for llm_id, rpd_count in rows}
     
     @staticmethod
-    def create(llm_id: int, rpd_count: int = 1) -> Usage:
-        usage = Usage(llm_id=llm_id, rpd_count=rpd_count)
+    def create(llm_id: int, window_start: datetime, rpd_count: int = 1) -> Usage:
+        usage = Usage(llm_id=llm_id, window_start=window_start, rpd_count=rpd_count)
         db.session.add(usage)
         db.session.commit()
-        logger.debug(f'Usage creado para LLM {llm_id}')
+        logger.debug('Usage creado para LLM %s en ventana %s', llm_id, window_start)
         return usage
     
     @staticmethod
-    def increment_rpd(llm_id: int) -> bool:
-        usage = UsageRepository.find_by_llm_id(llm_id)
-        if usage:
-            usage.rpd_count += 1
-            db.session.commit()
-            logger.debug(f'RPD incrementado para LLM {llm_id}: {usage.rpd_count}')
+    def increment_rpd(llm_id: int, window_start: datetime) -> bool:
+        updated = Usage.query.filter_by(llm_id=llm_id, window_start=window_start).update(
+            {Usage.rpd_count: Usage.rpd_count + 1},
+            synchronize_session=False
+        )
+        db.session.commit()
+        if updated:
+            logger.debug('RPD incrementado para LLM %s', llm_id)
             return True
         return False
     
     @staticmethod
-    def reset_rpd(llm_id: int) -> bool:
-        usage = UsageRepository.find_by_llm_id(llm_id)
+    def increment_or_create(llm_id: int, window_start: datetime) -> bool:
+        if UsageRepository.increment_rpd(llm_id, window_start):
+            return True
+        
+        try:
+            UsageRepository.create(llm_id, window_start, rpd_count=1)
+        except IntegrityError:
+            db.session.rollback()
+            return UsageRepository.increment_rpd(llm_id, window_start)
+        return True
+    
+    @staticmethod
+    def reset_rpd(llm_id: int, window_start: datetime) -> bool:
+        usage = UsageRepository.find_by_llm_id(llm_id, window_start)
         if usage:
             usage.rpd_count = 0
             db.session.commit()
-            logger.info(f'RPD reseteado para LLM {llm_id}')
+            logger.info('RPD reseteado para LLM %s', llm_id)
             return True
         return False
+    
+    @staticmethod
+    def bulk_set_rpd(counters: Dict[Tuple[int, datetime], int]) -> int:
+        if not counters:
+            return 0
+        
+        usages = {
+            (usage.llm_id, usage.window_start): usage
+            for usage in Usage.query.filter(_windows_filter(counters.keys())).all()
+        }
+        
+        for (llm_id, window_start), count in counters.items():
+            usage = usages.get((llm_id, window_start))
+            if usage:
+                usage.rpd_count = count
+            else:
+                db.session.add(Usage(llm_id=llm_id, window_start=window_start, rpd_count=count))
+        
+        db.session.commit()
+        logger.debug('RPD sincronizado para %s ventanas', len(counters))
+        return len(counters)
+    
+    @staticmethod
+    def prune(before: datetime) -> int:
+        deleted = Usage.query.filter(Usage.window_start < before).delete(synchronize_session=False)
+        db.session.commit()
+        if deleted:
+            logger.info('Eliminadas %s ventanas de uso anteriores a %s', deleted, before)
+        return deleted
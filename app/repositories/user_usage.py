@@ -0,0 +1,52 @@
+from datetime import date
+from typing import Dict, List, Tuple
+from sqlalchemy import and_, or_
+from app.models.user_usage import UserUsage
+from app.models.base import db
+from app.utils.logger import get_logger
+
+logger = get_logger(__name__)
+
+USAGE_FIELDS = ('requests', 'prompt_tokens', 'completion_tokens', 'total_tokens')
+
+
+class UserUsageRepository:
+    @staticmethod
+    def find_by_user(user_id: int, since: date) -> List[UserUsage]:
+        return UserUsage.query.filter(
+            UserUsage.user_id == user_id,
+            UserUsage.day >= since
+        ).order_by(UserUsage.day.asc()).all()
+    
+    @staticmethod
+    def bulk_set(counters: Dict[Tuple[int, date], Dict[str, int]]) -> int:
+        if not counters:
+            return 0
+        
+        usages = {
+            (usage.user_id, usage.day): usage
+            for usage in UserUsage.query.filter(or_(*[
+                and_(UserUsage.user_id == user_id, UserUsage.day == day)
+                for user_id, day in counters.keys()
+            ])).all()
+        }
+        
+        for (user_id, day), values in counters.items():
+            usage = usages.get((user_id, day))
+            if usage is None:
+                usage = UserUsage(user_id=user_id, day=day)
+                db.session.add(usage)
+            for field in USAGE_FIELDS:
+                setattr(usage, field, values.get(field, 0))
+        
+        db.session.commit()
+        logger.debug('Uso por usuario sincronizado para %s días', len(counters))
+        return len(counters)
+    
+    @staticmethod
+    def prune(before: date) -> int:
+        deleted = UserUsage.query.filter(UserUsage.day < before).delete(synchronize_session=False)
+        db.session.commit()
+        if deleted:
+            logger.info('Eliminados %s registros de uso por usuario anteriores a %s', deleted, before)
+        return deleted
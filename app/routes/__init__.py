@@ -1,8 +1,12 @@
 from app.routes.auth import auth_bp
 from app.routes.api import api_bp
 from app.routes.llm import llm_bp
+from app.routes.metrics import metrics_bp
 
 def register_routes(app):
     app.register_blueprint(auth_bp, url_prefix='/api/auth')
     app.register_blueprint(api_bp, url_prefix='/api')
     app.register_blueprint(llm_bp, url_prefix='/api/llm')
+    
+    if app.config['METRICS_ENABLED']:
+        app.register_blueprint(metrics_bp)
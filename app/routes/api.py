@@ -1,5 +1,12 @@
 from flask import Blueprint, request, jsonify, g
 from app.middleware.auth_middleware import auth_required, get_current_user
+from app.services.response_cache_service import response_cache
+from app.services.single_flight_service import single_flight
+from app.services.routing_policy import routing_policy
+from app.services.circuit_breaker_service import circuit_breakers
+from app.services.quota_service import QuotaIdentity, quota_service
+from app.services.user_usage_service import user_usage_service
+from app.utils.http_client import get_connection_stats
 from app.utils.logger import get_logger
 
 api_bp = Blueprint('api', __name__)
@@ -12,3 +19,67 @@ def health():
         'status': 'healthy',
         'message': 'API funcionando correctamente'
     }), 200
+
+@api_bp.route('/stats/connections', methods=['GET'])
+@auth_required
+def connection_stats():
+    return jsonify({
+        'status': 'success',
+        'data': get_connection_stats()
+    }), 200
+
+@api_bp.route('/stats/cache', methods=['GET'])
+@auth_required
+def cache_stats():
+    return jsonify({
+        'status': 'success',
+        'data': response_cache.get_stats()
+    }), 200
+
+@api_bp.route('/stats/coalescing', methods=['GET'])
+@auth_required
+def coalescing_stats():
+    return jsonify({
+        'status': 'success',
+        'data': single_flight.get_stats()
+    }), 200
+
+@api_bp.route('/stats/routing', methods=['GET'])
+@auth_required
+def routing_stats():
+    return jsonify({
+        'status': 'success',
+        'data': routing_policy.get_stats()
+    }), 200
+
+@api_bp.route('/stats/circuits', methods=['GET'])
+@auth_required
+def circuit_stats():
+    return jsonify({
+        'status': 'success',
+        'data': circuit_breakers.get_stats()
+    }), 200
+
+@api_bp.route('/usage/me', methods=['GET'])
+@auth_required
+def my_usage():
+    user = get_current_user()
+    days = min(max(request.args.get('days', 7, type=int), 1), 90)
+    identity = QuotaIdentity.from_principal(user)
+    
+    try:
+        return jsonify({
+            'status': 'success',
+            'data': {
+                'user_id': user.id,
+                'tier': user.tier or quota_service.default_tier,
+                'limits': quota_service.get_limits(user.tier),
+                'quota': quota_service.get_status(identity),
+                'days': user_usage_service.get_report(user.id, days)
+            }
+        }), 200
+    except Exception as e:
+        return jsonify({
+            'status': 'error',
+            'message': str(e)
+        }), 500
@@ -1,5 +1,7 @@
 from flask import Blueprint, request, jsonify
 from app.services.auth_service import AuthService
+from app.middleware.auth_middleware import auth_required, get_current_user
+from app.config import Config
 from app.utils.validators import validate_email, validate_password
 from app.utils.logger import get_logger
 
@@ -110,3 +112,44 @@ def refresh():
     logger.info('Refresh token exitoso')
     
     return jsonify(result), 200
+
+
+@auth_bp.route('/api-keys', methods=['POST'])
+@auth_required
+def create_api_key():
+    data = request.get_json() or {}
+    name = data.get('name')
+    tier = data.get('tier')
+    
+    if not name:
+        logger.warning('Intento de crear API key sin nombre')
+        return jsonify({'error': 'El nombre de la API key es requerido'}), 400
+    
+    if tier is not None and tier not in Config.QUOTA_TIERS:
+        logger.warning('Intento de crear API key con tier desconocido: %s', tier)
+        return jsonify({'error': f'Tier desconocido: {tier}'}), 400
+    
+    user = get_current_user()
+    api_key, raw_key = AuthService.create_api_key(user.id, name, tier)
+    
+    return jsonify({
+        'message': 'API key creada exitosamente, guárdala ahora: no se volverá a mostrar',
+        'api_key': api_key.to_dict(),
+        'key': raw_key
+    }), 201
+
+
+@auth_bp.route('/api-keys', methods=['GET'])
+@auth_required
+def list_api_keys():
+    api_keys = AuthService.list_api_keys(get_current_user().id)
+    return jsonify({'api_keys': [api_key.to_dict() for api_key in api_keys]}), 200
+
+
+@auth_bp.route('/api-keys/<int:api_key_id>', methods=['DELETE'])
+@auth_required
+def revoke_api_key(api_key_id):
+    if not AuthService.revoke_api_key(get_current_user().id, api_key_id):
+        return jsonify({'error': 'API key no encontrada'}), 404
+    
+    return jsonify({'message': 'API key revocada exitosamente'}), 200
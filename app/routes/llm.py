@@ -1,10 +1,84 @@
-from flask import Blueprint, request, jsonify
+from contextlib import closing
+from flask import Blueprint, request, jsonify, Response, stream_with_context
 from app.services.chat_orchestrator import ChatOrchestrator
+from app.services.batch_chat_service import BatchChatService
+from app.services.job_service import JobService
+from app.services.llm_selector_service import NoLLMCapacityError
 from app.services.llm.gemini_llm_service import GeminiLLMService
+from app.services.quota_service import bind_identity
+from app.middleware.auth_middleware import auth_required, get_current_user
+from app.middleware.quota_middleware import quota_required, get_quota_identity
+from app.utils.token_estimator import estimate_tokens
+from app.utils.response_fields import parse_fields
+from app.utils.validators import validate_webhook_url
+from app.utils import json_codec
+from app.config import Config
 
 llm_bp = Blueprint('llm', __name__)
 
 orchestrator = ChatOrchestrator()
+batch_service = BatchChatService(orchestrator)
+job_service = JobService()
+
+
+def _format_sse(event: dict) -> str:
+    event_name = event.pop('event', 'message')
+    return f'event: {event_name}\ndata: {json_codec.dumps(event)}\n\n'
+
+
+def _chat_error_response(error: Exception):
+    if isinstance(error, NoLLMCapacityError):
+        return jsonify({
+            'status': 'error',
+            'message': str(error)
+        }), 429, {'Retry-After': str(error.retry_after)}
+    return jsonify({
+        'status': 'error',
+        'message': str(error)
+    }), 500
+
+
+def _request_fields(data: dict):
+    return parse_fields(data.get('fields', request.args.get('fields')))
+
+
+def _message_cost(data: dict):
+    message = data.get('message')
+    if not message:
+        raise ValueError('El campo "message" es requerido')
+    return 1, estimate_tokens(message)
+
+
+def _chat_cost(data: dict):
+    _request_fields(data)
+    return _message_cost(data)
+
+
+def _job_cost(data: dict):
+    webhook_url = data.get('webhook_url')
+    if webhook_url:
+        valid, error = validate_webhook_url(webhook_url)
+        if not valid:
+            raise ValueError(error)
+    return _chat_cost(data)
+
+
+def _batch_cost(data: dict):
+    items = data.get('items')
+    
+    if not isinstance(items, list) or not items:
+        raise ValueError('El campo "items" debe ser una lista no vacía')
+    
+    if len(items) > Config.BATCH_MAX_ITEMS:
+        raise ValueError(f'El batch admite como máximo {Config.BATCH_MAX_ITEMS} items')
+    
+    for index, item in enumerate(items):
+        if not isinstance(item, dict) or not item.get('message'):
+            raise ValueError(f'El item {index} requiere el campo "message"')
+    
+    _request_fields(data)
+    return len(items), sum(estimate_tokens(item['message']) for item in items)
+
 
 @llm_bp.route('/chat-test', methods=['GET'])
 def test():
@@ -24,23 +98,176 @@ def test():
         }), 500
 
 @llm_bp.route('/chat', methods=['POST'])
+@auth_required
+@quota_required(cost=_chat_cost)
 def chat():
     data = request.get_json()
     message = data.get('message')
     conversation_id = data.get('conversation_id')
+    fields = _request_fields(data)
     
-    if not message:
+    try:
+        response_data = orchestrator.chat(
+            message,
+            conversation_id,
+            use_cache=data.get('cache', True) is not False,
+            fields=fields
+        )
         return jsonify({
-            'status': 'error',
-            'message': 'El campo "message" es requerido'
-        }), 400
+            'status': 'success',
+            'data': response_data
+        }), 200
+    except Exception as e:
+        return _chat_error_response(e)
+
+@auth_required
+@quota_required(cost=_chat_cost)
+async def chat_async():
+    data = request.get_json()
+    message = data.get('message')
+    conversation_id = data.get('conversation_id')
+    fields = _request_fields(data)
     
     try:
-        response_data = orchestrator.chat(message, conversation_id)
+        response_data = await orchestrator.achat(
+            message,
+            conversation_id,
+            use_cache=data.get('cache', True) is not False,
+            fields=fields
+        )
         return jsonify({
             'status': 'success',
             'data': response_data
         }), 200
+    except Exception as e:
+        return _chat_error_response(e)
+
+@llm_bp.route('/chat/stream', methods=['POST'])
+@auth_required
+@quota_required(cost=_message_cost)
+def chat_stream():
+    data = request.get_json()
+    message = data.get('message')
+    conversation_id = data.get('conversation_id')
+    identity = get_quota_identity()
+    
+    def generate():
+        try:
+            with bind_identity(identity):
+                for event in orchestrator.chat_stream(message, conversation_id):
+                    yield _format_sse(event)
+        except NoLLMCapacityError as e:
+            yield _format_sse({
+                'event': 'error',
+                'status': 'error',
+                'message': str(e),
+                'retry_after': e.retry_after
+            })
+        except Exception as e:
+            yield _format_sse({
+                'event': 'error',
+                'status': 'error',
+                'message': str(e)
+            })
+    
+    return Response(
+        stream_with_context(generate()),
+        mimetype='text/event-stream',
+        headers={
+            'Cache-Control': 'no-cache',
+            'X-Accel-Buffering': 'no'
+        }
+    )
+
+@llm_bp.route('/chat/batch', methods=['POST'])
+@auth_required
+@quota_required(cost=_batch_cost)
+def chat_batch():
+    data = request.get_json()
+    items = data.get('items')
+    fields = _request_fields(data)
+    use_cache = data.get('cache', True) is not False
+    
+    if data.get('stream'):
+        identity = get_quota_identity()
+        
+        def generate():
+            try:
+                with bind_identity(identity), closing(batch_service.run(items, use_cache, fields)) as results:
+                    for result in results:
+                        yield json_codec.dumps(result) + '\n'
+            except Exception as e:
+                yield json_codec.dumps({'status': 'error', 'message': str(e)}) + '\n'
+        
+        return Response(
+            stream_with_context(generate()),
+            mimetype='application/x-ndjson',
+            headers={'X-Accel-Buffering': 'no'}
+        )
+    
+    try:
+        results = sorted(batch_service.run(items, use_cache, fields), key=lambda result: result['index'])
+        succeeded = sum(1 for result in results if result['status'] == 'success')
+        return jsonify({
+            'status': 'success',
+            'data': {
+                'results': results,
+                'succeeded': succeeded,
+                'failed': len(results) - succeeded
+            }
+        }), 200
+    except Exception as e:
+        return jsonify({
+            'status': 'error',
+            'message': str(e)
+        }), 500
+
+@llm_bp.route('/jobs', methods=['POST'])
+@auth_required
+@quota_required(cost=_job_cost)
+def create_job():
+    data = request.get_json()
+    message = data.get('message')
+    fields = _request_fields(data)
+    
+    try:
+        job = job_service.enqueue(
+            message,
+            data.get('conversation_id'),
+            webhook_url=data.get('webhook_url'),
+            use_cache=data.get('cache', True) is not False,
+            identity=get_quota_identity(),
+            fields=fields
+        )
+        return jsonify({
+            'status': 'success',
+            'data': job
+        }), 202
+    except ValueError as e:
+        return jsonify({
+            'status': 'error',
+            'message': str(e)
+        }), 400
+    except Exception as e:
+        return jsonify({
+            'status': 'error',
+            'message': str(e)
+        }), 500
+
+@llm_bp.route('/jobs/<job_id>', methods=['GET'])
+@auth_required
+def get_job(job_id):
+    try:
+        job = job_service.get_job(job_id, get_current_user().id)
+        if job is None:
+            return jsonify({
+                'status': 'error',
+                'message': 'Job no encontrado'
+            }), 404
+        return jsonify({
+            'status': 'success',
+            'data': job
+        }), 200
     except Exception as e:
         return jsonify({
             'status': 'error',
@@ -64,4 +291,27 @@ def get_conversation_history():
         return jsonify({
             'status': 'error',
             'message': str(e)
-        }), 500
\ No newline at end of file
+        }), 500
+
+async def get_conversation_history_async():
+    conversation_id = request.args.get('conversation_id')
+    if not conversation_id:
+        return jsonify({
+            'status': 'error',
+            'message': 'El campo "conversation_id" es requerido'
+        }), 400
+    try:
+        return jsonify({
+            'status': 'success',
+            'data': await orchestrator.aget_history(conversation_id)
+        }), 200
+    except Exception as e:
+        return jsonify({
+            'status': 'error',
+            'message': str(e)
+        }), 500
+
+async_views = {
+    'llm.chat': chat_async,
+    'llm.get_conversation_history': get_conversation_history_async
+}
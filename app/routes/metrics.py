@@ -0,0 +1,24 @@
+import hmac
+from flask import Blueprint, Response, request, jsonify, current_app
+from app.utils.metrics import render_metrics
+
+metrics_bp = Blueprint('metrics', __name__)
+
+
+def _authorized() -> bool:
+    expected = current_app.config['METRICS_TOKEN']
+    if not expected:
+        return True
+    
+    auth_header = request.headers.get('Authorization', '')
+    scheme, _, provided = auth_header.partition(' ')
+    return scheme == 'Bearer' and bool(provided) and hmac.compare_digest(provided, expected)
+
+
+@metrics_bp.route('/metrics', methods=['GET'])
+def metrics():
+    if not _authorized():
+        return jsonify({'error': 'Token de métricas inválido'}), 401
+    
+    data, content_type = render_metrics()
+    return Response(data, content_type=content_type)
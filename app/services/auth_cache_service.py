@@ -0,0 +1,224 @@
+import hashlib
+import threading
+import time
+from collections import OrderedDict
+from typing import Dict, Any, Optional, Set
+from sqlalchemy import event, inspect
+from sqlalchemy.orm import Session
+from app.config import Config
+from app.models.user import User
+from app.models.api_key import ApiKey
+from app.services.redis_service import get_auth_version, bump_auth_version
+from app.utils.logger import get_logger
+
+logger = get_logger(__name__)
+
+_INVALIDATING_ATTRIBUTES = ('is_active', 'password_hash', 'username', 'email', 'tier')
+_API_KEY_INVALIDATING_ATTRIBUTES = ('is_active', 'tier')
+
+
+class UserPrincipal:
+    __slots__ = ('id', 'username', 'email', 'is_active', 'tier', 'api_key_id', 'api_key_tier')
+    
+    def __init__(
+        self,
+        id: int,
+        username: str,
+        email: str,
+        is_active: bool,
+        tier: Optional[str] = None,
+        api_key_id: Optional[int] = None,
+        api_key_tier: Optional[str] = None
+    ):
+        self.id = id
+        self.username = username
+        self.email = email
+        self.is_active = is_active
+        self.tier = tier
+        self.api_key_id = api_key_id
+        self.api_key_tier = api_key_tier
+    
+    @classmethod
+    def from_user(cls, user: User, api_key: Optional[ApiKey] = None) -> 'UserPrincipal':
+        if api_key is None:
+            return cls(user.id, user.username, user.email, user.is_active, user.tier)
+        return cls(user.id, user.username, user.email, user.is_active, user.tier, api_key.id, api_key.tier)
+    
+    def to_dict(self) -> Dict[str, Any]:
+        data = {
+            'id': self.id,
+            'username': self.username,
+            'email': self.email,
+            'is_active': self.is_active,
+            'tier': self.tier
+        }
+        if self.api_key_id is not None:
+            data['api_key_id'] = self.api_key_id
+        return data
+    
+    def __repr__(self):
+        return f'<UserPrincipal {self.username}>'
+
+
+class AuthCache:
+    def __init__(
+        self,
+        enabled: Optional[bool] = None,
+        ttl: Optional[int] = None,
+        max_entries: Optional[int] = None,
+        version_check_interval: Optional[float] = None
+    ):
+        self.enabled = Config.AUTH_CACHE_ENABLED if enabled is None else enabled
+        self.ttl = ttl or Config.AUTH_CACHE_TTL
+        self.max_entries = max_entries or Config.AUTH_CACHE_MAX_ENTRIES
+        self.version_check_interval = Config.AUTH_CACHE_VERSION_CHECK_INTERVAL \
+            if version_check_interval is None else version_check_interval
+        self._entries: 'OrderedDict[str, tuple]' = OrderedDict()
+        self._tokens_by_user: Dict[int, Set[str]] = {}
+        self._lock = threading.Lock()
+        self._version: Optional[int] = None
+        self._version_checked_at = 0.0
+        self._stats = {'hits': 0, 'misses': 0, 'invalidations': 0, 'evictions': 0}
+    
+    @staticmethod
+    def _key(token: str) -> str:
+        return hashlib.sha256(token.encode('utf-8')).hexdigest()
+    
+    def _check_version(self):
+        now = time.monotonic()
+        if now - self._version_checked_at < self.version_check_interval:
+            return
+        
+        self._version_checked_at = now
+        version = get_auth_version()
+        if version is None or version == self._version:
+            return
+        
+        if self._version is not None:
+            logger.info('Versión de caché de autenticación cambió (%s -> %s)', self._version, version)
+            self.clear()
+        self._version = version
+    
+    def _remove(self, key: str):
+        entry = self._entries.pop(key, None)
+        if entry is None:
+            return
+        tokens = self._tokens_by_user.get(entry[1].id)
+        if tokens is not None:
+            tokens.discard(key)
+            if not tokens:
+                del self._tokens_by_user[entry[1].id]
+    
+    def get(self, token: str) -> Optional[UserPrincipal]:
+        if not self.enabled:
+            return None
+        
+        self._check_version()
+        key = self._key(token)
+        
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None or entry[0] <= time.time():
+                if entry is not None:
+                    self._remove(key)
+                self._stats['misses'] += 1
+                return None
+            
+            self._entries.move_to_end(key)
+            self._stats['hits'] += 1
+            return entry[1]
+    
+    def set(self, token: str, principal: UserPrincipal, expires_at: float):
+        if not self.enabled:
+            return
+        
+        key = self._key(token)
+        with self._lock:
+            self._remove(key)
+            self._entries[key] = (min(time.time() + self.ttl, expires_at), principal)
+            self._tokens_by_user.setdefault(principal.id, set()).add(key)
+            while len(self._entries) > self.max_entries:
+                self._remove(next(iter(self._entries)))
+                self._stats['evictions'] += 1
+    
+    def invalidate_user(self, user_id: int, broadcast: bool = True):
+        with self._lock:
+            for key in list(self._tokens_by_user.get(user_id, ())):
+                self._remove(key)
+            self._stats['invalidations'] += 1
+        
+        logger.info('Caché de autenticación invalidada para usuario %s', user_id)
+        if broadcast:
+            self._version = bump_auth_version()
+    
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+            self._tokens_by_user.clear()
+    
+    def get_stats(self) -> Dict[str, Any]:
+        with self._lock:
+            stats = dict(self._stats)
+            stats['entries'] = len(self._entries)
+        
+        lookups = stats['hits'] + stats['misses']
+        stats['hit_ratio'] = round(stats['hits'] / lookups, 4) if lookups else 0.0
+        stats['enabled'] = self.enabled
+        return stats
+
+
+auth_cache = AuthCache()
+
+
+def _mark_user_changed(mapper, connection, target):
+    state = inspect(target)
+    if not any(state.attrs[name].history.has_changes() for name in _INVALIDATING_ATTRIBUTES):
+        return
+    
+    session = Session.object_session(target)
+    if session is not None:
+        session.info.setdefault('auth_users_changed', set()).add(target.id)
+
+
+def _mark_user_deleted(mapper, connection, target):
+    session = Session.object_session(target)
+    if session is not None:
+        session.info.setdefault('auth_users_changed', set()).add(target.id)
+
+
+def _mark_api_key_changed(mapper, connection, target):
+    state = inspect(target)
+    if not any(state.attrs[name].history.has_changes() for name in _API_KEY_INVALIDATING_ATTRIBUTES):
+        return
+    
+    session = Session.object_session(target)
+    if session is not None:
+        session.info.setdefault('auth_users_changed', set()).add(target.user_id)
+
+
+def _mark_api_key_deleted(mapper, connection, target):
+    session = Session.object_session(target)
+    if session is not None:
+        session.info.setdefault('auth_users_changed', set()).add(target.user_id)
+
+
+def _invalidate_after_commit(session):
+    for user_id in session.info.pop('auth_users_changed', ()):
+        auth_cache.invalidate_user(user_id)
+
+
+def register_auth_cache_hooks():
+    if not event.contains(User, 'after_update', _mark_user_changed):
+        event.listen(User, 'after_update', _mark_user_changed)
+    
+    if not event.contains(User, 'after_delete', _mark_user_deleted):
+        event.listen(User, 'after_delete', _mark_user_deleted)
+    
+    if not event.contains(ApiKey, 'after_update', _mark_api_key_changed):
+        event.listen(ApiKey, 'after_update', _mark_api_key_changed)
+    
+    if not event.contains(ApiKey, 'after_delete', _mark_api_key_deleted):
+        event.listen(ApiKey, 'after_delete', _mark_api_key_deleted)
+    
+    if not event.contains(Session, 'after_commit', _invalidate_after_commit):
+        event.listen(Session, 'after_commit', _invalidate_after_commit)
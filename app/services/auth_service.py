@@ -1,25 +1,30 @@
+import hashlib
+import secrets
 from datetime import datetime, timedelta, timezone
-from typing import Optional, Dict
+from typing import Optional, Dict, List, Tuple
 import jwt
 from flask import current_app
 from app.models.user import User
+from app.models.api_key import ApiKey
 from app.models.base import db
 from app.utils.logger import get_logger
 
 logger = get_logger(__name__)
 
+API_KEY_PREFIX = 'sk_'
+
 
 class AuthService:
     @staticmethod
     def create_user(username: str, email: str, password: str) -> User:
-        logger.info(f'Intentando crear usuario: {username}')
+        logger.info('Intentando crear usuario: %s', username)
         
         if User.query.filter_by(username=username).first():
-            logger.warning(f'Intento de registro con username duplicado: {username}')
+            logger.warning('Intento de registro con username duplicado: %s', username)
             raise ValueError('El nombre de usuario ya existe')
         
         if User.query.filter_by(email=email).first():
-            logger.warning(f'Intento de registro con email duplicado: {email}')
+            logger.warning('Intento de registro con email duplicado: %s', email)
             raise ValueError('El email ya está registrado')
         
         user = User(username=username, email=email)
@@ -28,28 +33,28 @@ class AuthService:
         db.session.add(user)
         db.session.commit()
         
-        logger.info(f'Usuario creado exitosamente: {username} (ID: {user.id})')
+        logger.info('Usuario creado exitosamente: %s (ID: %s)', username, user.id)
         
         return user
     
     @staticmethod
     def authenticate_user(username: str, password: str) -> Optional[User]:
-        logger.debug(f'Intentando autenticar usuario: {username}')
+        logger.debug('Intentando autenticar usuario: %s', username)
         
         user = User.query.filter_by(username=username).first()
         
         if not user or not user.is_active:
-            logger.warning(f'Intento de autenticación fallido: usuario no encontrado o inactivo - {username}')
+            logger.warning('Intento de autenticación fallido: usuario no encontrado o inactivo - %s', username)
             return None
         
         if not user.check_password(password):
-            logger.warning(f'Intento de autenticación fallido: contraseña incorrecta - {username}')
+            logger.warning('Intento de autenticación fallido: contraseña incorrecta - %s', username)
             return None
         
         user.last_login = datetime.now(timezone.utc)
         db.session.commit()
         
-        logger.info(f'Usuario autenticado exitosamente: {username} (ID: {user.id})')
+        logger.info('Usuario autenticado exitosamente: %s (ID: %s)', username, user.id)
         
         return user
     
@@ -107,16 +112,16 @@ class AuthService:
             )
             
             if payload.get('type') != token_type:
-                logger.warning(f'Token con tipo incorrecto. Esperado: {token_type}')
+                logger.warning('Token con tipo incorrecto. Esperado: %s', token_type)
                 return None
             
-            logger.debug(f'Token verificado exitosamente. Tipo: {token_type}, User ID: {payload.get("user_id")}')
+            logger.debug('Token verificado exitosamente. Tipo: %s, User ID: %s', token_type, payload.get('user_id'))
             return payload
         except jwt.ExpiredSignatureError:
             logger.warning('Intento de uso de token expirado')
             return None
         except jwt.InvalidTokenError as e:
-            logger.error(f'Token inválido: {str(e)}')
+            logger.error('Token inválido: %s', e)
             return None
     
     @staticmethod
@@ -137,3 +142,54 @@ class AuthService:
             'access_token': new_access_token,
             'token_type': 'Bearer'
         }
+    
+    @staticmethod
+    def _hash_api_key(raw_key: str) -> str:
+        return hashlib.sha256(raw_key.encode('utf-8')).hexdigest()
+    
+    @staticmethod
+    def create_api_key(user_id: int, name: str, tier: Optional[str] = None) -> Tuple[ApiKey, str]:
+        raw_key = API_KEY_PREFIX + secrets.token_urlsafe(32)
+        api_key = ApiKey(
+            user_id=user_id,
+            name=name,
+            key_prefix=raw_key[:10],
+            key_hash=AuthService._hash_api_key(raw_key),
+            tier=tier
+        )
+        
+        db.session.add(api_key)
+        db.session.commit()
+        
+        logger.info('API key creada para usuario %s (ID: %s)', user_id, api_key.id)
+        
+        return api_key, raw_key
+    
+    @staticmethod
+    def list_api_keys(user_id: int) -> List[ApiKey]:
+        return ApiKey.query.filter_by(user_id=user_id).order_by(ApiKey.created_at.asc()).all()
+    
+    @staticmethod
+    def revoke_api_key(user_id: int, api_key_id: int) -> bool:
+        api_key = ApiKey.query.filter_by(id=api_key_id, user_id=user_id).first()
+        if not api_key:
+            return False
+        
+        api_key.is_active = False
+        db.session.commit()
+        
+        logger.info('API key revocada para usuario %s (ID: %s)', user_id, api_key_id)
+        return True
+    
+    @staticmethod
+    def verify_api_key(raw_key: str) -> Optional[ApiKey]:
+        api_key = ApiKey.query.filter_by(key_hash=AuthService._hash_api_key(raw_key)).first()
+        
+        if not api_key or not api_key.is_active or not api_key.user.is_active:
+            logger.warning('API key inválida, revocada o de usuario inactivo')
+            return None
+        
+        api_key.last_used_at = datetime.now(timezone.utc)
+        db.session.commit()
+        
+        return api_key
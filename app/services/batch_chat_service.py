@@ -0,0 +1,148 @@
+import asyncio
+import contextvars
+import queue
+import threading
+import time
+from typing import Dict, Any, List, Iterator, AsyncIterator, Optional, Sequence
+from app.config import Config
+from app.services.chat_orchestrator import ChatOrchestrator
+from app.services.llm_selector_service import NoLLMCapacityError
+from app.services.redis_service import close_async_redis_client
+from app.utils.http_client import close_async_http_clients
+from app.utils.logger import get_logger
+
+logger = get_logger(__name__)
+
+_DONE = object()
+
+
+class BatchChatService:
+    def __init__(
+        self,
+        orchestrator: ChatOrchestrator = None,
+        max_concurrency: Optional[int] = None,
+        capacity_wait: Optional[float] = None
+    ):
+        self.orchestrator = orchestrator or ChatOrchestrator()
+        self.max_concurrency = max_concurrency or Config.BATCH_MAX_CONCURRENCY
+        self.capacity_wait = Config.BATCH_CAPACITY_WAIT if capacity_wait is None else capacity_wait
+    
+    async def _run_item(
+        self,
+        index: int,
+        item: Dict[str, Any],
+        semaphore: asyncio.Semaphore,
+        use_cache: bool,
+        fields: Optional[Sequence[str]] = None,
+        cancelled: Optional[threading.Event] = None
+    ) -> Dict[str, Any]:
+        result = {'index': index, 'id': item.get('id')}
+        waited = 0.0
+        
+        async with semaphore:
+            while True:
+                if cancelled is not None and cancelled.is_set():
+                    result.update({'status': 'error', 'message': 'Batch cancelado'})
+                    return result
+                try:
+                    result['data'] = await self.orchestrator.achat(
+                        item['message'], item.get('conversation_id'), use_cache=use_cache, fields=fields
+                    )
+                    result['status'] = 'success'
+                    return result
+                except NoLLMCapacityError as e:
+                    remaining = self.capacity_wait - waited
+                    if remaining <= 0:
+                        result.update({'status': 'error', 'message': str(e), 'retry_after': e.retry_after})
+                        return result
+                    delay = min(e.retry_after, remaining)
+                    logger.debug('Item %s del batch esperando capacidad %ss', index, delay)
+                    await asyncio.sleep(delay)
+                    waited += delay
+                except Exception as e:
+                    logger.warning('Item %s del batch falló: %s', index, e)
+                    result.update({'status': 'error', 'message': str(e)})
+                    return result
+    
+    async def arun(
+        self,
+        items: List[Dict[str, Any]],
+        use_cache: bool = True,
+        fields: Optional[Sequence[str]] = None,
+        cancelled: Optional[threading.Event] = None
+    ) -> AsyncIterator[Dict[str, Any]]:
+        semaphore = asyncio.Semaphore(self.max_concurrency)
+        tasks = [
+            asyncio.create_task(self._run_item(index, item, semaphore, use_cache, fields, cancelled))
+            for index, item in enumerate(items)
+        ]
+        try:
+            for task in asyncio.as_completed(tasks):
+                yield await task
+        finally:
+            for task in tasks:
+                task.cancel()
+            await close_async_http_clients()
+            await close_async_redis_client()
+    
+    def run(
+        self,
+        items: List[Dict[str, Any]],
+        use_cache: bool = True,
+        fields: Optional[Sequence[str]] = None
+    ) -> Iterator[Dict[str, Any]]:
+        results: 'queue.Queue' = queue.Queue()
+        cancelled = threading.Event()
+        running = {}
+        
+        async def produce():
+            running['loop'] = asyncio.get_running_loop()
+            running['task'] = asyncio.current_task()
+            try:
+                if cancelled.is_set():
+                    return
+                async for result in self.arun(items, use_cache, fields, cancelled):
+                    results.put(result)
+            except asyncio.CancelledError:
+                logger.info('Batch cancelado tras desconectarse el cliente')
+            except Exception as e:
+                logger.error('Error inesperado en batch: %s', e, exc_info=True)
+                results.put(e)
+            finally:
+                results.put(_DONE)
+        
+        started_at = time.perf_counter()
+        context = contextvars.copy_context()
+        worker = threading.Thread(
+            target=context.run, args=(asyncio.run, produce()), name='batch-chat', daemon=True
+        )
+        worker.start()
+        
+        completed = 0
+        finished = False
+        try:
+            while True:
+                result = results.get()
+                if result is _DONE:
+                    finished = True
+                    break
+                if isinstance(result, Exception):
+                    raise result
+                completed += 1
+                yield result
+        finally:
+            if not finished:
+                self._cancel(cancelled, running)
+        
+        worker.join()
+        logger.info('Batch completado: %s/%s items en %ss', completed, len(items), round(time.perf_counter() - started_at, 3))
+    
+    @staticmethod
+    def _cancel(cancelled: threading.Event, running: Dict[str, Any]):
+        cancelled.set()
+        if 'task' not in running:
+            return
+        try:
+            running['loop'].call_soon_threadsafe(running['task'].cancel)
+        except RuntimeError:
+            pass
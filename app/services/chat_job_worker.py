@@ -0,0 +1,121 @@
+import os
+import socket
+import threading
+from typing import Optional
+from flask import Flask
+from app.config import Config
+from app.services.chat_orchestrator import ChatOrchestrator
+from app.services.job_service import JobService
+from app.services.quota_service import QuotaIdentity, bind_identity
+from app.utils import json_codec
+from app.utils.errors import is_retryable_error
+from app.utils.http_client import get_webhook_session, get_http_timeout
+from app.utils.response_fields import parse_fields
+from app.utils.validators import validate_webhook_url
+from app.utils.logger import get_logger
+
+logger = get_logger(__name__)
+
+
+class ChatJobWorker:
+    def __init__(
+        self,
+        app: Flask,
+        job_service: JobService = None,
+        orchestrator: ChatOrchestrator = None,
+        consumer: Optional[str] = None
+    ):
+        self.app = app
+        self.job_service = job_service or JobService()
+        self.orchestrator = orchestrator or ChatOrchestrator()
+        self.consumer = consumer or f'{socket.gethostname()}-{os.getpid()}'
+        self.max_deliveries = Config.JOB_MAX_DELIVERIES
+        self.claim_idle_ms = Config.JOB_CLAIM_IDLE_MS
+        self.retry_backoff_ms = Config.JOB_RETRY_BACKOFF_MS
+        self.block_ms = Config.JOB_READ_BLOCK_MS
+        self._stop_event = threading.Event()
+    
+    def stop(self):
+        self._stop_event.set()
+    
+    def run(self):
+        self.job_service.ensure_group()
+        logger.info('Worker %s consumiendo %s', self.consumer, self.job_service.stream_key)
+        
+        while not self._stop_event.is_set():
+            try:
+                self.job_service.promote_due()
+                entries = self.job_service.claim_stale(self.consumer, self.claim_idle_ms, 1)
+                if not entries:
+                    entries = self.job_service.read(self.consumer, 1, self.block_ms)
+                for entry_id, job_id in entries:
+                    self.process(entry_id, job_id)
+            except Exception as e:
+                logger.error('Error en worker %s: %s', self.consumer, e, exc_info=True)
+                self._stop_event.wait(1)
+        
+        logger.info('Worker %s detenido', self.consumer)
+    
+    def process(self, entry_id: str, job_id: str):
+        job = self.job_service.load_job(job_id) if job_id else None
+        if job is None or job['status'] in ('completed', 'failed'):
+            self.job_service.ack(entry_id)
+            return
+        
+        attempts = self.job_service.mark_running(job_id, self.consumer)
+        if attempts > self.max_deliveries:
+            logger.warning('Job %s descartado tras %s entregas', job_id, attempts - 1)
+            self._finish_failed(entry_id, job, 'Número máximo de entregas excedido')
+            return
+        
+        logger.info('Procesando job %s (intento %s)', job_id, attempts)
+        identity = QuotaIdentity.from_dict(json_codec.loads(job['identity'])) if job.get('identity') else None
+        try:
+            with self.app.app_context(), bind_identity(identity):
+                result = self.orchestrator.chat(
+                    job['message'],
+                    job.get('conversation_id') or None,
+                    use_cache=job.get('use_cache') != '0',
+                    fields=parse_fields(job.get('fields'))
+                )
+        except Exception as e:
+            if is_retryable_error(e) and attempts < self.max_deliveries:
+                delay = self.retry_backoff_ms * 2 ** (attempts - 1) / 1000
+                logger.warning('Job %s falló con error reintentable, se reintentará en %ss: %s', job_id, delay, e)
+                self.job_service.requeue(entry_id, job_id, str(e), delay)
+                return
+            logger.error('Job %s falló: %s', job_id, e)
+            self._finish_failed(entry_id, job, str(e))
+            return
+        
+        self.job_service.complete(job_id, result)
+        self.job_service.ack(entry_id)
+        logger.info('Job %s completado', job_id)
+        self._notify(job)
+    
+    def _finish_failed(self, entry_id: str, job: dict, error: str):
+        self.job_service.fail(job['job_id'], error)
+        self.job_service.ack(entry_id)
+        self._notify(job)
+    
+    def _notify(self, job: dict):
+        webhook_url = job.get('webhook_url')
+        if not webhook_url:
+            return
+        
+        valid, error = validate_webhook_url(webhook_url)
+        if not valid:
+            logger.error('Webhook del job %s descartado: %s', job['job_id'], error)
+            return
+        
+        try:
+            response = get_webhook_session().post(
+                webhook_url,
+                json=self.job_service.get_job(job['job_id']),
+                timeout=get_http_timeout(),
+                allow_redirects=False
+            )
+            response.raise_for_status()
+            logger.info('Webhook del job %s entregado a %s', job['job_id'], webhook_url)
+        except Exception as e:
+            logger.error('Error al entregar webhook del job %s: %s', job['job_id'], e)
@@ -1,8 +1,24 @@
-from typing import Dict, Any, Optional
+import asyncio
+import time
+from typing import Dict, Any, List, Optional, Iterator, Sequence, Tuple, Callable
+from app.config import Config
 from app.services.llm_selector_service import LLMSelectorService
+from app.services.llm_routing_table import RoutedLLM
 from app.services.conversation_service import ConversationService
+from app.services.context_window_service import ContextWindowService
 from app.services.usage_service import UsageService
+from app.services.quota_service import QuotaService, quota_service as default_quota_service
+from app.services.response_cache_service import ResponseCache, response_cache as default_response_cache
+from app.services.circuit_breaker_service import CircuitOpenError
+from app.services.single_flight_service import SingleFlight, single_flight as default_single_flight
+from app.services.llm.base_llm_service import BaseLLMService
 from app.factories.llm_service_factory import LLMServiceFactory
+from app.utils.errors import is_retryable_error
+from app.utils.http_client import bind_deadline
+from app.utils.token_estimator import estimate_messages_tokens
+from app.utils.response_fields import project_response, with_required_fields
+from app.utils.metrics import STAGE_LATENCY, STREAM_TIME_TO_FIRST_TOKEN, observe_provider_call, record_token_usage
+from app.utils.tracing import span
 from app.utils.logger import get_logger
 
 logger = get_logger(__name__)
@@ -13,37 +29,444 @@ class ChatOrchestrator:
         self,
         selector: LLMSelectorService = None,
         conversation_service: ConversationService = None,
-        usage_service: UsageService = None
+        usage_service: UsageService = None,
+        response_cache: ResponseCache = None,
+        context_window_service: ContextWindowService = None,
+        single_flight: SingleFlight = None,
+        quota_service: QuotaService = None,
+        max_attempts: Optional[int] = None,
+        deadline: Optional[float] = None
     ):
         self.selector = selector or LLMSelectorService()
         self.conversation_service = conversation_service or ConversationService()
         self.usage_service = usage_service or UsageService()
+        self.response_cache = response_cache or default_response_cache
+        self.context_window_service = context_window_service or ContextWindowService()
+        self.single_flight = single_flight or default_single_flight
+        self.quota_service = quota_service or default_quota_service
+        self.max_attempts = max_attempts or Config.CHAT_FAILOVER_MAX_ATTEMPTS
+        self.deadline = deadline or Config.CHAT_FAILOVER_DEADLINE
     
-    def chat(self, message: str, conversation_id: Optional[str] = None) -> Dict[str, Any]:
-        logger.info(f'Iniciando chat - conversation_id: {conversation_id}')
+    def _get_llm_service(self, llm: RoutedLLM) -> BaseLLMService:
+        llm_service = LLMServiceFactory.get_service(llm.integration)
+        if not llm_service:
+            logger.error('Servicio no disponible para integración: %s', llm.integration)
+            raise ValueError(f'Servicio no disponible para {llm.integration}')
+        return llm_service
+    
+    @staticmethod
+    def _provider_labels(llm_service: BaseLLMService) -> Tuple[str, str]:
+        integration = llm_service.get_integration_name()
+        return integration, llm_service.get_model_name() or integration
+    
+    def _invoke(
+        self,
+        llm_service: BaseLLMService,
+        messages: List[Dict[str, str]],
+        fields: Optional[Sequence[str]] = None
+    ) -> Dict[str, Any]:
+        labels = self._provider_labels(llm_service)
+        started_at = time.perf_counter()
+        try:
+            with span('llm'):
+                response = llm_service.chat(messages, fields)
+        except CircuitOpenError:
+            raise
+        except Exception:
+            observe_provider_call(*labels, time.perf_counter() - started_at, failed=True)
+            raise
+        observe_provider_call(*labels, time.perf_counter() - started_at)
+        record_token_usage(*labels, response.get('usage'))
+        return response
+    
+    async def _ainvoke(
+        self,
+        llm_service: BaseLLMService,
+        messages: List[Dict[str, str]],
+        fields: Optional[Sequence[str]] = None
+    ) -> Dict[str, Any]:
+        labels = self._provider_labels(llm_service)
+        started_at = time.perf_counter()
+        try:
+            with span('llm'):
+                response = await llm_service.achat(messages, fields)
+        except CircuitOpenError:
+            raise
+        except Exception:
+            observe_provider_call(*labels, time.perf_counter() - started_at, failed=True)
+            raise
+        observe_provider_call(*labels, time.perf_counter() - started_at)
+        record_token_usage(*labels, response.get('usage'))
+        return response
+    
+    def _call_llm(
+        self,
+        llm_service: BaseLLMService,
+        messages: List[Dict[str, str]],
+        use_cache: bool,
+        fields: Optional[Sequence[str]] = None
+    ) -> Tuple[Dict[str, Any], bool]:
+        if not use_cache or not (self.response_cache.enabled or self.single_flight.enabled):
+            return self._invoke(llm_service, messages, fields), False
+        
+        request_key = self.response_cache.build_key(llm_service, messages, fields)
+        response, shared = self.single_flight.do(request_key, lambda: self._invoke(llm_service, messages, fields))
+        if shared:
+            logger.info('Respuesta compartida de una llamada idéntica en curso')
+            return response, True
+        
+        self.response_cache.set(request_key, response)
+        return response, False
+    
+    async def _acall_llm(
+        self,
+        llm_service: BaseLLMService,
+        messages: List[Dict[str, str]],
+        use_cache: bool,
+        fields: Optional[Sequence[str]] = None
+    ) -> Tuple[Dict[str, Any], bool]:
+        if not use_cache or not (self.response_cache.enabled or self.single_flight.enabled):
+            return await self._ainvoke(llm_service, messages, fields), False
+        
+        request_key = self.response_cache.build_key(llm_service, messages, fields)
+        response, shared = await self.single_flight.ado(request_key, lambda: self._ainvoke(llm_service, messages, fields))
+        if shared:
+            logger.info('Respuesta compartida de una llamada idéntica en curso')
+            return response, True
         
-        llm = self.selector.select_llm()
+        await asyncio.to_thread(self.response_cache.set, request_key, response)
+        return response, False
+    
+    def _record_failure(self, llm: RoutedLLM, error: Exception, started_at: float):
+        if is_retryable_error(error) and not isinstance(error, CircuitOpenError):
+            self.selector.record_outcome(llm, time.perf_counter() - started_at, False)
+    
+    def _record_usage(self, llm: RoutedLLM, usage: Optional[Dict[str, Any]]):
+        with span('record_usage'):
+            self.usage_service.increment(llm)
+            self.selector.record_tokens(llm, usage)
+            self.quota_service.record_usage(usage)
+    
+    def _cache_keys(
+        self,
+        llms_with_usage: List[Tuple[RoutedLLM, int]],
+        messages: List[Dict[str, str]],
+        fields: Optional[Sequence[str]] = None
+    ) -> Iterator[Tuple[RoutedLLM, str]]:
+        for llm, _ in llms_with_usage:
+            llm_service = LLMServiceFactory.get_service(llm.integration)
+            if not llm_service:
+                continue
+            window = self.context_window_service.build(messages, llm)
+            yield llm, self.response_cache.build_key(llm_service, window, fields)
+    
+    def _find_cached(
+        self,
+        llms_with_usage: List[Tuple[RoutedLLM, int]],
+        messages: List[Dict[str, str]],
+        use_cache: bool,
+        fields: Optional[Sequence[str]] = None
+    ) -> Optional[Tuple[RoutedLLM, Dict[str, Any]]]:
+        if not use_cache or not self.response_cache.enabled:
+            return None
         
-        conversation = self.conversation_service.get_or_create(
-            conversation_id, llm.name, message
+        with span('cache_lookup'):
+            cached = self.response_cache.get_first(self._cache_keys(llms_with_usage, messages, fields))
+        if cached is not None:
+            logger.info('Respuesta servida desde caché: %s', cached[0].name)
+        return cached
+    
+    def _token_estimator(self, messages: List[Dict[str, str]]) -> Callable[[RoutedLLM], int]:
+        return lambda llm: estimate_messages_tokens(self.context_window_service.build(messages, llm))
+    
+    def _select(
+        self,
+        messages: List[Dict[str, str]],
+        use_cache: bool = False,
+        fields: Optional[Sequence[str]] = None
+    ) -> Tuple[Iterator[RoutedLLM], RoutedLLM, Optional[Dict[str, Any]]]:
+        with span('select_llm'):
+            llms_with_usage = self.selector.order_llms()
+        
+        cached = self._find_cached(llms_with_usage, messages, use_cache, fields)
+        if cached is not None:
+            llm, response = cached
+            return iter(()), llm, response
+        
+        candidates = self.selector.iter_llms(llms_with_usage, self._token_estimator(messages))
+        with STAGE_LATENCY.labels('select_llm').time(), span('select_llm'):
+            llm = next(candidates)
+        return candidates, llm, None
+    
+    @staticmethod
+    def _pending_messages(conversation: Optional[Dict[str, Any]], message: str) -> List[Dict[str, str]]:
+        if conversation is None:
+            return [{'role': 'user', 'content': message}]
+        return conversation['messages']
+    
+    def _load_conversation(self, conversation_id: Optional[str], message: str) -> Optional[Dict[str, Any]]:
+        if not conversation_id:
+            return None
+        with span('load_conversation'):
+            return self.conversation_service.get_or_create(conversation_id, '', message)
+    
+    def _open_conversation(
+        self,
+        conversation: Optional[Dict[str, Any]],
+        llm: RoutedLLM,
+        message: str
+    ) -> Dict[str, Any]:
+        if conversation is not None:
+            return conversation
+        with span('load_conversation'):
+            return self.conversation_service.get_or_create(None, llm.name, message)
+    
+    def _prepare(
+        self,
+        message: str,
+        conversation_id: Optional[str],
+        use_cache: bool = False,
+        fields: Optional[Sequence[str]] = None
+    ) -> Tuple[Iterator[RoutedLLM], RoutedLLM, Dict[str, Any], Optional[Dict[str, Any]]]:
+        conversation = self._load_conversation(conversation_id, message)
+        candidates, llm, response = self._select(
+            self._pending_messages(conversation, message), use_cache, fields
         )
+        conversation = self._open_conversation(conversation, llm, message)
+        return candidates, llm, conversation, response
+    
+    def _next_candidate(
+        self,
+        candidates: Iterator[RoutedLLM],
+        failed_llm: RoutedLLM,
+        error: Exception,
+        attempts: int,
+        deadline_at: float
+    ) -> Optional[RoutedLLM]:
+        if not is_retryable_error(error):
+            return None
         
-        llm_service = LLMServiceFactory.get_service(llm.integration)
-        if not llm_service:
-            logger.error(f'Servicio no disponible para integración: {llm.integration}')
-            raise ValueError(f'Servicio no disponible para {llm.integration}')
+        if attempts >= self.max_attempts:
+            logger.warning('Presupuesto de reintentos agotado tras %s intentos', attempts)
+            return None
         
-        response = llm_service.chat(conversation['messages'])
+        if time.monotonic() >= deadline_at:
+            logger.warning('Plazo total de la solicitud agotado tras %s intentos', attempts)
+            return None
         
-        self.conversation_service.save_response(
-            conversation, response.get('text', '')
+        next_llm = next(candidates, None)
+        if next_llm is not None:
+            logger.warning('Failover de %s a %s: %s', failed_llm.name, next_llm.name, error)
+        return next_llm
+    
+    def chat(
+        self,
+        message: str,
+        conversation_id: Optional[str] = None,
+        use_cache: bool = True,
+        fields: Optional[Sequence[str]] = None
+    ) -> Dict[str, Any]:
+        logger.info('Iniciando chat - conversation_id: %s', conversation_id)
+        
+        service_fields = with_required_fields(fields)
+        deadline_at = time.monotonic() + self.deadline
+        candidates, llm, conversation, response = self._prepare(
+            message, conversation_id, use_cache, service_fields
         )
-        self.usage_service.increment(llm.id)
         
+        reused = response is not None
+        attempts = 0
+        while response is None:
+            attempts += 1
+            started_at = time.perf_counter()
+            try:
+                with span('context_window'):
+                    window = self.context_window_service.build(conversation['messages'], llm)
+                with bind_deadline(deadline_at):
+                    response, reused = self._call_llm(
+                        self._get_llm_service(llm), window, use_cache, service_fields
+                    )
+                if not reused:
+                    self.selector.record_outcome(llm, time.perf_counter() - started_at, True)
+            except Exception as e:
+                self._record_failure(llm, e, started_at)
+                next_llm = self._next_candidate(candidates, llm, e, attempts, deadline_at)
+                if next_llm is None:
+                    raise
+                llm = next_llm
+        
+        conversation['model'] = llm.name
+        with span('save_conversation'):
+            self.conversation_service.save_response(
+                conversation, response.get('text', '')
+            )
+        if not reused:
+            self._record_usage(llm, response.get('usage'))
+        
+        response = project_response(response, fields)
         response['conversation_id'] = conversation['conversation_id']
         
-        logger.info(f'Chat completado - conversation_id: {conversation["conversation_id"]}')
+        logger.info('Chat completado - conversation_id: %s', conversation['conversation_id'])
         return response
     
+    async def achat(
+        self,
+        message: str,
+        conversation_id: Optional[str] = None,
+        use_cache: bool = True,
+        fields: Optional[Sequence[str]] = None
+    ) -> Dict[str, Any]:
+        logger.info('Iniciando chat asíncrono - conversation_id: %s', conversation_id)
+        
+        service_fields = with_required_fields(fields)
+        deadline_at = time.monotonic() + self.deadline
+        conversation = None
+        if conversation_id:
+            with span('load_conversation'):
+                conversation = await self.conversation_service.aget_or_create(conversation_id, '', message)
+        
+        candidates, llm, response = await asyncio.to_thread(
+            self._select, self._pending_messages(conversation, message), use_cache, service_fields
+        )
+        if conversation is None:
+            with span('load_conversation'):
+                conversation = await self.conversation_service.aget_or_create(None, llm.name, message)
+        
+        reused = response is not None
+        attempts = 0
+        while response is None:
+            attempts += 1
+            started_at = time.perf_counter()
+            try:
+                with span('context_window'):
+                    window = self.context_window_service.build(conversation['messages'], llm)
+                with bind_deadline(deadline_at):
+                    response, reused = await self._acall_llm(
+                        self._get_llm_service(llm), window, use_cache, service_fields
+                    )
+                if not reused:
+                    self.selector.record_outcome(llm, time.perf_counter() - started_at, True)
+            except Exception as e:
+                self._record_failure(llm, e, started_at)
+                next_llm = await asyncio.to_thread(
+                    self._next_candidate, candidates, llm, e, attempts, deadline_at
+                )
+                if next_llm is None:
+                    raise
+                llm = next_llm
+        
+        conversation['model'] = llm.name
+        with span('save_conversation'):
+            await self.conversation_service.asave_response(
+                conversation, response.get('text', '')
+            )
+        if not reused:
+            await asyncio.to_thread(self._record_usage, llm, response.get('usage'))
+        
+        response = project_response(response, fields)
+        response['conversation_id'] = conversation['conversation_id']
+        
+        logger.info('Chat asíncrono completado - conversation_id: %s', conversation['conversation_id'])
+        return response
+    
+    def chat_stream(self, message: str, conversation_id: Optional[str] = None) -> Iterator[Dict[str, Any]]:
+        logger.info('Iniciando chat en streaming - conversation_id: %s', conversation_id)
+        
+        started_at = time.perf_counter()
+        deadline_at = time.monotonic() + self.deadline
+        candidates, llm, conversation, _ = self._prepare(message, conversation_id)
+        
+        parts = []
+        model = None
+        usage = {}
+        finish_reason = None
+        time_to_first_token = None
+        first_token_at = None
+        
+        attempts = 0
+        while True:
+            attempts += 1
+            labels = None
+            try:
+                window = self.context_window_service.build(conversation['messages'], llm)
+                llm_service = self._get_llm_service(llm)
+                labels = self._provider_labels(llm_service)
+                provider_started_at = time.perf_counter()
+                for chunk in llm_service.chat_stream(window):
+                    if chunk.get('model'):
+                        model = chunk['model']
+                    if chunk.get('usage'):
+                        usage = chunk['usage']
+                    if chunk.get('finish_reason'):
+                        finish_reason = chunk['finish_reason']
+                    
+                    text = chunk.get('text')
+                    if not text:
+                        continue
+                    
+                    if time_to_first_token is None:
+                        first_token_at = time.perf_counter()
+                        time_to_first_token = first_token_at - started_at
+                        STREAM_TIME_TO_FIRST_TOKEN.labels(*labels).observe(time_to_first_token)
+                        yield {
+                            'event': 'start',
+                            'conversation_id': conversation['conversation_id'],
+                            'model': llm.name
+                        }
+                    
+                    parts.append(text)
+                    yield {'event': 'delta', 'text': text}
+                observe_provider_call(*labels, time.perf_counter() - provider_started_at)
+                record_token_usage(*labels, usage)
+                self.selector.record_outcome(
+                    llm, (first_token_at or time.perf_counter()) - provider_started_at, True
+                )
+                break
+            except Exception as e:
+                if labels is not None and not isinstance(e, CircuitOpenError):
+                    observe_provider_call(*labels, time.perf_counter() - provider_started_at, failed=True)
+                    self._record_failure(llm, e, provider_started_at)
+                if parts:
+                    raise
+                next_llm = self._next_candidate(candidates, llm, e, attempts, deadline_at)
+                if next_llm is None:
+                    raise
+                llm = next_llm
+        
+        if time_to_first_token is None:
+            yield {
+                'event': 'start',
+                'conversation_id': conversation['conversation_id'],
+                'model': llm.name
+            }
+        
+        full_text = ''.join(parts)
+        
+        conversation['model'] = llm.name
+        self.conversation_service.save_response(conversation, full_text)
+        self._record_usage(llm, usage)
+        
+        duration = time.perf_counter() - started_at
+        ttft_ms = round(time_to_first_token * 1000, 2) if time_to_first_token is not None else None
+        
+        logger.info(
+            'Chat en streaming completado - conversation_id: %s, ttft_ms: %s, duration_ms: %s',
+            conversation['conversation_id'], ttft_ms, round(duration * 1000, 2)
+        )
+        
+        yield {
+            'event': 'done',
+            'conversation_id': conversation['conversation_id'],
+            'text': full_text,
+            'model': model,
+            'usage': usage,
+            'finish_reason': finish_reason,
+            'time_to_first_token_ms': ttft_ms,
+            'duration_ms': round(duration * 1000, 2)
+        }
+    
     def get_history(self, conversation_id: str) -> Dict[str, Any]:
         return self.conversation_service.get_history(conversation_id)
+    
+    async def aget_history(self, conversation_id: str) -> Dict[str, Any]:
+        return await self.conversation_service.aget_history(conversation_id)
@@ -0,0 +1,218 @@
+import math
+import threading
+import time
+from typing import Dict, Any, Optional
+from app.config import Config
+from app.services.redis_service import get_redis_client
+from app.utils.errors import is_retryable_error
+from app.utils.metrics import CIRCUIT_TRANSITIONS
+from app.utils.logger import get_logger
+
+logger = get_logger(__name__)
+
+CLOSED = 'closed'
+OPEN = 'open'
+HALF_OPEN = 'half_open'
+
+
+class CircuitOpenError(ConnectionError):
+    def __init__(self, integration: str, retry_after: int = 1):
+        super().__init__(f'Circuito abierto para {integration}')
+        self.integration = integration
+        self.retry_after = retry_after
+
+
+class CircuitBreaker:
+    def __init__(
+        self,
+        name: str,
+        failure_threshold: Optional[int] = None,
+        failure_window: Optional[int] = None,
+        recovery_timeout: Optional[float] = None,
+        probe_timeout: Optional[int] = None,
+        sync_interval: Optional[float] = None
+    ):
+        self.name = name
+        self.failure_threshold = failure_threshold or Config.CIRCUIT_BREAKER_FAILURE_THRESHOLD
+        self.failure_window = failure_window or Config.CIRCUIT_BREAKER_FAILURE_WINDOW
+        self.recovery_timeout = recovery_timeout or Config.CIRCUIT_BREAKER_RECOVERY_TIMEOUT
+        self.probe_timeout = probe_timeout or Config.CIRCUIT_BREAKER_PROBE_TIMEOUT
+        self.sync_interval = Config.CIRCUIT_BREAKER_SYNC_INTERVAL if sync_interval is None else sync_interval
+        self._opened_at: Optional[float] = None
+        self._failures = 0
+        self._probe_until = 0.0
+        self._synced_at = 0.0
+    
+    @property
+    def _failures_key(self) -> str:
+        return f'circuit:{self.name}:failures'
+    
+    @property
+    def _opened_key(self) -> str:
+        return f'circuit:{self.name}:opened_at'
+    
+    @property
+    def _probe_key(self) -> str:
+        return f'circuit:{self.name}:probe'
+    
+    def _sync(self):
+        now = time.monotonic()
+        if now - self._synced_at < self.sync_interval:
+            return
+        self._synced_at = now
+        
+        try:
+            pipe = get_redis_client().pipeline()
+            pipe.get(self._opened_key)
+            pipe.get(self._failures_key)
+            opened_at, failures = pipe.execute()
+            self._opened_at = float(opened_at) if opened_at else None
+            self._failures = int(failures or 0)
+        except Exception as e:
+            logger.warning('No se pudo sincronizar el circuito de %s, usando estado local: %s', self.name, e)
+    
+    def _open(self, now: float):
+        self._opened_at = now
+        self._failures = 0
+        self._probe_until = 0.0
+        self._synced_at = time.monotonic()
+        
+        try:
+            pipe = get_redis_client().pipeline()
+            pipe.set(self._opened_key, now)
+            pipe.delete(self._failures_key, self._probe_key)
+            pipe.execute()
+        except Exception as e:
+            logger.warning('No se pudo compartir la apertura del circuito de %s: %s', self.name, e)
+        
+        CIRCUIT_TRANSITIONS.labels(self.name, OPEN).inc()
+        logger.warning('Circuito abierto para %s durante %ss', self.name, self.recovery_timeout)
+    
+    def _acquire_probe(self) -> bool:
+        try:
+            return bool(get_redis_client().set(self._probe_key, 1, nx=True, ex=self.probe_timeout))
+        except Exception as e:
+            logger.warning('No se pudo coordinar la prueba del circuito de %s: %s', self.name, e)
+            now = time.monotonic()
+            if now < self._probe_until:
+                return False
+            self._probe_until = now + self.probe_timeout
+            return True
+    
+    def _release_probe(self):
+        self._probe_until = 0.0
+        try:
+            get_redis_client().delete(self._probe_key)
+        except Exception as e:
+            logger.warning('No se pudo liberar la prueba del circuito de %s: %s', self.name, e)
+    
+    def get_state(self) -> str:
+        self._sync()
+        if self._opened_at is None:
+            return CLOSED
+        if time.time() - self._opened_at < self.recovery_timeout:
+            return OPEN
+        return HALF_OPEN
+    
+    def is_open(self) -> bool:
+        return self.get_state() == OPEN
+    
+    def retry_after(self) -> int:
+        if self._opened_at is None:
+            return 1
+        return max(1, math.ceil(self._opened_at + self.recovery_timeout - time.time()))
+    
+    def allow_request(self) -> bool:
+        state = self.get_state()
+        if state == CLOSED:
+            return True
+        if state == OPEN:
+            return False
+        
+        if self._acquire_probe():
+            CIRCUIT_TRANSITIONS.labels(self.name, HALF_OPEN).inc()
+            logger.info('Circuito semiabierto para %s, enviando solicitud de prueba', self.name)
+            return True
+        return False
+    
+    def record_success(self):
+        if self._opened_at is None and self._failures == 0:
+            return
+        
+        was_open = self._opened_at is not None
+        self._opened_at = None
+        self._failures = 0
+        self._probe_until = 0.0
+        self._synced_at = time.monotonic()
+        
+        try:
+            get_redis_client().delete(self._opened_key, self._failures_key, self._probe_key)
+        except Exception as e:
+            logger.warning('No se pudo compartir el cierre del circuito de %s: %s', self.name, e)
+        
+        if was_open:
+            CIRCUIT_TRANSITIONS.labels(self.name, CLOSED).inc()
+            logger.info('Circuito cerrado para %s', self.name)
+    
+    def record_failure(self, error: Exception):
+        if not is_retryable_error(error):
+            if self._opened_at is not None:
+                self._release_probe()
+            return
+        
+        now = time.time()
+        if self._opened_at is not None:
+            self._open(now)
+            return
+        
+        try:
+            client = get_redis_client()
+            failures = client.incr(self._failures_key)
+            if failures == 1:
+                client.expire(self._failures_key, self.failure_window)
+        except Exception as e:
+            logger.warning('No se pudo compartir el fallo del circuito de %s: %s', self.name, e)
+            failures = self._failures + 1
+        
+        self._failures = failures
+        logger.debug('Fallo registrado en el circuito de %s (%s/%s)', self.name, failures, self.failure_threshold)
+        if failures >= self.failure_threshold:
+            self._open(now)
+    
+    def to_dict(self) -> Dict[str, Any]:
+        state = self.get_state()
+        return {
+            'state': state,
+            'failures': self._failures,
+            'failure_threshold': self.failure_threshold,
+            'retry_after': self.retry_after() if state == OPEN else None
+        }
+
+
+class CircuitBreakerRegistry:
+    def __init__(self, enabled: Optional[bool] = None):
+        self.enabled = Config.CIRCUIT_BREAKER_ENABLED if enabled is None else enabled
+        self._breakers: Dict[str, CircuitBreaker] = {}
+        self._lock = threading.Lock()
+    
+    def get(self, name: str) -> CircuitBreaker:
+        breaker = self._breakers.get(name)
+        if breaker is None:
+            with self._lock:
+                breaker = self._breakers.setdefault(name, CircuitBreaker(name))
+        return breaker
+    
+    def is_open(self, name: str) -> bool:
+        return self.enabled and self.get(name).is_open()
+    
+    def retry_after(self, name: str) -> int:
+        return self.get(name).retry_after()
+    
+    def get_stats(self) -> Dict[str, Any]:
+        return {
+            'enabled': self.enabled,
+            'circuits': {name: breaker.to_dict() for name, breaker in self._breakers.items()}
+        }
+
+
+circuit_breakers = CircuitBreakerRegistry()
@@ -0,0 +1,59 @@
+from typing import Dict, Any, List, Optional
+from app.config import Config
+from app.utils.token_estimator import estimate_message_tokens
+from app.utils.logger import get_logger
+
+logger = get_logger(__name__)
+
+
+class ContextWindowService:
+    def __init__(self, default_budget: Optional[int] = None):
+        self.default_budget = default_budget or Config.CONTEXT_WINDOW_DEFAULT_TOKENS
+    
+    @staticmethod
+    def is_pinned(message: Dict[str, Any]) -> bool:
+        return message.get('role') == 'system' or bool(message.get('pinned'))
+    
+    def get_budget(self, llm: Any) -> int:
+        return getattr(llm, 'context_tokens', 0) or self.default_budget
+    
+    def build(self, messages: List[Dict[str, Any]], llm: Any) -> List[Dict[str, Any]]:
+        if not messages:
+            return messages
+        
+        budget = self.get_budget(llm)
+        
+        pinned_indexes = {i for i, message in enumerate(messages) if self.is_pinned(message)}
+        used = sum(estimate_message_tokens(messages[i]) for i in pinned_indexes)
+        selected = set(pinned_indexes)
+        
+        last_index = len(messages) - 1
+        if last_index not in selected:
+            selected.add(last_index)
+            used += estimate_message_tokens(messages[last_index])
+        
+        for i in range(last_index - 1, -1, -1):
+            if i in selected:
+                continue
+            tokens = estimate_message_tokens(messages[i])
+            if used + tokens > budget:
+                break
+            selected.add(i)
+            used += tokens
+        
+        history_indexes = sorted(i for i in selected if i not in pinned_indexes and i != last_index)
+        for i in history_indexes:
+            if messages[i].get('role') == 'user':
+                break
+            selected.discard(i)
+            used -= estimate_message_tokens(messages[i])
+        
+        if len(selected) == len(messages):
+            return messages
+        
+        window = [messages[i] for i in sorted(selected)]
+        logger.info(
+            'Ventana de contexto: %s/%s mensajes, ~%s tokens (presupuesto: %s)',
+            len(window), len(messages), used, budget
+        )
+        return window
@@ -2,7 +2,10 @@ from typing import Dict, Any, Optional
 from app.services.redis_service import (
     create_conversation,
     get_conversation_history,
-    save_message
+    append_messages,
+    acreate_conversation,
+    aget_conversation_history,
+    aappend_messages
 )
 from app.utils.logger import get_logger
 
@@ -10,47 +13,98 @@ logger = get_logger(__name__)
 
 
 class ConversationService:
-    def get_or_create(
+    def _on_created(self, conversation: Optional[Dict[str, Any]]) -> Dict[str, Any]:
+        if not conversation:
+            logger.error('Error al crear conversación')
+            raise ValueError('Error al crear conversación')
+        conversation['stored_count'] = len(conversation['messages'])
+        logger.info('Nueva conversación creada: %s', conversation['conversation_id'])
+        return conversation
+    
+    def _on_loaded(
         self,
-        conversation_id: Optional[str],
+        conversation: Dict[str, Any],
+        conversation_id: str,
         model_name: str,
         message: str
     ) -> Dict[str, Any]:
-        if not conversation_id:
-            conversation = create_conversation(model_name, message)
-            if not conversation:
-                logger.error('Error al crear conversación')
-                raise ValueError('Error al crear conversación')
-            logger.info(f'Nueva conversación creada: {conversation["conversation_id"]}')
-            return conversation
-        else:
-            conversation = get_conversation_history(conversation_id)
-            if not conversation.get('messages'):
-                conversation['messages'] = []
-            if not conversation.get('model'):
-                conversation['model'] = model_name
-            
-            conversation['messages'].append({
-                'role': 'user',
-                'content': message
-            })
-            conversation['conversation_id'] = conversation_id
-            logger.debug(f'Mensaje añadido a conversación existente: {conversation_id}')
-            return conversation
+        if not conversation.get('messages'):
+            conversation['messages'] = []
+        if not conversation.get('model'):
+            conversation['model'] = model_name
+        conversation['stored_count'] = len(conversation['messages'])
+        
+        conversation['messages'].append({
+            'role': 'user',
+            'content': message
+        })
+        conversation['conversation_id'] = conversation_id
+        logger.debug('Mensaje añadido a conversación existente: %s', conversation_id)
+        return conversation
     
-    def save_response(self, conversation: Dict[str, Any], response_text: str) -> bool:
+    def _add_response(self, conversation: Dict[str, Any], response_text: str):
         if response_text:
             conversation['messages'].append({
                 'role': 'model',
                 'content': response_text
             })
-        
-        success = save_message(conversation)
+    
+    def _on_saved(self, conversation: Dict[str, Any], success: bool) -> bool:
         if success:
-            logger.debug(f'Respuesta guardada en conversación: {conversation["conversation_id"]}')
+            conversation['stored_count'] = len(conversation['messages'])
+            logger.debug('Respuesta guardada en conversación: %s', conversation['conversation_id'])
         else:
-            logger.warning(f'Error al guardar respuesta en conversación: {conversation.get("conversation_id")}')
+            logger.warning('Error al guardar respuesta en conversación: %s', conversation.get('conversation_id'))
         return success
     
+    def get_or_create(
+        self,
+        conversation_id: Optional[str],
+        model_name: str,
+        message: str
+    ) -> Dict[str, Any]:
+        if not conversation_id:
+            return self._on_created(create_conversation(model_name, message))
+        
+        conversation = get_conversation_history(conversation_id)
+        return self._on_loaded(conversation, conversation_id, model_name, message)
+    
+    async def aget_or_create(
+        self,
+        conversation_id: Optional[str],
+        model_name: str,
+        message: str
+    ) -> Dict[str, Any]:
+        if not conversation_id:
+            return self._on_created(await acreate_conversation(model_name, message))
+        
+        conversation = await aget_conversation_history(conversation_id)
+        return self._on_loaded(conversation, conversation_id, model_name, message)
+    
+    def save_response(self, conversation: Dict[str, Any], response_text: str) -> bool:
+        self._add_response(conversation, response_text)
+        
+        stored_count = conversation.get('stored_count', 0)
+        success = append_messages(
+            conversation['conversation_id'],
+            conversation['messages'][stored_count:],
+            model=conversation.get('model')
+        )
+        return self._on_saved(conversation, success)
+    
+    async def asave_response(self, conversation: Dict[str, Any], response_text: str) -> bool:
+        self._add_response(conversation, response_text)
+        
+        stored_count = conversation.get('stored_count', 0)
+        success = await aappend_messages(
+            conversation['conversation_id'],
+            conversation['messages'][stored_count:],
+            model=conversation.get('model')
+        )
+        return self._on_saved(conversation, success)
+    
     def get_history(self, conversation_id: str) -> Dict[str, Any]:
         return get_conversation_history(conversation_id)
+    
+    async def aget_history(self, conversation_id: str) -> Dict[str, Any]:
+        return await aget_conversation_history(conversation_id)
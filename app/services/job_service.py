@@ -0,0 +1,175 @@
+import time
+import uuid
+from typing import Dict, Any, List, Optional, Sequence, Tuple
+import redis
+from app.config import Config
+from app.services.redis_service import get_redis_client
+from app.services.quota_service import QuotaIdentity
+from app.utils import json_codec
+from app.utils.validators import validate_webhook_url
+from app.utils.logger import get_logger
+
+logger = get_logger(__name__)
+
+JOB_KEY_PREFIX = 'chat:job:'
+
+PROMOTE_DUE_SCRIPT = '''
+local due = redis.call('ZRANGEBYSCORE', KEYS[1], '-inf', ARGV[1], 'LIMIT', 0, tonumber(ARGV[2]))
+for _, job_id in ipairs(due) do
+    redis.call('ZREM', KEYS[1], job_id)
+    redis.call('XADD', KEYS[2], 'MAXLEN', '~', ARGV[3], '*', 'job_id', job_id)
+end
+return #due
+'''
+
+
+class JobService:
+    def __init__(self, stream_key: Optional[str] = None, group: Optional[str] = None):
+        self.stream_key = stream_key or Config.JOB_STREAM_KEY
+        self.group = group or Config.JOB_CONSUMER_GROUP
+        self.delayed_key = f'{self.stream_key}:delayed'
+        self.result_ttl = Config.JOB_RESULT_TTL
+        self._promote_script = None
+    
+    @staticmethod
+    def _job_key(job_id: str) -> str:
+        return f'{JOB_KEY_PREFIX}{job_id}'
+    
+    def ensure_group(self):
+        try:
+            get_redis_client().xgroup_create(self.stream_key, self.group, id='0', mkstream=True)
+            logger.info('Grupo de consumidores %s creado en %s', self.group, self.stream_key)
+        except redis.ResponseError as e:
+            if 'BUSYGROUP' not in str(e):
+                raise
+    
+    def enqueue(
+        self,
+        message: str,
+        conversation_id: Optional[str] = None,
+        webhook_url: Optional[str] = None,
+        use_cache: bool = True,
+        identity: Optional[QuotaIdentity] = None,
+        fields: Optional[Sequence[str]] = None
+    ) -> Dict[str, Any]:
+        if webhook_url:
+            valid, error = validate_webhook_url(webhook_url)
+            if not valid:
+                raise ValueError(error)
+        
+        job_id = str(uuid.uuid4())
+        job = {
+            'job_id': job_id,
+            'status': 'queued',
+            'message': message,
+            'conversation_id': conversation_id or '',
+            'webhook_url': webhook_url or '',
+            'use_cache': '1' if use_cache else '0',
+            'user_id': identity.user_id if identity else '',
+            'identity': json_codec.dumps(identity.to_dict()) if identity else '',
+            'fields': ','.join(fields) if fields is not None else '',
+            'attempts': 0,
+            'created_at': time.time()
+        }
+        
+        client = get_redis_client()
+        pipe = client.pipeline()
+        pipe.hset(self._job_key(job_id), mapping=job)
+        pipe.expire(self._job_key(job_id), self.result_ttl)
+        pipe.xadd(self.stream_key, {'job_id': job_id}, maxlen=Config.JOB_STREAM_MAXLEN, approximate=True)
+        pipe.execute()
+        
+        logger.info('Job %s encolado en %s', job_id, self.stream_key)
+        return self.get_job(job_id)
+    
+    def get_job(self, job_id: str, user_id: Optional[int] = None) -> Optional[Dict[str, Any]]:
+        job = get_redis_client().hgetall(self._job_key(job_id))
+        if not job:
+            return None
+        if user_id is not None and job.get('user_id') and job['user_id'] != str(user_id):
+            return None
+        
+        result = {
+            'job_id': job['job_id'],
+            'status': job['status'],
+            'conversation_id': job.get('conversation_id') or None,
+            'attempts': int(job.get('attempts', 0)),
+            'created_at': float(job['created_at'])
+        }
+        if job.get('finished_at'):
+            result['finished_at'] = float(job['finished_at'])
+        if job.get('result'):
+            result['result'] = json_codec.loads(job['result'])
+        if job.get('error'):
+            result['error'] = job['error']
+        return result
+    
+    def load_job(self, job_id: str) -> Optional[Dict[str, str]]:
+        return get_redis_client().hgetall(self._job_key(job_id)) or None
+    
+    def mark_running(self, job_id: str, consumer: str) -> int:
+        client = get_redis_client()
+        pipe = client.pipeline()
+        pipe.hincrby(self._job_key(job_id), 'attempts', 1)
+        pipe.hset(self._job_key(job_id), mapping={'status': 'running', 'consumer': consumer})
+        attempts, _ = pipe.execute()
+        return int(attempts)
+    
+    def complete(self, job_id: str, result: Dict[str, Any]):
+        self._finish(job_id, {'status': 'completed', 'result': json_codec.dumps(result)})
+    
+    def fail(self, job_id: str, error: str):
+        self._finish(job_id, {'status': 'failed', 'error': error})
+    
+    def requeue(self, entry_id: str, job_id: str, error: str, delay: float):
+        client = get_redis_client()
+        pipe = client.pipeline()
+        pipe.hset(self._job_key(job_id), mapping={'status': 'queued', 'error': error})
+        pipe.zadd(self.delayed_key, {job_id: time.time() + delay})
+        pipe.xack(self.stream_key, self.group, entry_id)
+        pipe.xdel(self.stream_key, entry_id)
+        pipe.execute()
+    
+    def promote_due(self, count: int = 100) -> int:
+        client = get_redis_client()
+        if self._promote_script is None or self._promote_script.registered_client is not client:
+            self._promote_script = client.register_script(PROMOTE_DUE_SCRIPT)
+        return int(self._promote_script(
+            keys=[self.delayed_key, self.stream_key],
+            args=[time.time(), count, Config.JOB_STREAM_MAXLEN]
+        ))
+    
+    def _finish(self, job_id: str, fields: Dict[str, str]):
+        client = get_redis_client()
+        pipe = client.pipeline()
+        pipe.hset(self._job_key(job_id), mapping={**fields, 'finished_at': time.time()})
+        pipe.expire(self._job_key(job_id), self.result_ttl)
+        pipe.execute()
+    
+    def read(self, consumer: str, count: int, block_ms: int) -> List[Tuple[str, str]]:
+        response = get_redis_client().xreadgroup(
+            self.group, consumer, {self.stream_key: '>'}, count=count, block=block_ms
+        )
+        entries = []
+        for _, messages in response or []:
+            for entry_id, fields in messages:
+                entries.append((entry_id, fields.get('job_id')))
+        return entries
+    
+    def claim_stale(self, consumer: str, min_idle_ms: int, count: int) -> List[Tuple[str, str]]:
+        response = get_redis_client().xautoclaim(
+            self.stream_key, self.group, consumer, min_idle_ms, start_id='0-0', count=count
+        )
+        entries = []
+        for entry_id, fields in response[1]:
+            if fields is None:
+                continue
+            entries.append((entry_id, fields.get('job_id')))
+        return entries
+    
+    def ack(self, entry_id: str):
+        client = get_redis_client()
+        pipe = client.pipeline()
+        pipe.xack(self.stream_key, self.group, entry_id)
+        pipe.xdel(self.stream_key, entry_id)
+        pipe.execute()
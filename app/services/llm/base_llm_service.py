@@ -1,12 +1,31 @@
+import asyncio
 from abc import ABC, abstractmethod
-from typing import Dict, Any, List
+from typing import Dict, Any, List, Iterator, Optional, Sequence
 
 
 class BaseLLMService(ABC):
     @abstractmethod
-    def chat(self, messages: List[Dict[str, str]]) -> Dict[str, Any]:
+    def chat(self, messages: List[Dict[str, str]], fields: Optional[Sequence[str]] = None) -> Dict[str, Any]:
         pass
     
+    async def achat(self, messages: List[Dict[str, str]], fields: Optional[Sequence[str]] = None) -> Dict[str, Any]:
+        return await asyncio.to_thread(self.chat, messages, fields)
+    
+    def map_messages(self, messages: List[Dict[str, str]]) -> List[Dict[str, str]]:
+        return messages
+    
+    def get_model_name(self) -> str:
+        return ''
+    
+    def chat_stream(self, messages: List[Dict[str, str]]) -> Iterator[Dict[str, Any]]:
+        response = self.chat(messages)
+        yield {
+            'text': response.get('text'),
+            'model': response.get('model'),
+            'usage': response.get('usage') or None,
+            'finish_reason': response.get('finish_reason')
+        }
+    
     @abstractmethod
     def supports_integration(self, integration: str) -> bool:
         pass
@@ -0,0 +1,58 @@
+from typing import Dict, Any, List, Iterator, Optional, Sequence
+from app.services.llm.base_llm_service import BaseLLMService
+from app.services.circuit_breaker_service import CircuitBreaker, CircuitOpenError
+
+
+class CircuitBreakerLLMService(BaseLLMService):
+    def __init__(self, service: BaseLLMService, breaker: CircuitBreaker):
+        self.service = service
+        self.breaker = breaker
+    
+    def __getattr__(self, name: str):
+        return getattr(self.service, name)
+    
+    def _before_call(self):
+        if not self.breaker.allow_request():
+            raise CircuitOpenError(self.get_integration_name(), self.breaker.retry_after())
+    
+    def chat(self, messages: List[Dict[str, str]], fields: Optional[Sequence[str]] = None) -> Dict[str, Any]:
+        self._before_call()
+        try:
+            response = self.service.chat(messages, fields)
+        except Exception as e:
+            self.breaker.record_failure(e)
+            raise
+        self.breaker.record_success()
+        return response
+    
+    async def achat(self, messages: List[Dict[str, str]], fields: Optional[Sequence[str]] = None) -> Dict[str, Any]:
+        self._before_call()
+        try:
+            response = await self.service.achat(messages, fields)
+        except Exception as e:
+            self.breaker.record_failure(e)
+            raise
+        self.breaker.record_success()
+        return response
+    
+    def chat_stream(self, messages: List[Dict[str, str]]) -> Iterator[Dict[str, Any]]:
+        self._before_call()
+        try:
+            for chunk in self.service.chat_stream(messages):
+                yield chunk
+        except Exception as e:
+            self.breaker.record_failure(e)
+            raise
+        self.breaker.record_success()
+    
+    def map_messages(self, messages: List[Dict[str, str]]) -> List[Dict[str, str]]:
+        return self.service.map_messages(messages)
+    
+    def get_model_name(self) -> str:
+        return self.service.get_model_name()
+    
+    def supports_integration(self, integration: str) -> bool:
+        return self.service.supports_integration(integration)
+    
+    def get_integration_name(self) -> str:
+        return self.service.get_integration_name()
@@ -1,9 +1,13 @@
-from typing import Dict, Any, List
+import asyncio
+import weakref
+from typing import Dict, Any, List, Iterator, Optional, Sequence
 from google import genai
 from app.services.llm.base_llm_service import BaseLLMService
 from app.adapters.gemini_adapter import GeminiAdapter
 from app.utils.consts import GEMINI_INTEGRATION
 from app.utils.model_selector import gemini_model_selector
+from app.utils.http_client import get_call_timeout
+from app.utils.tracing import span
 from app.utils.logger import get_logger
 
 logger = get_logger(__name__)
@@ -13,6 +17,7 @@ class GeminiLLMService(BaseLLMService):
     def __init__(self):
         self.adapter = GeminiAdapter()
         self._client = None
+        self._async_clients = weakref.WeakKeyDictionary()
     
     @property
     def client(self):
@@ -21,23 +26,89 @@ class GeminiLLMService(BaseLLMService):
             logger.debug('Cliente de Gemini inicializado')
         return self._client
     
-    def chat(self, messages: List[Dict[str, str]]) -> Dict[str, Any]:
+    @property
+    def async_client(self):
+        loop = asyncio.get_running_loop()
+        client = self._async_clients.get(loop)
+        if client is None:
+            client = genai.Client().aio
+            self._async_clients[loop] = client
+            logger.debug('Cliente asíncrono de Gemini inicializado')
+        return client
+    
+    def map_messages(self, messages: List[Dict[str, str]]) -> List[Dict[str, str]]:
+        return self.adapter.map_messages(messages)
+    
+    def get_model_name(self) -> str:
+        return gemini_model_selector()
+    
+    @staticmethod
+    def _request_options() -> Dict[str, Any]:
+        timeout = get_call_timeout()
+        return {'timeout': timeout} if timeout is not None else {}
+    
+    def chat(self, messages: List[Dict[str, str]], fields: Optional[Sequence[str]] = None) -> Dict[str, Any]:
         logger.info('Iniciando chat con Gemini API')
         
+        try:
+            with span('map_request'):
+                mapped_messages = self.adapter.map_messages(messages)
+            
+            with span('provider_request'):
+                interaction = self.client.interactions.create(
+                    model=gemini_model_selector(),
+                    input=mapped_messages,
+                    **self._request_options()
+                )
+            
+            logger.info('Respuesta recibida de Gemini API exitosamente')
+            with span('map_response'):
+                mapped_response = self.adapter.map_response(interaction, fields)
+            
+            return mapped_response
+        except Exception as e:
+            logger.error('Error al llamar a Gemini API: %s', e, exc_info=True)
+            raise
+    
+    async def achat(self, messages: List[Dict[str, str]], fields: Optional[Sequence[str]] = None) -> Dict[str, Any]:
+        logger.info('Iniciando chat asíncrono con Gemini API')
+        
+        try:
+            with span('map_request'):
+                mapped_messages = self.adapter.map_messages(messages)
+            
+            with span('provider_request'):
+                interaction = await self.async_client.interactions.create(
+                    model=gemini_model_selector(),
+                    input=mapped_messages,
+                    **self._request_options()
+                )
+            
+            logger.info('Respuesta asíncrona recibida de Gemini API exitosamente')
+            with span('map_response'):
+                return self.adapter.map_response(interaction, fields)
+        except Exception as e:
+            logger.error('Error al llamar a Gemini API: %s', e, exc_info=True)
+            raise
+    
+    def chat_stream(self, messages: List[Dict[str, str]]) -> Iterator[Dict[str, Any]]:
+        logger.info('Iniciando chat en streaming con Gemini API')
+        
         try:
             mapped_messages = self.adapter.map_messages(messages)
             
-            interaction = self.client.interactions.create(
+            stream = self.client.interactions.create(
                 model=gemini_model_selector(),
-                input=mapped_messages
+                input=mapped_messages,
+                stream=True
             )
             
-            logger.info('Respuesta recibida de Gemini API exitosamente')
-            mapped_response = self.adapter.map_response(interaction)
+            for event in stream:
+                yield self.adapter.map_stream_event(event)
             
-            return mapped_response
+            logger.info('Streaming de Gemini API completado exitosamente')
         except Exception as e:
-            logger.error(f'Error al llamar a Gemini API: {str(e)}', exc_info=True)
+            logger.error('Error en streaming de Gemini API: %s', e, exc_info=True)
             raise
     
     def supports_integration(self, integration: str) -> bool:
@@ -1,10 +1,14 @@
-from typing import Dict, Any, List
+from typing import Dict, Any, List, Iterator, Optional, Sequence
+import json
+import httpx
 import requests
 import os
 from app.services.llm.base_llm_service import BaseLLMService
 from app.adapters.ngrok_adapter import NgrokAdapter
 from app.utils.consts import NGROK_INTEGRATION
 from app.utils.model_selector import ngrok_model_selector
+from app.utils.http_client import get_http_session, get_http_timeout, get_async_http_client, get_async_http_timeout
+from app.utils.tracing import span
 from app.utils.logger import get_logger
 
 logger = get_logger(__name__)
@@ -16,42 +20,130 @@ class NgrokLLMService(BaseLLMService):
         self.base_url = os.environ.get('NGROK_BASE_URL', 'http://localhost:8080')
         self.api_key = os.environ.get('NGROK_API_KEY')
     
-    def chat(self, messages: List[Dict[str, str]]) -> Dict[str, Any]:
+    @property
+    def session(self) -> requests.Session:
+        return get_http_session(self.base_url)
+    
+    def _build_headers(self) -> Dict[str, str]:
+        headers = {
+            'Content-Type': 'application/json'
+        }
+        
+        if self.api_key:
+            headers['Authorization'] = f'Bearer {self.api_key}'
+        
+        return headers
+    
+    def map_messages(self, messages: List[Dict[str, str]]) -> List[Dict[str, str]]:
+        return self.adapter.map_messages(messages)
+    
+    def get_model_name(self) -> str:
+        return ngrok_model_selector()
+    
+    def chat(self, messages: List[Dict[str, str]], fields: Optional[Sequence[str]] = None) -> Dict[str, Any]:
         logger.info('Iniciando chat con NGROK API')
         
         try:
-            mapped_messages = self.adapter.map_messages(messages)
+            with span('map_request'):
+                mapped_messages = self.adapter.map_messages(messages)
             
-            headers = {
-                'Content-Type': 'application/json'
+            payload = {
+                'model': self.get_model_name(),
+                'messages': mapped_messages
             }
             
-            if self.api_key:
-                headers['Authorization'] = f'Bearer {self.api_key}'
+            with span('provider_request'):
+                response = self.session.post(
+                    f'{self.base_url}/v1/chat/completions',
+                    json=payload,
+                    headers=self._build_headers(),
+                    timeout=get_http_timeout()
+                )
+            
+            response.raise_for_status()
+            
+            logger.info('Respuesta recibida de NGROK API exitosamente')
+            with span('map_response'):
+                mapped_response = self.adapter.map_response(response.json(), fields)
+            
+            return mapped_response
+        except requests.exceptions.RequestException as e:
+            logger.error('Error al llamar a NGROK API: %s', e, exc_info=True)
+            raise
+        except Exception as e:
+            logger.error('Error inesperado en NGROK service: %s', e, exc_info=True)
+            raise
+    
+    async def achat(self, messages: List[Dict[str, str]], fields: Optional[Sequence[str]] = None) -> Dict[str, Any]:
+        logger.info('Iniciando chat asíncrono con NGROK API')
+        
+        try:
+            with span('map_request'):
+                mapped_messages = self.adapter.map_messages(messages)
             
             payload = {
-                'model': ngrok_model_selector(),
+                'model': self.get_model_name(),
                 'messages': mapped_messages
             }
             
-            response = requests.post(
-                f'{self.base_url}/v1/chat/completions',
-                json=payload,
-                headers=headers,
-                timeout=30
-            )
+            with span('provider_request'):
+                response = await get_async_http_client(self.base_url).post(
+                    '/v1/chat/completions',
+                    json=payload,
+                    headers=self._build_headers(),
+                    timeout=get_async_http_timeout()
+                )
             
             response.raise_for_status()
             
-            logger.info('Respuesta recibida de NGROK API exitosamente')
-            mapped_response = self.adapter.map_response(response.json())
+            logger.info('Respuesta asíncrona recibida de NGROK API exitosamente')
+            with span('map_response'):
+                return self.adapter.map_response(response.json(), fields)
+        except httpx.HTTPError as e:
+            logger.error('Error al llamar a NGROK API: %s', e, exc_info=True)
+            raise
+        except Exception as e:
+            logger.error('Error inesperado en NGROK service: %s', e, exc_info=True)
+            raise
+    
+    def chat_stream(self, messages: List[Dict[str, str]]) -> Iterator[Dict[str, Any]]:
+        logger.info('Iniciando chat en streaming con NGROK API')
+        
+        try:
+            mapped_messages = self.adapter.map_messages(messages)
             
-            return mapped_response
+            payload = {
+                'model': self.get_model_name(),
+                'messages': mapped_messages,
+                'stream': True,
+                'stream_options': {'include_usage': True}
+            }
+            
+            with self.session.post(
+                f'{self.base_url}/v1/chat/completions',
+                json=payload,
+                headers=self._build_headers(),
+                timeout=get_http_timeout(),
+                stream=True
+            ) as response:
+                response.raise_for_status()
+                
+                for line in response.iter_lines(decode_unicode=True):
+                    if not line or not line.startswith('data:'):
+                        continue
+                    
+                    data = line[len('data:'):].strip()
+                    if data == '[DONE]':
+                        break
+                    
+                    yield self.adapter.map_stream_chunk(json.loads(data))
+            
+            logger.info('Streaming de NGROK API completado exitosamente')
         except requests.exceptions.RequestException as e:
-            logger.error(f'Error al llamar a NGROK API: {str(e)}', exc_info=True)
+            logger.error('Error en streaming de NGROK API: %s', e, exc_info=True)
             raise
         except Exception as e:
-            logger.error(f'Error inesperado en NGROK service: {str(e)}', exc_info=True)
+            logger.error('Error inesperado en streaming de NGROK service: %s', e, exc_info=True)
             raise
     
     def supports_integration(self, integration: str) -> bool:
@@ -0,0 +1,166 @@
+import threading
+import time
+from typing import Dict, List, Optional, Tuple
+from sqlalchemy import event
+from sqlalchemy.orm import Session
+from app.config import Config
+from app.models.llm import LLM
+from app.repositories.llm import LLMRepository
+from app.services.redis_service import get_routing_version, bump_routing_version, get_usage_counters
+from app.utils.logger import get_logger
+
+logger = get_logger(__name__)
+
+
+class RoutedLLM:
+    __slots__ = ('id', 'name', 'integration', 'priority', 'rpm', 'tpm', 'rpd', 'context_tokens')
+    
+    def __init__(self, llm: LLM):
+        self.id = llm.id
+        self.name = llm.name
+        self.integration = llm.integration
+        self.priority = llm.priority
+        self.rpm = llm.rpm
+        self.tpm = llm.tpm
+        self.rpd = llm.rpd
+        self.context_tokens = llm.context_tokens
+    
+    def __repr__(self):
+        return f'<RoutedLLM {self.name}>'
+
+
+class LLMRoutingTable:
+    def __init__(
+        self,
+        repository: LLMRepository = None,
+        ttl: Optional[float] = None,
+        version_check_interval: Optional[float] = None,
+        counter_sync_interval: Optional[float] = None
+    ):
+        self.repository = repository or LLMRepository
+        self.ttl = Config.ROUTING_TABLE_TTL if ttl is None else ttl
+        self.version_check_interval = Config.ROUTING_TABLE_VERSION_CHECK_INTERVAL \
+            if version_check_interval is None else version_check_interval
+        self.counter_sync_interval = Config.USAGE_COUNTER_SYNC_INTERVAL \
+            if counter_sync_interval is None else counter_sync_interval
+        self._lock = threading.Lock()
+        self._entries: Tuple[RoutedLLM, ...] = ()
+        self._counters: Dict[int, int] = {}
+        self._version: Optional[int] = None
+        self._loaded_at = 0.0
+        self._version_checked_at = 0.0
+        self._counters_synced_at = 0.0
+        self._stale = True
+    
+    def _needs_refresh(self, now: float) -> bool:
+        if self._stale or now - self._loaded_at >= self.ttl:
+            return True
+        
+        if now - self._version_checked_at >= self.version_check_interval:
+            version = get_routing_version()
+            if version is not None and version != self._version:
+                logger.info('Versión de tabla de ruteo cambió (%s -> %s)', self._version, version)
+                return True
+            self._version_checked_at = now
+        
+        return False
+    
+    def _refresh(self):
+        with self._lock:
+            now = time.monotonic()
+            if not self._needs_refresh(now):
+                return
+            
+            version = get_routing_version()
+            rows = self.repository.find_all_with_usage()
+            
+            entries = tuple(RoutedLLM(llm) for llm, _ in rows)
+            counters = get_usage_counters(entries)
+            if counters is None:
+                counters = {llm.id: count for llm, count in rows}
+            
+            self._entries = entries
+            self._counters = counters
+            self._version = version
+            self._loaded_at = now
+            self._version_checked_at = now
+            self._counters_synced_at = now
+            self._stale = False
+            
+            logger.info('Tabla de ruteo recargada: %s LLMs (versión: %s)', len(self._entries), version)
+    
+    def _sync_counters(self, now: float):
+        self._counters_synced_at = now
+        counters = get_usage_counters(self._entries)
+        if counters is not None:
+            self._counters = counters
+    
+    def ensure_fresh(self):
+        now = time.monotonic()
+        if self._needs_refresh(now):
+            self._refresh()
+        elif now - self._counters_synced_at >= self.counter_sync_interval:
+            self._sync_counters(now)
+    
+    def find_available_llms(self) -> List[Tuple[RoutedLLM, int]]:
+        self.ensure_fresh()
+        counters = self._counters
+        return [
+            (llm, counters.get(llm.id, 0)) for llm in self._entries
+            if counters.get(llm.id, 0) < llm.rpd
+        ]
+    
+    def find_all_llms_ordered(self) -> List[Tuple[RoutedLLM, int]]:
+        self.ensure_fresh()
+        counters = self._counters
+        return [(llm, counters.get(llm.id, 0)) for llm in self._entries]
+    
+    def increment(self, llm_id: int) -> int:
+        with self._lock:
+            count = self._counters.get(llm_id, 0) + 1
+            self._counters[llm_id] = count
+            return count
+    
+    def get_llms(self) -> List[RoutedLLM]:
+        self.ensure_fresh()
+        return list(self._entries)
+    
+    def get_llm_ids(self) -> List[int]:
+        self.ensure_fresh()
+        return [llm.id for llm in self._entries]
+    
+    def get_counters(self) -> Dict[int, int]:
+        return dict(self._counters)
+    
+    def set_counter(self, llm_id: int, count: int):
+        with self._lock:
+            self._counters[llm_id] = count
+    
+    def invalidate(self, broadcast: bool = True):
+        self._stale = True
+        if broadcast:
+            bump_routing_version()
+        logger.info('Tabla de ruteo invalidada')
+
+
+llm_routing_table = LLMRoutingTable()
+
+
+def _mark_llm_changed(mapper, connection, target):
+    session = Session.object_session(target)
+    if session is not None:
+        session.info['llm_routing_changed'] = True
+
+
+def _invalidate_after_commit(session):
+    if session.info.pop('llm_routing_changed', False):
+        llm_routing_table.invalidate()
+
+
+def register_routing_table_hooks():
+    for event_name in ('after_insert', 'after_update', 'after_delete'):
+        if not event.contains(LLM, event_name, _mark_llm_changed):
+            event.listen(LLM, event_name, _mark_llm_changed)
+    
+    if not event.contains(Session, 'after_commit', _invalidate_after_commit):
+        event.listen(Session, 'after_commit', _invalidate_after_commit)
@@ -1,28 +1,99 @@
+from typing import Dict, Any, List, Optional, Iterator, Callable, Tuple
 from flask import current_app
 from app.repositories.llm import LLMRepository
-from app.models.llm import LLM
+from app.services.llm_routing_table import LLMRoutingTable, RoutedLLM, llm_routing_table
+from app.services.rate_limiter_service import SlidingWindowRateLimiter, rate_limiter as default_rate_limiter
+from app.services.routing_policy import RoutingPolicy, routing_policy as default_routing_policy
+from app.services.circuit_breaker_service import CircuitBreakerRegistry, circuit_breakers as default_circuit_breakers
+from app.utils.metrics import LLM_SELECTIONS, LLM_SELECTION_FALLBACKS
 from app.utils.logger import get_logger
 
 logger = get_logger(__name__)
 
 
+class NoLLMCapacityError(ValueError):
+    def __init__(self, message: str, retry_after: int = 1):
+        super().__init__(message)
+        self.retry_after = retry_after
+
+
 class LLMSelectorService:
-    def __init__(self, repository: LLMRepository = None):
+    def __init__(
+        self,
+        repository: LLMRepository = None,
+        routing_table: LLMRoutingTable = None,
+        rate_limiter: SlidingWindowRateLimiter = None,
+        routing_policy: RoutingPolicy = None,
+        circuit_breakers: CircuitBreakerRegistry = None
+    ):
         self.repository = repository or LLMRepository
+        if routing_table is None:
+            routing_table = llm_routing_table if repository is None else LLMRoutingTable(repository)
+        self.routing_table = routing_table
+        self.rate_limiter = rate_limiter or default_rate_limiter
+        self.routing_policy = routing_policy or default_routing_policy
+        self.circuit_breakers = circuit_breakers or default_circuit_breakers
     
-    def select_llm(self) -> LLM:
+    def _retry_after(self, llm: RoutedLLM, estimated_tokens: int = 0) -> int:
+        if self.circuit_breakers.is_open(llm.integration):
+            return self.circuit_breakers.retry_after(llm.integration)
+        return self.rate_limiter.retry_after(llm, estimated_tokens)
+    
+    def order_llms(self) -> List[Tuple[RoutedLLM, int]]:
         with current_app.app_context():
-            llms_with_usage = self.repository.find_available_llms()
+            llms_with_usage = self.routing_table.find_available_llms()
             
             if not llms_with_usage:
                 logger.warning('No hay LLMs disponibles (todos han excedido su límite rpd), seleccionando el de menor prioridad')
-                llms_with_usage = self.repository.find_all_llms_ordered()
+                llms_with_usage = self.routing_table.find_all_llms_ordered()
+                LLM_SELECTION_FALLBACKS.inc()
             
             if not llms_with_usage:
                 logger.error('No hay LLMs configurados en la base de datos')
                 raise ValueError('No hay LLMs disponibles en la base de datos')
+        
+        return self.routing_policy.order(llms_with_usage)
+    
+    def iter_llms(
+        self,
+        llms_with_usage: Optional[List[Tuple[RoutedLLM, int]]] = None,
+        estimate_tokens: Optional[Callable[[RoutedLLM], int]] = None
+    ) -> Iterator[RoutedLLM]:
+        if llms_with_usage is None:
+            llms_with_usage = self.order_llms()
+        
+        estimated_tokens = {}
+        selected_any = False
+        for selected_llm, rpd_count in llms_with_usage:
+            if self.circuit_breakers.is_open(selected_llm.integration):
+                logger.info('LLM omitido por circuito abierto: %s', selected_llm.name)
+                continue
             
-            selected_llm, usage = llms_with_usage[0]
-            logger.info(f'LLM seleccionado: {selected_llm.name} (priority: {selected_llm.priority}, rpd_count: {usage.rpd_count}/{selected_llm.rpd})')
+            estimated_tokens[selected_llm.id] = estimate_tokens(selected_llm) if estimate_tokens else 0
+            if not self.rate_limiter.try_acquire(selected_llm, estimated_tokens[selected_llm.id]):
+                logger.info('LLM omitido por límite por minuto: %s', selected_llm.name)
+                continue
             
-            return selected_llm
+            logger.info('LLM seleccionado: %s (priority: %s, rpd_count: %s/%s)', selected_llm.name, selected_llm.priority, rpd_count, selected_llm.rpd)
+            selected_any = True
+            LLM_SELECTIONS.labels(selected_llm.name).inc()
+            yield selected_llm
+        
+        if not selected_any:
+            retry_after = min(
+                self._retry_after(llm, estimated_tokens.get(llm.id, 0)) for llm, _ in llms_with_usage
+            )
+            logger.warning('Todos los LLMs exceden su límite por minuto o tienen el circuito abierto, reintentar en %ss', retry_after)
+            raise NoLLMCapacityError(
+                'Todos los LLMs exceden su límite por minuto o tienen el circuito abierto',
+                retry_after=retry_after
+            )
+    
+    def select_llm(self) -> RoutedLLM:
+        return next(self.iter_llms())
+    
+    def record_outcome(self, llm: RoutedLLM, latency: float, success: bool):
+        self.routing_policy.record_outcome(llm, latency, success)
+    
+    def record_tokens(self, llm: RoutedLLM, usage: Optional[Dict[str, Any]]) -> int:
+        return self.rate_limiter.record_tokens(llm.id, usage)
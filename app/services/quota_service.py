@@ -0,0 +1,222 @@
+import contextvars
+import math
+import time
+from contextlib import contextmanager
+from typing import Dict, Any, List, Optional, Tuple
+from app.config import Config
+from app.services.redis_service import get_redis_client
+from app.services.user_usage_service import UserUsageService, user_usage_service as default_user_usage_service
+from app.utils.logger import get_logger
+
+logger = get_logger(__name__)
+
+REQUESTS = 'requests'
+TOKENS = 'tokens'
+
+TOKEN_BUCKET_SCRIPT = '''
+local now = tonumber(ARGV[1])
+local levels = {}
+local wait = 0
+
+for i = 1, #KEYS do
+    local base = 1 + (i - 1) * 4
+    local rate = tonumber(ARGV[base + 1])
+    local capacity = tonumber(ARGV[base + 2])
+    local required = tonumber(ARGV[base + 3])
+    local state = redis.call('HMGET', KEYS[i], 'level', 'ts')
+    local level = tonumber(state[1]) or capacity
+    local ts = tonumber(state[2]) or now
+    level = math.min(capacity, level + math.max(0, now - ts) * rate)
+    levels[i] = level
+    if required > 0 and level < required then
+        wait = math.max(wait, (required - level) / rate)
+    end
+end
+
+if wait > 0 then
+    return {0, tostring(wait)}
+end
+
+for i = 1, #KEYS do
+    local base = 1 + (i - 1) * 4
+    local rate = tonumber(ARGV[base + 1])
+    local capacity = tonumber(ARGV[base + 2])
+    local level = levels[i] - tonumber(ARGV[base + 4])
+    redis.call('HSET', KEYS[i], 'level', tostring(level), 'ts', tostring(now))
+    redis.call('EXPIRE', KEYS[i], math.ceil((capacity - level) / rate) + 1)
+end
+
+return {1, '0'}
+'''
+
+_current_identity: contextvars.ContextVar = contextvars.ContextVar('quota_identity', default=None)
+
+
+class QuotaIdentity:
+    __slots__ = ('user_id', 'tier', 'api_key_id', 'api_key_tier')
+    
+    def __init__(
+        self,
+        user_id: int,
+        tier: Optional[str] = None,
+        api_key_id: Optional[int] = None,
+        api_key_tier: Optional[str] = None
+    ):
+        self.user_id = user_id
+        self.tier = tier
+        self.api_key_id = api_key_id
+        self.api_key_tier = api_key_tier
+    
+    @classmethod
+    def from_principal(cls, principal: Any) -> 'QuotaIdentity':
+        return cls(principal.id, principal.tier, principal.api_key_id, principal.api_key_tier)
+    
+    @classmethod
+    def from_dict(cls, data: Dict[str, Any]) -> 'QuotaIdentity':
+        return cls(data['user_id'], data.get('tier'), data.get('api_key_id'), data.get('api_key_tier'))
+    
+    def to_dict(self) -> Dict[str, Any]:
+        return {
+            'user_id': self.user_id,
+            'tier': self.tier,
+            'api_key_id': self.api_key_id,
+            'api_key_tier': self.api_key_tier
+        }
+    
+    def __repr__(self):
+        return f'<QuotaIdentity user={self.user_id} api_key={self.api_key_id}>'
+
+
+def get_bound_identity() -> Optional[QuotaIdentity]:
+    return _current_identity.get()
+
+
+@contextmanager
+def bind_identity(identity: Optional[QuotaIdentity]):
+    token = _current_identity.set(identity)
+    try:
+        yield identity
+    finally:
+        _current_identity.reset(token)
+
+
+def _total_tokens(usage: Optional[Dict[str, Any]]) -> int:
+    if not usage:
+        return 0
+    return int(usage.get('total_tokens') or
+               (usage.get('prompt_tokens') or 0) + (usage.get('completion_tokens') or 0))
+
+
+class QuotaService:
+    def __init__(
+        self,
+        enabled: Optional[bool] = None,
+        tiers: Optional[Dict[str, Dict[str, int]]] = None,
+        default_tier: Optional[str] = None,
+        user_usage_service: UserUsageService = None
+    ):
+        self.enabled = Config.QUOTA_ENABLED if enabled is None else enabled
+        self.tiers = tiers or Config.QUOTA_TIERS
+        self.default_tier = default_tier or Config.QUOTA_DEFAULT_TIER
+        self.user_usage_service = user_usage_service or default_user_usage_service
+        self._script = None
+    
+    def get_limits(self, tier: Optional[str]) -> Dict[str, int]:
+        return self.tiers.get(tier or self.default_tier) or self.tiers.get(self.default_tier) or {}
+    
+    def _subjects(self, identity: QuotaIdentity) -> List[Tuple[str, Optional[str]]]:
+        subjects = [(f'user:{identity.user_id}', identity.tier)]
+        if identity.api_key_id is not None:
+            subjects.append((f'key:{identity.api_key_id}', identity.api_key_tier or identity.tier))
+        return subjects
+    
+    def _buckets(self, identity: QuotaIdentity, kinds: Tuple[str, ...] = (REQUESTS, TOKENS)) -> List[Tuple[str, str, float, float]]:
+        buckets = []
+        for subject, tier in self._subjects(identity):
+            limits = self.get_limits(tier)
+            rpm = limits.get('rpm') or 0
+            tpm = limits.get('tpm') or 0
+            if rpm and REQUESTS in kinds:
+                buckets.append((f'quota:{subject}:{REQUESTS}', REQUESTS, rpm / 60, limits.get('burst') or rpm))
+            if tpm and TOKENS in kinds:
+                buckets.append((f'quota:{subject}:{TOKENS}', TOKENS, tpm / 60, tpm))
+        return buckets
+    
+    def _run(self, buckets: List[Tuple[str, str, float, float]], amounts: Dict[str, Tuple[float, float]]) -> Tuple[bool, float]:
+        client = get_redis_client()
+        if self._script is None or self._script.registered_client is not client:
+            self._script = client.register_script(TOKEN_BUCKET_SCRIPT)
+        
+        args = [time.time()]
+        for _, kind, rate, capacity in buckets:
+            required, cost = amounts[kind]
+            args.extend([rate, capacity, min(required, capacity), cost])
+        
+        allowed, wait = self._script(keys=[key for key, _, _, _ in buckets], args=args)
+        return bool(int(allowed)), float(wait)
+    
+    def try_acquire(self, identity: QuotaIdentity, requests: int = 1, estimated_tokens: int = 0) -> Tuple[bool, int]:
+        buckets = self._buckets(identity) if self.enabled else []
+        
+        if buckets:
+            try:
+                allowed, wait = self._run(buckets, {
+                    REQUESTS: (requests, requests),
+                    TOKENS: (max(estimated_tokens, 1), 0)
+                })
+                if not allowed:
+                    retry_after = max(1, math.ceil(wait))
+                    logger.info(
+                        'Cuota excedida para usuario %s (api key: %s), reintentar en %ss',
+                        identity.user_id, identity.api_key_id, retry_after
+                    )
+                    return False, retry_after
+            except Exception as e:
+                logger.warning('Cuotas no disponibles, permitiendo solicitud del usuario %s: %s', identity.user_id, e)
+        
+        self.user_usage_service.record_requests(identity.user_id, requests)
+        return True, 0
+    
+    def record_usage(self, usage: Optional[Dict[str, Any]], identity: Optional[QuotaIdentity] = None):
+        identity = identity or get_bound_identity()
+        if identity is None:
+            return
+        
+        self.user_usage_service.record_tokens(identity.user_id, usage)
+        
+        tokens = _total_tokens(usage)
+        buckets = self._buckets(identity, (TOKENS,)) if self.enabled and tokens else []
+        if not buckets:
+            return
+        
+        try:
+            self._run(buckets, {TOKENS: (0, tokens)})
+            logger.debug('Tokens descontados de la cuota del usuario %s: %s', identity.user_id, tokens)
+        except Exception as e:
+            logger.warning('No se pudieron descontar tokens de la cuota del usuario %s: %s', identity.user_id, e)
+    
+    def get_status(self, identity: QuotaIdentity) -> List[Dict[str, Any]]:
+        buckets = self._buckets(identity)
+        if not buckets:
+            return []
+        
+        now = time.time()
+        pipe = get_redis_client().pipeline()
+        for key, _, _, _ in buckets:
+            pipe.hmget(key, 'level', 'ts')
+        
+        status = []
+        for (key, kind, rate, capacity), (level, ts) in zip(buckets, pipe.execute()):
+            level = capacity if level is None else min(capacity, float(level) + max(0.0, now - float(ts)) * rate)
+            status.append({
+                'bucket': key.split(':', 1)[1],
+                'kind': kind,
+                'available': max(0, math.floor(level)),
+                'debt': max(0, math.ceil(-level)),
+                'capacity': capacity,
+                'refill_per_minute': round(rate * 60, 2)
+            })
+        return status
+
+
+quota_service = QuotaService()
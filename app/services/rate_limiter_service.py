@@ -0,0 +1,141 @@
+import time
+import uuid
+from typing import Dict, Any, List, Optional, Tuple
+from app.config import Config
+from app.services.redis_service import get_redis_client
+from app.utils.logger import get_logger
+
+logger = get_logger(__name__)
+
+
+class SlidingWindowRateLimiter:
+    def __init__(self, window_seconds: Optional[int] = None, enabled: Optional[bool] = None):
+        self.window_seconds = window_seconds or Config.LLM_RATE_LIMIT_WINDOW
+        self.enabled = Config.LLM_RATE_LIMIT_ENABLED if enabled is None else enabled
+    
+    @staticmethod
+    def _requests_key(llm_id: int) -> str:
+        return f'ratelimit:rpm:{llm_id}'
+    
+    @staticmethod
+    def _tokens_key(llm_id: int) -> str:
+        return f'ratelimit:tpm:{llm_id}'
+    
+    def _token_buckets(self, client, llm_id: int, now: float) -> List[Tuple[int, int]]:
+        window_start = int(now) - self.window_seconds
+        buckets = client.hgetall(self._tokens_key(llm_id))
+        return sorted(
+            (int(bucket), int(tokens)) for bucket, tokens in buckets.items() if int(bucket) > window_start
+        )
+    
+    def _tokens_in_window(self, client, llm_id: int, now: float) -> int:
+        return sum(tokens for _, tokens in self._token_buckets(client, llm_id, now))
+    
+    def try_acquire(self, llm: Any, estimated_tokens: int = 0) -> bool:
+        if not self.enabled or (not llm.rpm and not llm.tpm):
+            return True
+        
+        try:
+            client = get_redis_client()
+            now = time.time()
+            
+            if llm.tpm:
+                used_tokens = self._tokens_in_window(client, llm.id, now)
+                if used_tokens + estimated_tokens > llm.tpm:
+                    logger.info('LLM %s excede su límite tpm (%s/%s)', llm.name, used_tokens, llm.tpm)
+                    return False
+            
+            if llm.rpm:
+                key = self._requests_key(llm.id)
+                member = f'{now}:{uuid.uuid4().hex}'
+                
+                pipe = client.pipeline()
+                pipe.zremrangebyscore(key, 0, now - self.window_seconds)
+                pipe.zadd(key, {member: now})
+                pipe.zcard(key)
+                pipe.expire(key, self.window_seconds + 1)
+                _, _, count, _ = pipe.execute()
+                
+                if count > llm.rpm:
+                    client.zrem(key, member)
+                    logger.info('LLM %s excede su límite rpm (%s/%s)', llm.name, count - 1, llm.rpm)
+                    return False
+            
+            return True
+        except Exception as e:
+            logger.warning('Limitador no disponible, permitiendo solicitud a %s: %s', llm.name, e)
+            return True
+    
+    def _rpm_retry_after(self, client, llm: Any, now: float) -> int:
+        if not llm.rpm:
+            return 0
+        
+        key = self._requests_key(llm.id)
+        if client.zcount(key, now - self.window_seconds, '+inf') < llm.rpm:
+            return 0
+        oldest = client.zrange(key, 0, 0, withscores=True)
+        if not oldest:
+            return 0
+        return max(1, int(oldest[0][1] + self.window_seconds - now) + 1)
+    
+    def _tpm_retry_after(self, client, llm: Any, now: float, estimated_tokens: int) -> int:
+        if not llm.tpm:
+            return 0
+        
+        buckets = self._token_buckets(client, llm.id, now)
+        excess = sum(tokens for _, tokens in buckets) + estimated_tokens - llm.tpm
+        if excess <= 0:
+            return 0
+        
+        for bucket, tokens in buckets:
+            excess -= tokens
+            if excess <= 0:
+                return max(1, int(bucket + self.window_seconds - now) + 1)
+        return self.window_seconds
+    
+    def retry_after(self, llm: Any, estimated_tokens: int = 0) -> int:
+        try:
+            client = get_redis_client()
+            now = time.time()
+            retry_after = max(
+                self._rpm_retry_after(client, llm, now),
+                self._tpm_retry_after(client, llm, now, estimated_tokens)
+            )
+            if retry_after:
+                return retry_after
+        except Exception as e:
+            logger.warning('No se pudo calcular Retry-After para %s: %s', llm.name, e)
+        return 1
+    
+    def record_tokens(self, llm_id: int, usage: Optional[Dict[str, Any]]) -> int:
+        if not self.enabled or not usage:
+            return 0
+        
+        tokens = usage.get('total_tokens') or \
+            (usage.get('prompt_tokens') or 0) + (usage.get('completion_tokens') or 0)
+        if not tokens:
+            return 0
+        
+        try:
+            client = get_redis_client()
+            now = int(time.time())
+            key = self._tokens_key(llm_id)
+            
+            pipe = client.pipeline()
+            pipe.hincrby(key, str(now), int(tokens))
+            pipe.expire(key, self.window_seconds + 1)
+            pipe.hkeys(key)
+            _, _, buckets = pipe.execute()
+            
+            stale = [bucket for bucket in buckets if int(bucket) <= now - self.window_seconds]
+            if stale:
+                client.hdel(key, *stale)
+            
+            logger.debug('Tokens registrados para LLM %s: %s', llm_id, tokens)
+            return int(tokens)
+        except Exception as e:
+            logger.warning('No se pudieron registrar tokens para LLM %s: %s', llm_id, e)
+            return 0
+
+
+rate_limiter = SlidingWindowRateLimiter()
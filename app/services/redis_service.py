@@ -1,58 +1,294 @@
-import json
+import asyncio
 import redis
+import redis.asyncio as redis_asyncio
 import os
 import uuid
-from typing import List, Dict, Optional
+import weakref
+from datetime import datetime, timezone
+from typing import Any, List, Dict, Optional, Iterable, Union
 from flask import current_app
+from app.config import Config
+from app.utils.usage_windows import current_window_bucket, window_expires_at
+from app.utils.codecs import MessageCodec, build_message_codec
+from app.utils.metrics import timed_stage
+from app.utils import json_codec
 from app.utils.logger import get_logger
 
 logger = get_logger(__name__)
 
 _redis_client = None
+_redis_binary_client = None
+_async_redis_clients = weakref.WeakKeyDictionary()
+_async_redis_binary_clients = weakref.WeakKeyDictionary()
+
+def get_redis_connection_kwargs(decode_responses: bool = True) -> dict:
+    return {
+        'host': os.environ.get('REDIS_HOST', 'localhost'),
+        'port': int(os.environ.get('REDIS_PORT', 6379)),
+        'db': int(os.environ.get('REDIS_DB', 0)),
+        'password': os.environ.get('REDIS_PASSWORD'),
+        'decode_responses': decode_responses,
+        'socket_connect_timeout': 5
+    }
 
 def get_redis_client():
     global _redis_client
     if _redis_client is None:
         try:
-            _redis_client = redis.Redis(
-                host=os.environ.get('REDIS_HOST', 'localhost'),
-                port=int(os.environ.get('REDIS_PORT', 6379)),
-                db=int(os.environ.get('REDIS_DB', 0)),
-                password=os.environ.get('REDIS_PASSWORD'),
-                decode_responses=True,
-                socket_connect_timeout=5
-            )
+            _redis_client = redis.Redis(**get_redis_connection_kwargs())
             _redis_client.ping()
             logger.info('Cliente Redis conectado exitosamente')
         except Exception as e:
-            logger.error(f'Error al conectar con Redis: {str(e)}', exc_info=True)
+            logger.error('Error al conectar con Redis: %s', e, exc_info=True)
             raise
     return _redis_client
 
+def get_redis_binary_client():
+    global _redis_binary_client
+    if _redis_binary_client is None:
+        _redis_binary_client = redis.Redis(**get_redis_connection_kwargs(decode_responses=False))
+        logger.debug('Cliente Redis binario creado')
+    return _redis_binary_client
+
+def _create_async_redis_client(decode_responses: bool = True):
+    pool = redis_asyncio.BlockingConnectionPool(
+        max_connections=Config.REDIS_ASYNC_MAX_CONNECTIONS,
+        timeout=Config.REDIS_ASYNC_POOL_TIMEOUT,
+        **get_redis_connection_kwargs(decode_responses=decode_responses)
+    )
+    return redis_asyncio.Redis(connection_pool=pool)
+
+def get_async_redis_client():
+    loop = asyncio.get_running_loop()
+    client = _async_redis_clients.get(loop)
+    if client is None:
+        client = _create_async_redis_client()
+        _async_redis_clients[loop] = client
+        logger.debug('Cliente Redis asíncrono creado para el event loop actual')
+    return client
+
+def get_async_redis_binary_client():
+    loop = asyncio.get_running_loop()
+    client = _async_redis_binary_clients.get(loop)
+    if client is None:
+        client = _create_async_redis_client(decode_responses=False)
+        _async_redis_binary_clients[loop] = client
+        logger.debug('Cliente Redis binario asíncrono creado para el event loop actual')
+    return client
+
+async def close_async_redis_client():
+    loop = asyncio.get_running_loop()
+    for clients in (_async_redis_clients, _async_redis_binary_clients):
+        client = clients.pop(loop, None)
+        if client is not None:
+            await client.aclose(close_connection_pool=True)
+
+ROUTING_VERSION_KEY = 'llm_routing:version'
+
+def get_routing_version() -> Optional[int]:
+    try:
+        client = get_redis_client()
+        version = client.get(ROUTING_VERSION_KEY)
+        return int(version) if version is not None else 0
+    except Exception as e:
+        logger.warning('No se pudo leer la versión de la tabla de ruteo: %s', e)
+        return None
+
+def bump_routing_version() -> Optional[int]:
+    try:
+        client = get_redis_client()
+        version = client.incr(ROUTING_VERSION_KEY)
+        logger.debug('Versión de tabla de ruteo incrementada: %s', version)
+        return version
+    except Exception as e:
+        logger.warning('No se pudo incrementar la versión de la tabla de ruteo: %s', e)
+        return None
+
+AUTH_VERSION_KEY = 'auth:users:version'
+
+def get_auth_version() -> Optional[int]:
+    try:
+        client = get_redis_client()
+        version = client.get(AUTH_VERSION_KEY)
+        return int(version) if version is not None else 0
+    except Exception as e:
+        logger.warning('No se pudo leer la versión de la caché de autenticación: %s', e)
+        return None
+
+def bump_auth_version() -> Optional[int]:
+    try:
+        client = get_redis_client()
+        version = client.incr(AUTH_VERSION_KEY)
+        logger.debug('Versión de caché de autenticación incrementada: %s', version)
+        return version
+    except Exception as e:
+        logger.warning('No se pudo incrementar la versión de la caché de autenticación: %s', e)
+        return None
+
+def get_usage_counter_key(llm_id: int, window: str) -> str:
+    return f"usage:rpd:{llm_id}:{window}"
+
+def increment_usage_counter(llm: Any) -> Optional[int]:
+    try:
+        client = get_redis_client()
+        now = datetime.now(timezone.utc)
+        key = get_usage_counter_key(llm.id, current_window_bucket(llm.integration, now))
+        pipe = client.pipeline()
+        pipe.incr(key)
+        pipe.expireat(key, window_expires_at(llm.integration, now, grace_seconds=Config.USAGE_COUNTER_GRACE_SECONDS))
+        count, _ = pipe.execute()
+        return int(count)
+    except Exception as e:
+        logger.warning('No se pudo incrementar el contador de uso en Redis: %s', e)
+        return None
+
+def get_usage_counters(llms: Iterable[Any], offset: int = 0, now: Optional[datetime] = None) -> Optional[Dict[int, int]]:
+    llms = list(llms)
+    if not llms:
+        return {}
+    try:
+        client = get_redis_client()
+        now = now or datetime.now(timezone.utc)
+        values = client.mget([
+            get_usage_counter_key(llm.id, current_window_bucket(llm.integration, now, offset)) for llm in llms
+        ])
+        return {
+            llm.id: int(value) if value is not None else 0
+            for llm, value in zip(llms, values)
+        }
+    except Exception as e:
+        logger.warning('No se pudieron leer los contadores de uso en Redis: %s', e)
+        return None
+
+def reset_usage_counter(llm: Any) -> bool:
+    try:
+        client = get_redis_client()
+        client.delete(get_usage_counter_key(llm.id, current_window_bucket(llm.integration)))
+        return True
+    except Exception as e:
+        logger.warning('No se pudo resetear el contador de uso en Redis: %s', e)
+        return False
+
 def get_conversation_key(conversation_id: str) -> str:
     return f"conversation:{conversation_id}"
 
+def get_conversation_messages_key(conversation_id: str) -> str:
+    return f"conversation:{conversation_id}:messages"
+
+def get_conversation_meta_key(conversation_id: str) -> str:
+    return f"conversation:{conversation_id}:meta"
+
+def get_conversation_ttl() -> int:
+    return int(os.environ.get('REDIS_CONVERSATION_TTL', 86400))
+
+message_codec: MessageCodec = build_message_codec(
+    Config.REDIS_CONVERSATION_CODEC,
+    Config.REDIS_CONVERSATION_COMPRESSION,
+    Config.REDIS_CONVERSATION_COMPRESSION_THRESHOLD,
+    Config.REDIS_CONVERSATION_COMPRESSION_LEVEL
+)
+
+def _encode_message(message: Dict) -> bytes:
+    return message_codec.encode(message)
+
+def _decode_message(raw_message: Union[bytes, str]) -> Dict:
+    return message_codec.decode(raw_message)
+
+def _decode_meta(meta: Dict) -> Dict[str, str]:
+    return {
+        key.decode('utf-8') if isinstance(key, bytes) else key: value.decode('utf-8') if isinstance(value, bytes) else value
+        for key, value in meta.items()
+    }
+
+def _write_conversation(pipe, conversation_id: str, model: str, messages: List[Dict], ttl: int):
+    messages_key = get_conversation_messages_key(conversation_id)
+    meta_key = get_conversation_meta_key(conversation_id)
+    
+    pipe.delete(messages_key)
+    if messages:
+        pipe.rpush(messages_key, *[_encode_message(message) for message in messages])
+    pipe.hset(meta_key, mapping={'model': model or '', 'conversation_id': conversation_id})
+    pipe.expire(messages_key, ttl)
+    pipe.expire(meta_key, ttl)
+
+def _migrate_legacy_conversation(client, conversation_id: str) -> Optional[dict]:
+    legacy_key = get_conversation_key(conversation_id)
+    if client.type(legacy_key) != 'string':
+        return None
+    
+    conversation_data = client.get(legacy_key)
+    if not conversation_data:
+        return None
+    
+    data = json_codec.loads(conversation_data)
+    ttl = client.ttl(legacy_key)
+    if ttl is None or ttl < 0:
+        ttl = get_conversation_ttl()
+    
+    pipe = client.pipeline()
+    _write_conversation(pipe, conversation_id, data.get('model', ''), data.get('messages', []), ttl)
+    pipe.delete(legacy_key)
+    pipe.execute()
+    
+    logger.info('Conversación %s migrada a formato de lista', conversation_id)
+    return {
+        'model': data.get('model', ''),
+        'messages': data.get('messages', []),
+        'conversation_id': conversation_id
+    }
+
+def migrate_legacy_conversations() -> int:
+    client = get_redis_client()
+    migrated = 0
+    for key in client.scan_iter(match='conversation:*'):
+        if key.endswith(':messages') or key.endswith(':meta'):
+            continue
+        conversation_id = key[len('conversation:'):]
+        if _migrate_legacy_conversation(client, conversation_id):
+            migrated += 1
+    return migrated
+
+@timed_stage('redis_set')
 def create_conversation(model: str, message: str) -> dict:
     try:
         client = get_redis_client()
         conversation_id = str(uuid.uuid4())
         messages = [{'role': 'user', 'content': message}]
-        key = get_conversation_key(conversation_id)
         
-        conversation_data = {
-            'model': model,
-            'messages': messages,
-            'conversation_id': conversation_id
-        }
+        pipe = client.pipeline()
+        _write_conversation(pipe, conversation_id, model, messages, get_conversation_ttl())
+        pipe.execute()
         
-        ttl = int(os.environ.get('REDIS_CONVERSATION_TTL', 86400))
-        client.setex(key, ttl, json.dumps(conversation_data))
-        logger.debug(f'Conversación creada: {conversation_id}')
+        logger.debug('Conversación creada: %s', conversation_id)
         return {'conversation_id': conversation_id, 'model': model, 'messages': messages}
     except Exception as e:
-        logger.error(f'Error al crear conversación: {str(e)}', exc_info=True)
+        logger.error('Error al crear conversación: %s', e, exc_info=True)
         return None
 
+@timed_stage('redis_set')
+def append_messages(conversation_id: str, messages: List[Dict], model: Optional[str] = None) -> bool:
+    try:
+        client = get_redis_client()
+        messages_key = get_conversation_messages_key(conversation_id)
+        meta_key = get_conversation_meta_key(conversation_id)
+        ttl = get_conversation_ttl()
+        
+        pipe = client.pipeline()
+        if messages:
+            pipe.rpush(messages_key, *[_encode_message(message) for message in messages])
+        if model:
+            pipe.hset(meta_key, mapping={'model': model, 'conversation_id': conversation_id})
+        pipe.expire(messages_key, ttl)
+        pipe.expire(meta_key, ttl)
+        pipe.execute()
+        
+        logger.debug('%s mensajes añadidos a conversación: %s', len(messages), conversation_id)
+        return True
+    except Exception as e:
+        logger.error('Error al añadir mensajes: %s', e, exc_info=True)
+        return False
+
+@timed_stage('redis_set')
 def save_message(conversation: dict) -> bool:
     try:
         client = get_redis_client()
@@ -61,54 +297,60 @@ def save_message(conversation: dict) -> bool:
             logger.error('conversation_id no encontrado en el objeto conversación')
             return False
         
-        key = get_conversation_key(conversation_id)
-        
         messages = conversation.get('messages', [])
         model = conversation.get('model', '')
         
-        conversation_data = {
-            'model': model,
-            'messages': messages,
-            'conversation_id': conversation_id
-        }
+        pipe = client.pipeline()
+        _write_conversation(pipe, conversation_id, model, messages, get_conversation_ttl())
+        pipe.delete(get_conversation_key(conversation_id))
+        pipe.execute()
         
-        ttl = int(os.environ.get('REDIS_CONVERSATION_TTL', 86400))
-        client.setex(key, ttl, json.dumps(conversation_data))
-        
-        logger.debug(f'Conversación guardada: {conversation_id} con {len(messages)} mensajes')
+        logger.debug('Conversación guardada: %s con %s mensajes', conversation_id, len(messages))
         return True
     except Exception as e:
-        logger.error(f'Error al guardar mensaje: {str(e)}', exc_info=True)
+        logger.error('Error al guardar mensaje: %s', e, exc_info=True)
         return False
 
+@timed_stage('redis_get')
 def get_conversation_history(conversation_id: str) -> dict:
     try:
-        client = get_redis_client()
-        key = get_conversation_key(conversation_id)
-        
-        conversation_data = client.get(key)
-        if conversation_data:
-            data = json.loads(conversation_data)
-            if 'conversation_id' not in data:
-                data['conversation_id'] = conversation_id
-            logger.debug(f'Historial recuperado para conversación {conversation_id}: {len(data.get("messages", []))} mensajes')
+        pipe = get_redis_binary_client().pipeline()
+        pipe.lrange(get_conversation_messages_key(conversation_id), 0, -1)
+        pipe.hgetall(get_conversation_meta_key(conversation_id))
+        raw_messages, meta = pipe.execute()
+        meta = _decode_meta(meta)
+        
+        if raw_messages or meta:
+            data = {
+                'model': meta.get('model', ''),
+                'messages': [_decode_message(message) for message in raw_messages],
+                'conversation_id': conversation_id
+            }
+            logger.debug('Historial recuperado para conversación %s: %s mensajes', conversation_id, len(data['messages']))
             return data
-        else:
-            logger.debug(f'No se encontró historial para conversación {conversation_id}')
-            return {'model': '', 'messages': [], 'conversation_id': conversation_id}
+        
+        data = _migrate_legacy_conversation(get_redis_client(), conversation_id)
+        if data:
+            return data
+        
+        logger.debug('No se encontró historial para conversación %s', conversation_id)
+        return {'model': '', 'messages': [], 'conversation_id': conversation_id}
     except Exception as e:
-        logger.error(f'Error al recuperar historial: {str(e)}', exc_info=True)
+        logger.error('Error al recuperar historial: %s', e, exc_info=True)
         return {'model': '', 'messages': [], 'conversation_id': conversation_id}
 
 def delete_conversation(conversation_id: str) -> bool:
     try:
         client = get_redis_client()
-        key = get_conversation_key(conversation_id)
-        deleted = client.delete(key)
-        logger.info(f'Conversación {conversation_id} eliminada: {deleted > 0}')
+        deleted = client.delete(
+            get_conversation_key(conversation_id),
+            get_conversation_messages_key(conversation_id),
+            get_conversation_meta_key(conversation_id)
+        )
+        logger.info('Conversación %s eliminada: %s', conversation_id, deleted > 0)
         return deleted > 0
     except Exception as e:
-        logger.error(f'Error al eliminar conversación: {str(e)}', exc_info=True)
+        logger.error('Error al eliminar conversación: %s', e, exc_info=True)
         return False
 
 def clear_all_conversations() -> bool:
@@ -117,9 +359,79 @@ def clear_all_conversations() -> bool:
         keys = client.keys("conversation:*")
         if keys:
             deleted = client.delete(*keys)
-            logger.info(f'{deleted} conversaciones eliminadas')
+            logger.info('%s claves de conversaciones eliminadas', deleted)
             return True
         return True
     except Exception as e:
-        logger.error(f'Error al limpiar conversaciones: {str(e)}', exc_info=True)
-        return False
\ No newline at end of file
+        logger.error('Error al limpiar conversaciones: %s', e, exc_info=True)
+        return False
+
+@timed_stage('redis_set')
+async def acreate_conversation(model: str, message: str) -> dict:
+    try:
+        client = get_async_redis_client()
+        conversation_id = str(uuid.uuid4())
+        messages = [{'role': 'user', 'content': message}]
+        
+        async with client.pipeline() as pipe:
+            _write_conversation(pipe, conversation_id, model, messages, get_conversation_ttl())
+            await pipe.execute()
+        
+        logger.debug('Conversación creada: %s', conversation_id)
+        return {'conversation_id': conversation_id, 'model': model, 'messages': messages}
+    except Exception as e:
+        logger.error('Error al crear conversación: %s', e, exc_info=True)
+        return None
+
+@timed_stage('redis_set')
+async def aappend_messages(conversation_id: str, messages: List[Dict], model: Optional[str] = None) -> bool:
+    try:
+        client = get_async_redis_client()
+        messages_key = get_conversation_messages_key(conversation_id)
+        meta_key = get_conversation_meta_key(conversation_id)
+        ttl = get_conversation_ttl()
+        
+        async with client.pipeline() as pipe:
+            if messages:
+                pipe.rpush(messages_key, *[_encode_message(message) for message in messages])
+            if model:
+                pipe.hset(meta_key, mapping={'model': model, 'conversation_id': conversation_id})
+            pipe.expire(messages_key, ttl)
+            pipe.expire(meta_key, ttl)
+            await pipe.execute()
+        
+        logger.debug('%s mensajes añadidos a conversación: %s', len(messages), conversation_id)
+        return True
+    except Exception as e:
+        logger.error('Error al añadir mensajes: %s', e, exc_info=True)
+        return False
+
+@timed_stage('redis_get')
+async def aget_conversation_history(conversation_id: str) -> dict:
+    try:
+        client = get_async_redis_binary_client()
+        
+        async with client.pipeline() as pipe:
+            pipe.lrange(get_conversation_messages_key(conversation_id), 0, -1)
+            pipe.hgetall(get_conversation_meta_key(conversation_id))
+            raw_messages, meta = await pipe.execute()
+        meta = _decode_meta(meta)
+        
+        if raw_messages or meta:
+            data = {
+                'model': meta.get('model', ''),
+                'messages': [_decode_message(message) for message in raw_messages],
+                'conversation_id': conversation_id
+            }
+            logger.debug('Historial recuperado para conversación %s: %s mensajes', conversation_id, len(data['messages']))
+            return data
+        
+        data = await asyncio.to_thread(_migrate_legacy_conversation, get_redis_client(), conversation_id)
+        if data:
+            return data
+        
+        logger.debug('No se encontró historial para conversación %s', conversation_id)
+        return {'model': '', 'messages': [], 'conversation_id': conversation_id}
+    except Exception as e:
+        logger.error('Error al recuperar historial: %s', e, exc_info=True)
+        return {'model': '', 'messages': [], 'conversation_id': conversation_id}
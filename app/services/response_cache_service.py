@@ -0,0 +1,144 @@
+import copy
+import threading
+import time
+from collections import OrderedDict
+from typing import Dict, Any, Iterable, List, Optional, Sequence, Tuple
+from app.config import Config
+from app.services.llm.base_llm_service import BaseLLMService
+from app.services.redis_service import get_redis_client
+from app.utils.request_key import build_request_key
+from app.utils import json_codec
+from app.utils.logger import get_logger
+
+logger = get_logger(__name__)
+
+
+class ResponseCache:
+    def __init__(
+        self,
+        enabled: Optional[bool] = None,
+        ttl: Optional[int] = None,
+        max_entries: Optional[int] = None,
+        redis_enabled: Optional[bool] = None
+    ):
+        self.enabled = Config.RESPONSE_CACHE_ENABLED if enabled is None else enabled
+        self.ttl = ttl or Config.RESPONSE_CACHE_TTL
+        self.max_entries = max_entries or Config.RESPONSE_CACHE_MAX_ENTRIES
+        self.redis_enabled = Config.RESPONSE_CACHE_REDIS_ENABLED if redis_enabled is None else redis_enabled
+        self._entries: 'OrderedDict[str, tuple]' = OrderedDict()
+        self._lock = threading.Lock()
+        self._stats = {'local_hits': 0, 'redis_hits': 0, 'misses': 0, 'stores': 0, 'evictions': 0}
+    
+    @staticmethod
+    def _redis_key(key: str) -> str:
+        return f'response_cache:{key}'
+    
+    def build_key(
+        self,
+        llm_service: BaseLLMService,
+        messages: List[Dict[str, str]],
+        fields: Optional[Sequence[str]] = None
+    ) -> str:
+        return build_request_key(
+            llm_service.get_integration_name(),
+            llm_service.get_model_name(),
+            llm_service.map_messages(messages),
+            fields
+        )
+    
+    def _count(self, stat: str):
+        with self._lock:
+            self._stats[stat] += 1
+    
+    def _get_local(self, key: str) -> Optional[Dict[str, Any]]:
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                return None
+            
+            expires_at, response = entry
+            if expires_at <= time.monotonic():
+                del self._entries[key]
+                return None
+            
+            self._entries.move_to_end(key)
+            return copy.deepcopy(response)
+    
+    def _set_local(self, key: str, response: Dict[str, Any], ttl: float):
+        with self._lock:
+            self._entries[key] = (time.monotonic() + ttl, copy.deepcopy(response))
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+                self._stats['evictions'] += 1
+    
+    def _lookup(self, key: str) -> Optional[Dict[str, Any]]:
+        response = self._get_local(key)
+        if response is not None:
+            self._count('local_hits')
+            return response
+        
+        if self.redis_enabled:
+            try:
+                client = get_redis_client()
+                redis_key = self._redis_key(key)
+                pipe = client.pipeline()
+                pipe.get(redis_key)
+                pipe.ttl(redis_key)
+                cached, ttl = pipe.execute()
+                if cached:
+                    response = json_codec.loads(cached)
+                    self._set_local(key, response, ttl if ttl and ttl > 0 else self.ttl)
+                    self._count('redis_hits')
+                    return response
+            except Exception as e:
+                logger.warning('Error al leer caché de respuestas en Redis: %s', e)
+        
+        return None
+    
+    def get(self, key: str) -> Optional[Dict[str, Any]]:
+        found = self.get_first([(key, key)])
+        return found[1] if found is not None else None
+    
+    def get_first(self, candidates: Iterable[Tuple[Any, str]]) -> Optional[Tuple[Any, Dict[str, Any]]]:
+        if not self.enabled:
+            return None
+        
+        for candidate, key in candidates:
+            response = self._lookup(key)
+            if response is not None:
+                return candidate, response
+        
+        self._count('misses')
+        return None
+    
+    def set(self, key: str, response: Dict[str, Any]):
+        if not self.enabled or not response.get('text'):
+            return
+        
+        self._set_local(key, response, self.ttl)
+        self._count('stores')
+        
+        if self.redis_enabled:
+            try:
+                client = get_redis_client()
+                client.setex(self._redis_key(key), self.ttl, json_codec.dumps(response))
+            except Exception as e:
+                logger.warning('Error al guardar caché de respuestas en Redis: %s', e)
+    
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+    
+    def get_stats(self) -> Dict[str, Any]:
+        with self._lock:
+            stats = dict(self._stats)
+            stats['entries'] = len(self._entries)
+        
+        lookups = stats['local_hits'] + stats['redis_hits'] + stats['misses']
+        stats['hit_ratio'] = round((stats['local_hits'] + stats['redis_hits']) / lookups, 4) if lookups else 0.0
+        stats['enabled'] = self.enabled
+        return stats
+
+
+response_cache = ResponseCache()
@@ -0,0 +1,161 @@
+import math
+import random
+import threading
+from abc import ABC, abstractmethod
+from collections import deque
+from typing import Dict, Any, List, Optional, Tuple
+from app.config import Config
+from app.services.llm_routing_table import RoutedLLM
+from app.utils.logger import get_logger
+
+logger = get_logger(__name__)
+
+
+class RoutingPolicy(ABC):
+    name = ''
+    
+    @abstractmethod
+    def order(self, llms_with_usage: List[Tuple[RoutedLLM, int]]) -> List[Tuple[RoutedLLM, int]]:
+        pass
+    
+    def record_outcome(self, llm: RoutedLLM, latency: float, success: bool):
+        pass
+    
+    def get_stats(self) -> Dict[str, Any]:
+        return {'policy': self.name}
+
+
+class PriorityRoutingPolicy(RoutingPolicy):
+    name = 'priority'
+    
+    def order(self, llms_with_usage: List[Tuple[RoutedLLM, int]]) -> List[Tuple[RoutedLLM, int]]:
+        return llms_with_usage
+
+
+class LLMHealth:
+    __slots__ = ('latency', 'error_rate', 'p99', 'samples', 'window')
+    
+    def __init__(self, window_size: int):
+        self.latency = 0.0
+        self.error_rate = 0.0
+        self.p99 = 0.0
+        self.samples = 0
+        self.window = deque(maxlen=window_size)
+    
+    def record(self, latency: float, success: bool, alpha: float):
+        error = 0.0 if success else 1.0
+        self.error_rate = error if self.samples == 0 else self.error_rate + alpha * (error - self.error_rate)
+        self.samples += 1
+        
+        if not success:
+            return
+        
+        self.latency = latency if not self.window else self.latency + alpha * (latency - self.latency)
+        self.window.append(latency)
+        ordered = sorted(self.window)
+        self.p99 = ordered[min(int(len(ordered) * 0.99), len(ordered) - 1)]
+    
+    def to_dict(self) -> Dict[str, Any]:
+        return {
+            'ewma_latency_ms': round(self.latency * 1000, 2),
+            'p99_latency_ms': round(self.p99 * 1000, 2),
+            'error_rate': round(self.error_rate, 4),
+            'samples': self.samples
+        }
+
+
+class AdaptiveRoutingPolicy(RoutingPolicy):
+    name = 'adaptive'
+    
+    def __init__(
+        self,
+        alpha: Optional[float] = None,
+        tail_weight: Optional[float] = None,
+        error_penalty: Optional[float] = None,
+        priority_weight: Optional[float] = None,
+        probe_ratio: Optional[float] = None,
+        min_samples: Optional[int] = None,
+        window_size: Optional[int] = None,
+        rng: random.Random = None
+    ):
+        self.alpha = Config.ROUTING_EWMA_ALPHA if alpha is None else alpha
+        self.tail_weight = Config.ROUTING_TAIL_WEIGHT if tail_weight is None else tail_weight
+        self.error_penalty = Config.ROUTING_ERROR_PENALTY if error_penalty is None else error_penalty
+        self.priority_weight = Config.ROUTING_PRIORITY_WEIGHT if priority_weight is None else priority_weight
+        self.probe_ratio = Config.ROUTING_PROBE_RATIO if probe_ratio is None else probe_ratio
+        self.min_samples = Config.ROUTING_MIN_SAMPLES if min_samples is None else min_samples
+        self.window_size = window_size or Config.ROUTING_LATENCY_WINDOW
+        self.rng = rng or random.Random()
+        self._health: Dict[int, LLMHealth] = {}
+        self._lock = threading.Lock()
+        self._probes = 0
+    
+    def _cost(self, health: Optional[LLMHealth], rank: int) -> Optional[float]:
+        if health is None or health.samples < self.min_samples:
+            return None
+        if not health.window:
+            return math.inf
+        
+        latency = health.latency + self.tail_weight * max(health.p99 - health.latency, 0.0)
+        return latency * (1 + self.error_penalty * health.error_rate) * (1 + self.priority_weight * rank)
+    
+    def order(self, llms_with_usage: List[Tuple[RoutedLLM, int]]) -> List[Tuple[RoutedLLM, int]]:
+        if len(llms_with_usage) < 2:
+            return llms_with_usage
+        
+        costs = [
+            self._cost(self._health.get(llm.id), rank)
+            for rank, (llm, _) in enumerate(llms_with_usage)
+        ]
+        known = [cost for cost in costs if cost is not None]
+        if not known:
+            return llms_with_usage
+        
+        explore_cost = min(known)
+        ranked = sorted(
+            range(len(llms_with_usage)),
+            key=lambda index: (explore_cost if costs[index] is None else costs[index], index)
+        )
+        ordered = [llms_with_usage[index] for index in ranked]
+        
+        if self.probe_ratio > 0 and self.rng.random() < self.probe_ratio:
+            probe = ordered.pop(self.rng.randrange(1, len(ordered)))
+            ordered.insert(0, probe)
+            with self._lock:
+                self._probes += 1
+            logger.debug('Tráfico de prueba enviado a %s', probe[0].name)
+        
+        return ordered
+    
+    def record_outcome(self, llm: RoutedLLM, latency: float, success: bool):
+        with self._lock:
+            health = self._health.get(llm.id)
+            if health is None:
+                health = self._health[llm.id] = LLMHealth(self.window_size)
+            health.record(latency, success, self.alpha)
+    
+    def get_stats(self) -> Dict[str, Any]:
+        with self._lock:
+            return {
+                'policy': self.name,
+                'probes': self._probes,
+                'llms': {llm_id: health.to_dict() for llm_id, health in self._health.items()}
+            }
+
+
+ROUTING_POLICIES = {
+    PriorityRoutingPolicy.name: PriorityRoutingPolicy,
+    AdaptiveRoutingPolicy.name: AdaptiveRoutingPolicy
+}
+
+
+def create_routing_policy(name: Optional[str] = None) -> RoutingPolicy:
+    name = (name or Config.ROUTING_POLICY).lower()
+    policy_class = ROUTING_POLICIES.get(name)
+    if policy_class is None:
+        raise ValueError(f'Política de ruteo desconocida: {name}')
+    logger.info('Política de ruteo: %s', name)
+    return policy_class()
+
+
+routing_policy = create_routing_policy()
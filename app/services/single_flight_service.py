@@ -0,0 +1,278 @@
+import asyncio
+import copy
+import threading
+import time
+import uuid
+from typing import Dict, Any, Callable, Awaitable, List, Optional, Tuple
+from app.config import Config
+from app.services.redis_service import get_redis_client
+from app.utils import json_codec
+from app.utils.logger import get_logger
+
+logger = get_logger(__name__)
+
+RELEASE_LOCK_SCRIPT = '''
+if redis.call('GET', KEYS[1]) == ARGV[1] then
+    return redis.call('DEL', KEYS[1])
+end
+return 0
+'''
+
+
+class _InFlightCall:
+    __slots__ = ('event', 'result', 'error', 'waiters')
+    
+    def __init__(self):
+        self.event = threading.Event()
+        self.result = None
+        self.error = None
+        self.waiters: List[Tuple[asyncio.AbstractEventLoop, asyncio.Future]] = []
+
+
+def _wake(future: asyncio.Future):
+    if not future.done():
+        future.set_result(None)
+
+
+class SingleFlight:
+    def __init__(
+        self,
+        enabled: Optional[bool] = None,
+        distributed: Optional[bool] = None,
+        lock_ttl: Optional[int] = None,
+        wait_timeout: Optional[float] = None,
+        result_ttl: Optional[int] = None
+    ):
+        self.enabled = Config.SINGLE_FLIGHT_ENABLED if enabled is None else enabled
+        self.distributed = Config.SINGLE_FLIGHT_DISTRIBUTED if distributed is None else distributed
+        self.lock_ttl = lock_ttl or Config.SINGLE_FLIGHT_LOCK_TTL
+        self.wait_timeout = wait_timeout or Config.SINGLE_FLIGHT_WAIT_TIMEOUT
+        self.result_ttl = result_ttl or Config.SINGLE_FLIGHT_RESULT_TTL
+        self._calls: Dict[str, _InFlightCall] = {}
+        self._lock = threading.Lock()
+        self._release_script = None
+        self._stats = {
+            'leaders': 0,
+            'coalesced': 0,
+            'remote_coalesced': 0,
+            'remote_fallbacks': 0,
+            'leader_failures': 0,
+            'timeouts': 0
+        }
+    
+    @staticmethod
+    def _lock_key(key: str) -> str:
+        return f'single_flight:lock:{key}'
+    
+    @staticmethod
+    def _result_key(key: str) -> str:
+        return f'single_flight:result:{key}'
+    
+    @staticmethod
+    def _channel(key: str) -> str:
+        return f'single_flight:done:{key}'
+    
+    def _count(self, stat: str):
+        with self._lock:
+            self._stats[stat] += 1
+    
+    def _join(self, key: str) -> Tuple[_InFlightCall, bool]:
+        with self._lock:
+            call = self._calls.get(key)
+            if call is not None:
+                return call, False
+            call = _InFlightCall()
+            self._calls[key] = call
+            self._stats['leaders'] += 1
+            return call, True
+    
+    def _finish(self, key: str, call: _InFlightCall, result: Optional[Dict[str, Any]], error: Optional[Exception]):
+        call.result = copy.deepcopy(result)
+        call.error = error
+        with self._lock:
+            self._calls.pop(key, None)
+            call.event.set()
+            waiters, call.waiters = call.waiters, []
+        
+        for loop, future in waiters:
+            try:
+                loop.call_soon_threadsafe(_wake, future)
+            except RuntimeError:
+                pass
+    
+    async def _await_call(self, call: _InFlightCall) -> bool:
+        loop = asyncio.get_running_loop()
+        future = loop.create_future()
+        with self._lock:
+            if call.event.is_set():
+                return True
+            call.waiters.append((loop, future))
+        
+        try:
+            await asyncio.wait_for(future, self.wait_timeout)
+            return True
+        except asyncio.TimeoutError:
+            return False
+    
+    def _follow(self, call: _InFlightCall, waited: bool) -> Optional[Tuple[Dict[str, Any], bool]]:
+        if not waited:
+            self._count('timeouts')
+            return None
+        if call.error is not None:
+            logger.debug('La llamada compartida falló, se llama al proveedor directamente: %s', call.error)
+            self._count('leader_failures')
+            return None
+        self._count('coalesced')
+        return copy.deepcopy(call.result), True
+    
+    def do(self, key: str, fn: Callable[[], Dict[str, Any]]) -> Tuple[Dict[str, Any], bool]:
+        if not self.enabled:
+            return fn(), False
+        
+        call, leader = self._join(key)
+        if not leader:
+            logger.debug('Llamada idéntica en curso, esperando resultado compartido')
+            shared = self._follow(call, call.event.wait(self.wait_timeout))
+            return shared if shared is not None else (fn(), False)
+        
+        try:
+            result, shared = self._lead(key, fn)
+        except Exception as e:
+            self._finish(key, call, None, e)
+            raise
+        self._finish(key, call, result, None)
+        return result, shared
+    
+    async def ado(self, key: str, fn: Callable[[], Awaitable[Dict[str, Any]]]) -> Tuple[Dict[str, Any], bool]:
+        if not self.enabled:
+            return await fn(), False
+        
+        call, leader = self._join(key)
+        if not leader:
+            logger.debug('Llamada idéntica en curso, esperando resultado compartido')
+            shared = self._follow(call, await self._await_call(call))
+            return shared if shared is not None else (await fn(), False)
+        
+        try:
+            result, shared = await self._alead(key, fn)
+        except Exception as e:
+            self._finish(key, call, None, e)
+            raise
+        self._finish(key, call, result, None)
+        return result, shared
+    
+    def _lead(self, key: str, fn: Callable[[], Dict[str, Any]]) -> Tuple[Dict[str, Any], bool]:
+        if not self.distributed:
+            return fn(), False
+        
+        token = str(uuid.uuid4())
+        if not self._acquire_remote(key, token):
+            shared = self._wait_remote(key)
+            if shared is not None:
+                return shared, True
+            self._count('remote_fallbacks')
+            return fn(), False
+        
+        try:
+            result = fn()
+        except Exception:
+            self._release_remote(key, token, None)
+            raise
+        self._release_remote(key, token, result)
+        return result, False
+    
+    async def _alead(self, key: str, fn: Callable[[], Awaitable[Dict[str, Any]]]) -> Tuple[Dict[str, Any], bool]:
+        if not self.distributed:
+            return await fn(), False
+        
+        token = str(uuid.uuid4())
+        if not await asyncio.to_thread(self._acquire_remote, key, token):
+            shared = await asyncio.to_thread(self._wait_remote, key)
+            if shared is not None:
+                return shared, True
+            self._count('remote_fallbacks')
+            return await fn(), False
+        
+        try:
+            result = await fn()
+        except Exception:
+            await asyncio.to_thread(self._release_remote, key, token, None)
+            raise
+        await asyncio.to_thread(self._release_remote, key, token, result)
+        return result, False
+    
+    def _acquire_remote(self, key: str, token: str) -> bool:
+        try:
+            return bool(get_redis_client().set(self._lock_key(key), token, nx=True, ex=self.lock_ttl))
+        except Exception as e:
+            logger.warning('Error al adquirir lock de single-flight en Redis: %s', e)
+            return True
+    
+    def _wait_remote(self, key: str) -> Optional[Dict[str, Any]]:
+        try:
+            client = get_redis_client()
+            pubsub = client.pubsub(ignore_subscribe_messages=True)
+        except Exception as e:
+            logger.warning('Error al suscribirse a single-flight en Redis: %s', e)
+            return None
+        
+        try:
+            pubsub.subscribe(self._channel(key))
+            
+            cached = client.get(self._result_key(key))
+            if cached:
+                self._count('remote_coalesced')
+                return json_codec.loads(cached)
+            
+            deadline = time.monotonic() + self.wait_timeout
+            while time.monotonic() < deadline:
+                message = pubsub.get_message(timeout=min(1.0, deadline - time.monotonic()))
+                if message is not None:
+                    if not message['data']:
+                        return None
+                    self._count('remote_coalesced')
+                    return json_codec.loads(message['data'])
+                if not client.exists(self._lock_key(key)):
+                    cached = client.get(self._result_key(key))
+                    if cached:
+                        self._count('remote_coalesced')
+                        return json_codec.loads(cached)
+                    return None
+            
+            self._count('timeouts')
+            return None
+        except Exception as e:
+            logger.warning('Error al esperar resultado de single-flight en Redis: %s', e)
+            return None
+        finally:
+            pubsub.close()
+    
+    def _release_remote(self, key: str, token: str, result: Optional[Dict[str, Any]]):
+        try:
+            client = get_redis_client()
+            payload = json_codec.dumps(result) if result is not None else ''
+            pipe = client.pipeline()
+            if result is not None:
+                pipe.setex(self._result_key(key), self.result_ttl, payload)
+            pipe.publish(self._channel(key), payload)
+            pipe.execute()
+            
+            if self._release_script is None or self._release_script.registered_client is not client:
+                self._release_script = client.register_script(RELEASE_LOCK_SCRIPT)
+            self._release_script(keys=[self._lock_key(key)], args=[token])
+        except Exception as e:
+            logger.warning('Error al liberar lock de single-flight en Redis: %s', e)
+    
+    def get_stats(self) -> Dict[str, Any]:
+        with self._lock:
+            stats = dict(self._stats)
+            stats['in_flight'] = len(self._calls)
+        
+        calls = stats['leaders'] + stats['coalesced']
+        stats['coalesced_ratio'] = round(stats['coalesced'] / calls, 4) if calls else 0.0
+        stats['enabled'] = self.enabled
+        stats['distributed'] = self.distributed
+        return stats
+
+
+single_flight = SingleFlight()
@@ -0,0 +1,80 @@
+import atexit
+import threading
+import time
+from typing import Optional
+from flask import Flask
+from app.services.usage_service import UsageService
+from app.services.user_usage_service import UserUsageService, user_usage_service as default_user_usage_service
+from app.utils.logger import get_logger
+
+logger = get_logger(__name__)
+
+
+class UsageFlusher:
+    def __init__(
+        self,
+        app: Flask,
+        usage_service: UsageService = None,
+        user_usage_service: UserUsageService = None,
+        interval: Optional[float] = None
+    ):
+        self.app = app
+        self.usage_service = usage_service or UsageService()
+        self.user_usage_service = user_usage_service or default_user_usage_service
+        self.interval = interval or app.config['USAGE_FLUSH_INTERVAL']
+        self.prune_interval = app.config['USAGE_PRUNE_INTERVAL']
+        self._pruned_at = 0.0
+        self._stop_event = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+    
+    def start(self):
+        if self._thread and self._thread.is_alive():
+            return
+        
+        self._stop_event.clear()
+        self._thread = threading.Thread(target=self._run, name='usage-flusher', daemon=True)
+        self._thread.start()
+        logger.info('Sincronizador de uso iniciado (intervalo: %ss)', self.interval)
+    
+    def stop(self):
+        self._stop_event.set()
+        if self._thread:
+            self._thread.join(timeout=self.interval)
+        self.flush()
+    
+    def flush(self):
+        with self.app.app_context():
+            try:
+                self.usage_service.flush()
+                self.user_usage_service.flush()
+            except Exception as e:
+                logger.error('Error al sincronizar uso a base de datos: %s', e, exc_info=True)
+    
+    def prune(self):
+        self._pruned_at = time.monotonic()
+        with self.app.app_context():
+            try:
+                self.usage_service.prune()
+                self.user_usage_service.prune()
+            except Exception as e:
+                logger.error('Error al depurar ventanas de uso antiguas: %s', e, exc_info=True)
+    
+    def _run(self):
+        while not self._stop_event.wait(self.interval):
+            self.flush()
+            if time.monotonic() - self._pruned_at >= self.prune_interval:
+                self.prune()
+
+
+def start_usage_flusher(app: Flask) -> Optional[UsageFlusher]:
+    if not app.config['USAGE_FLUSH_ENABLED']:
+        return None
+    
+    usage_flusher = app.extensions.get('usage_flusher')
+    if usage_flusher is None:
+        usage_flusher = UsageFlusher(app)
+        app.extensions['usage_flusher'] = usage_flusher
+        atexit.register(usage_flusher.stop)
+    
+    usage_flusher.start()
+    return usage_flusher
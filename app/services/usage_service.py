@@ -1,31 +1,80 @@
+from datetime import datetime, timedelta, timezone
+from typing import Any, Optional
 from flask import current_app
+from app.config import Config
 from app.repositories.usage import UsageRepository
+from app.services.llm_routing_table import LLMRoutingTable, llm_routing_table
+from app.services.redis_service import (
+    increment_usage_counter,
+    get_usage_counters,
+    reset_usage_counter
+)
+from app.utils.usage_windows import current_window_start
+from app.utils.metrics import timed_stage
 from app.utils.logger import get_logger
 
 logger = get_logger(__name__)
 
 
 class UsageService:
-    def __init__(self, repository: UsageRepository = None):
+    def __init__(self, repository: UsageRepository = None, routing_table: LLMRoutingTable = None):
         self.repository = repository or UsageRepository
+        self.routing_table = routing_table or llm_routing_table
     
-    def increment(self, llm_id: int) -> bool:
+    @timed_stage('usage_increment')
+    def increment(self, llm: Any) -> bool:
+        count = increment_usage_counter(llm)
+        if count is not None:
+            self.routing_table.set_counter(llm.id, count)
+            logger.debug('Uso incrementado para LLM %s: %s', llm.id, count)
+            return True
+        
+        logger.warning('Contador Redis no disponible para LLM %s, usando base de datos', llm.id)
+        self.routing_table.increment(llm.id)
         with current_app.app_context():
-            usage = self.repository.find_by_llm_id(llm_id)
-            if usage:
-                self.repository.increment_rpd(llm_id)
-                logger.debug(f'Uso incrementado para LLM {llm_id}')
-                return True
-            else:
-                self.repository.create(llm_id, rpd_count=1)
-                logger.debug(f'Uso creado e incrementado para LLM {llm_id}')
-                return True
+            self.repository.increment_or_create(llm.id, current_window_start(llm.integration))
+            logger.debug('Uso incrementado para LLM %s', llm.id)
+            return True
     
-    def reset(self, llm_id: int) -> bool:
+    def flush(self) -> int:
         with current_app.app_context():
-            return self.repository.reset_rpd(llm_id)
+            llms = self.routing_table.get_llms()
+            now = datetime.now(timezone.utc)
+            counters = {}
+            
+            for offset in (1, 0):
+                window_counters = get_usage_counters(llms, offset, now)
+                if window_counters is None:
+                    logger.warning('No se pudo sincronizar el uso: contadores Redis no disponibles')
+                    return 0
+                
+                for llm in llms:
+                    if window_counters[llm.id]:
+                        window_start = current_window_start(llm.integration, now, offset)
+                        counters[(llm.id, window_start)] = window_counters[llm.id]
+            
+            flushed = self.repository.bulk_set_rpd(counters)
+            logger.debug('Uso sincronizado a base de datos para %s ventanas', flushed)
+            return flushed
     
-    def get_usage(self, llm_id: int) -> int:
+    def prune(self, retention_days: Optional[int] = None) -> int:
+        retention_days = retention_days or Config.USAGE_RETENTION_DAYS
+        cutoff = datetime.now(timezone.utc).replace(tzinfo=None) - timedelta(days=retention_days)
         with current_app.app_context():
-            usage = self.repository.find_by_llm_id(llm_id)
+            return self.repository.prune(cutoff)
+    
+    def reset(self, llm: Any) -> bool:
+        reset_usage_counter(llm)
+        with current_app.app_context():
+            reset = self.repository.reset_rpd(llm.id, current_window_start(llm.integration))
+        self.routing_table.set_counter(llm.id, 0)
+        return reset
+    
+    def get_usage(self, llm: Any) -> int:
+        counters = get_usage_counters([llm])
+        if counters is not None:
+            return counters[llm.id]
+        
+        with current_app.app_context():
+            usage = self.repository.find_by_llm_id(llm.id, current_window_start(llm.integration))
             return usage.rpd_count if usage else 0
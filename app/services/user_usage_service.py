@@ -0,0 +1,116 @@
+from datetime import date, datetime, timedelta, timezone
+from typing import Dict, Any, List, Optional, Tuple
+from flask import current_app
+from app.config import Config
+from app.repositories.user_usage import UserUsageRepository, USAGE_FIELDS
+from app.services.redis_service import get_redis_client
+from app.utils.logger import get_logger
+
+logger = get_logger(__name__)
+
+LIVE_DAYS = 2
+
+
+class UserUsageService:
+    def __init__(self, repository: UserUsageRepository = None):
+        self.repository = repository or UserUsageRepository
+        self.ttl = LIVE_DAYS * 86400 + Config.USAGE_COUNTER_GRACE_SECONDS
+    
+    @staticmethod
+    def _today() -> date:
+        return datetime.now(timezone.utc).date()
+    
+    @staticmethod
+    def _counter_key(user_id: int, day: date) -> str:
+        return f'user_usage:{user_id}:{day.isoformat()}'
+    
+    @staticmethod
+    def _active_key(day: date) -> str:
+        return f'user_usage:active:{day.isoformat()}'
+    
+    def _increment(self, user_id: int, values: Dict[str, int]):
+        day = self._today()
+        key = self._counter_key(user_id, day)
+        active_key = self._active_key(day)
+        
+        try:
+            pipe = get_redis_client().pipeline()
+            for field, value in values.items():
+                pipe.hincrby(key, field, value)
+            pipe.expire(key, self.ttl)
+            pipe.sadd(active_key, user_id)
+            pipe.expire(active_key, self.ttl)
+            pipe.execute()
+        except Exception as e:
+            logger.warning('No se pudo registrar el uso del usuario %s: %s', user_id, e)
+    
+    def record_requests(self, user_id: int, requests: int = 1):
+        self._increment(user_id, {'requests': requests})
+    
+    def record_tokens(self, user_id: int, usage: Optional[Dict[str, Any]]):
+        if not usage:
+            return
+        
+        prompt_tokens = int(usage.get('prompt_tokens') or 0)
+        completion_tokens = int(usage.get('completion_tokens') or 0)
+        total_tokens = int(usage.get('total_tokens') or prompt_tokens + completion_tokens)
+        if total_tokens:
+            self._increment(user_id, {
+                'prompt_tokens': prompt_tokens,
+                'completion_tokens': completion_tokens,
+                'total_tokens': total_tokens
+            })
+    
+    def _read_live(self, user_ids: Optional[List[int]] = None) -> Dict[Tuple[int, date], Dict[str, int]]:
+        client = get_redis_client()
+        today = self._today()
+        counters = {}
+        
+        for offset in range(LIVE_DAYS):
+            day = today - timedelta(days=offset)
+            ids = user_ids if user_ids is not None else [int(user_id) for user_id in client.smembers(self._active_key(day))]
+            if not ids:
+                continue
+            
+            pipe = client.pipeline()
+            for user_id in ids:
+                pipe.hgetall(self._counter_key(user_id, day))
+            for user_id, values in zip(ids, pipe.execute()):
+                if values:
+                    counters[(user_id, day)] = {field: int(values.get(field, 0)) for field in USAGE_FIELDS}
+        
+        return counters
+    
+    def flush(self) -> int:
+        with current_app.app_context():
+            try:
+                counters = self._read_live()
+            except Exception as e:
+                logger.warning('No se pudo sincronizar el uso por usuario: %s', e)
+                return 0
+            return self.repository.bulk_set(counters)
+    
+    def prune(self, retention_days: Optional[int] = None) -> int:
+        retention_days = retention_days or Config.USAGE_RETENTION_DAYS
+        with current_app.app_context():
+            return self.repository.prune(self._today() - timedelta(days=retention_days))
+    
+    def get_report(self, user_id: int, days: int = 7) -> List[Dict[str, Any]]:
+        since = self._today() - timedelta(days=days - 1)
+        with current_app.app_context():
+            report = {usage.day: usage.to_dict() for usage in self.repository.find_by_user(user_id, since)}
+        
+        try:
+            live = self._read_live([user_id])
+        except Exception as e:
+            logger.warning('No se pudo leer el uso en vivo del usuario %s: %s', user_id, e)
+            live = {}
+        
+        for (_, day), values in live.items():
+            if day >= since:
+                report[day] = {'day': day.isoformat(), **values}
+        
+        return [report[day] for day in sorted(report)]
+
+
+user_usage_service = UserUsageService()
@@ -1,3 +1,3 @@
-from app.utils.validators import validate_email, validate_password
+from app.utils.validators import validate_email, validate_password, validate_webhook_url
 
-__all__ = ['validate_email', 'validate_password']
+__all__ = ['validate_email', 'validate_password', 'validate_webhook_url']
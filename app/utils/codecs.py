@@ -0,0 +1,187 @@
+import threading
+import zlib
+from abc import ABC, abstractmethod
+from typing import Any, Dict, Optional, Union
+from app.utils import json_codec
+
+try:
+    import msgpack
+except ImportError:
+    msgpack = None
+
+try:
+    import zstandard
+except ImportError:
+    zstandard = None
+
+MSGPACK_MARKER = b'\x01'
+ZLIB_MARKER = b'\x02'
+ZSTD_MARKER = b'\x03'
+
+
+class Codec(ABC):
+    name = ''
+    marker = b''
+    
+    @abstractmethod
+    def encode(self, value: Any) -> bytes:
+        pass
+    
+    @abstractmethod
+    def decode(self, payload: bytes) -> Any:
+        pass
+
+
+class JsonCodec(Codec):
+    name = 'json'
+    
+    def encode(self, value: Any) -> bytes:
+        return json_codec.dumps_bytes(value)
+    
+    def decode(self, payload: bytes) -> Any:
+        return json_codec.loads(payload)
+
+
+class MsgpackCodec(Codec):
+    name = 'msgpack'
+    marker = MSGPACK_MARKER
+    
+    def __init__(self):
+        if msgpack is None:
+            raise RuntimeError('El codec msgpack requiere el paquete "msgpack"')
+    
+    def encode(self, value: Any) -> bytes:
+        return msgpack.packb(value, use_bin_type=True)
+    
+    def decode(self, payload: bytes) -> Any:
+        return msgpack.unpackb(payload, raw=False)
+
+
+class Compressor(ABC):
+    name = ''
+    marker = b''
+    
+    @abstractmethod
+    def compress(self, payload: bytes) -> bytes:
+        pass
+    
+    @abstractmethod
+    def decompress(self, payload: bytes) -> bytes:
+        pass
+
+
+class ZlibCompressor(Compressor):
+    name = 'zlib'
+    marker = ZLIB_MARKER
+    
+    def __init__(self, level: Optional[int] = None):
+        self.level = zlib.Z_DEFAULT_COMPRESSION if level is None else level
+    
+    def compress(self, payload: bytes) -> bytes:
+        return zlib.compress(payload, self.level)
+    
+    def decompress(self, payload: bytes) -> bytes:
+        return zlib.decompress(payload)
+
+
+class ZstdCompressor(Compressor):
+    name = 'zstd'
+    marker = ZSTD_MARKER
+    
+    def __init__(self, level: Optional[int] = None):
+        if zstandard is None:
+            raise RuntimeError('La compresión zstd requiere el paquete "zstandard"')
+        self.level = 3 if level is None else level
+        self._local = threading.local()
+    
+    def _contexts(self):
+        if not hasattr(self._local, 'compressor'):
+            self._local.compressor = zstandard.ZstdCompressor(level=self.level)
+            self._local.decompressor = zstandard.ZstdDecompressor()
+        return self._local.compressor, self._local.decompressor
+    
+    def compress(self, payload: bytes) -> bytes:
+        return self._contexts()[0].compress(payload)
+    
+    def decompress(self, payload: bytes) -> bytes:
+        return self._contexts()[1].decompress(payload)
+
+
+CODECS = {
+    JsonCodec.name: JsonCodec,
+    MsgpackCodec.name: MsgpackCodec
+}
+
+COMPRESSORS = {
+    ZlibCompressor.name: ZlibCompressor,
+    ZstdCompressor.name: ZstdCompressor
+}
+
+_CODECS_BY_MARKER = {codec_class.marker: codec_class for codec_class in CODECS.values()}
+_COMPRESSORS_BY_MARKER = {compressor_class.marker: compressor_class for compressor_class in COMPRESSORS.values()}
+
+
+def get_codec(name: str) -> Codec:
+    if name not in CODECS:
+        raise ValueError(f'Codec desconocido: {name}')
+    return CODECS[name]()
+
+
+def get_compressor(name: Optional[str], level: Optional[int] = None) -> Optional[Compressor]:
+    if not name or name == 'none':
+        return None
+    if name not in COMPRESSORS:
+        raise ValueError(f'Compresión desconocida: {name}')
+    return COMPRESSORS[name](level)
+
+
+class MessageCodec:
+    def __init__(self, codec: Codec = None, compressor: Optional[Compressor] = None, threshold: int = 1024):
+        self.codec = codec or JsonCodec()
+        self.compressor = compressor
+        self.threshold = threshold
+        self._codecs: Dict[bytes, Codec] = {self.codec.marker: self.codec}
+        self._compressors: Dict[bytes, Compressor] = {compressor.marker: compressor} if compressor else {}
+    
+    @property
+    def name(self) -> str:
+        return f'{self.codec.name}+{self.compressor.name}' if self.compressor else self.codec.name
+    
+    def _codec_for(self, marker: bytes) -> Codec:
+        if marker not in self._codecs:
+            self._codecs[marker] = _CODECS_BY_MARKER[marker]()
+        return self._codecs[marker]
+    
+    def _compressor_for(self, marker: bytes) -> Compressor:
+        if marker not in self._compressors:
+            self._compressors[marker] = _COMPRESSORS_BY_MARKER[marker]()
+        return self._compressors[marker]
+    
+    def encode(self, value: Any) -> bytes:
+        payload = self.codec.marker + self.codec.encode(value)
+        if self.compressor is not None and len(payload) >= self.threshold:
+            compressed = self.compressor.marker + self.compressor.compress(payload)
+            if len(compressed) < len(payload):
+                return compressed
+        return payload
+    
+    def decode(self, raw: Union[bytes, str]) -> Any:
+        if isinstance(raw, str):
+            return json_codec.loads(raw)
+        
+        marker = raw[:1]
+        if marker in _COMPRESSORS_BY_MARKER:
+            raw = self._compressor_for(marker).decompress(raw[1:])
+            marker = raw[:1]
+        if marker in _CODECS_BY_MARKER:
+            return self._codec_for(marker).decode(raw[1:])
+        return self._codec_for(b'').decode(raw)
+
+
+def build_message_codec(
+    codec: str = 'json',
+    compression: Optional[str] = None,
+    threshold: int = 1024,
+    level: Optional[int] = None
+) -> MessageCodec:
+    return MessageCodec(get_codec(codec), get_compressor(compression, level), threshold)
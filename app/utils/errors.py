@@ -0,0 +1,29 @@
+import httpx
+import requests
+
+RETRYABLE_STATUS_CODES = {408, 429}
+
+
+def _status_code(error: Exception):
+    response = getattr(error, 'response', None)
+    status_code = getattr(response, 'status_code', None)
+    if status_code is None:
+        status_code = getattr(error, 'status_code', None) or getattr(error, 'code', None)
+    return status_code if isinstance(status_code, int) else None
+
+
+def is_retryable_error(error: Exception) -> bool:
+    if isinstance(error, (requests.exceptions.Timeout, requests.exceptions.ConnectionError)):
+        return True
+    
+    if isinstance(error, (httpx.TimeoutException, httpx.TransportError)):
+        return True
+    
+    if isinstance(error, (TimeoutError, ConnectionError)):
+        return True
+    
+    status_code = _status_code(error)
+    if status_code is None:
+        return False
+    
+    return status_code in RETRYABLE_STATUS_CODES or status_code >= 500
@@ -0,0 +1,165 @@
+import asyncio
+import contextvars
+import threading
+import time
+import weakref
+from contextlib import contextmanager
+from typing import Dict, Any, Optional, Tuple
+import httpx
+import requests
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
+from app.config import Config
+from app.utils.logger import get_logger
+
+logger = get_logger(__name__)
+
+_sessions: Dict[str, requests.Session] = {}
+_sessions_lock = threading.Lock()
+_webhook_session = None
+_async_clients = weakref.WeakKeyDictionary()
+_request_deadline: contextvars.ContextVar = contextvars.ContextVar('request_deadline', default=None)
+
+MIN_CALL_TIMEOUT = 0.1
+
+
+def _build_retry() -> Retry:
+    return Retry(
+        total=Config.EXTERNAL_API_MAX_RETRIES,
+        connect=Config.EXTERNAL_API_MAX_RETRIES,
+        read=0,
+        status=Config.EXTERNAL_API_MAX_RETRIES,
+        backoff_factor=Config.HTTP_RETRY_BACKOFF_FACTOR,
+        status_forcelist=Config.HTTP_RETRY_STATUS_FORCELIST,
+        allowed_methods=Retry.DEFAULT_ALLOWED_METHODS,
+        respect_retry_after_header=True,
+        raise_on_status=False
+    )
+
+
+def get_http_session(base_url: str) -> requests.Session:
+    session = _sessions.get(base_url)
+    if session is not None:
+        return session
+    
+    with _sessions_lock:
+        session = _sessions.get(base_url)
+        if session is None:
+            adapter = HTTPAdapter(
+                pool_connections=Config.HTTP_POOL_CONNECTIONS,
+                pool_maxsize=Config.HTTP_POOL_MAXSIZE,
+                max_retries=_build_retry()
+            )
+            session = requests.Session()
+            session.mount(base_url, adapter)
+            _sessions[base_url] = session
+            logger.info('Sesión HTTP creada para %s (pool_maxsize: %s)', base_url, Config.HTTP_POOL_MAXSIZE)
+    return session
+
+
+def get_webhook_session() -> requests.Session:
+    global _webhook_session
+    if _webhook_session is not None:
+        return _webhook_session
+    
+    with _sessions_lock:
+        if _webhook_session is None:
+            adapter = HTTPAdapter(
+                pool_connections=Config.JOB_WEBHOOK_POOL_SIZE,
+                pool_maxsize=1,
+                max_retries=0
+            )
+            session = requests.Session()
+            session.mount('http://', adapter)
+            session.mount('https://', adapter)
+            _webhook_session = session
+    return _webhook_session
+
+
+@contextmanager
+def bind_deadline(deadline_at: Optional[float]):
+    token = _request_deadline.set(deadline_at)
+    try:
+        yield deadline_at
+    finally:
+        _request_deadline.reset(token)
+
+
+def get_call_timeout() -> Optional[float]:
+    deadline_at = _request_deadline.get()
+    if deadline_at is None:
+        return None
+    return min(max(deadline_at - time.monotonic(), MIN_CALL_TIMEOUT), Config.EXTERNAL_API_TIMEOUT)
+
+
+def get_http_timeout() -> Tuple[float, float]:
+    timeout = get_call_timeout()
+    if timeout is None:
+        return Config.HTTP_CONNECT_TIMEOUT, Config.EXTERNAL_API_TIMEOUT
+    return min(Config.HTTP_CONNECT_TIMEOUT, timeout), timeout
+
+
+def get_async_http_timeout() -> httpx.Timeout:
+    connect, read = get_http_timeout()
+    return httpx.Timeout(read, connect=connect)
+
+
+def get_connection_stats() -> Dict[str, Dict[str, Any]]:
+    stats = {}
+    for base_url, session in list(_sessions.items()):
+        adapter = session.get_adapter(base_url)
+        pools = adapter.poolmanager.pools
+        
+        connections = 0
+        requests_sent = 0
+        for pool_key in list(pools.keys()):
+            pool = pools.get(pool_key)
+            if pool is None:
+                continue
+            connections += pool.num_connections
+            requests_sent += pool.num_requests
+        
+        reused = max(requests_sent - connections, 0)
+        stats[base_url] = {
+            'requests': requests_sent,
+            'connections': connections,
+            'reused': reused,
+            'reuse_ratio': round(reused / requests_sent, 4) if requests_sent else 0.0
+        }
+    return stats
+
+
+def close_http_sessions():
+    global _webhook_session
+    with _sessions_lock:
+        for session in _sessions.values():
+            session.close()
+        _sessions.clear()
+        if _webhook_session is not None:
+            _webhook_session.close()
+            _webhook_session = None
+
+
+def get_async_http_client(base_url: str) -> httpx.AsyncClient:
+    loop = asyncio.get_running_loop()
+    clients = _async_clients.setdefault(loop, {})
+    client = clients.get(base_url)
+    if client is None:
+        client = httpx.AsyncClient(
+            base_url=base_url,
+            limits=httpx.Limits(
+                max_connections=Config.HTTP_POOL_MAXSIZE,
+                max_keepalive_connections=Config.HTTP_POOL_MAXSIZE
+            ),
+            timeout=httpx.Timeout(Config.EXTERNAL_API_TIMEOUT, connect=Config.HTTP_CONNECT_TIMEOUT),
+            transport=httpx.AsyncHTTPTransport(retries=Config.EXTERNAL_API_MAX_RETRIES)
+        )
+        clients[base_url] = client
+        logger.debug('Cliente HTTP asíncrono creado para %s', base_url)
+    return client
+
+
+async def close_async_http_clients():
+    clients = _async_clients.pop(asyncio.get_running_loop(), {})
+    for client in clients.values():
+        await client.aclose()
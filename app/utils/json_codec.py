@@ -0,0 +1,113 @@
+import json
+from typing import Any, Callable, Optional, Union
+from flask.json.provider import DefaultJSONProvider
+from app.config import Config
+
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+
+class StdlibJsonBackend:
+    name = 'json'
+    
+    def dumps(
+        self,
+        value: Any,
+        default: Optional[Callable[[Any], Any]] = None,
+        sort_keys: bool = False,
+        indent: bool = False
+    ) -> bytes:
+        return json.dumps(
+            value,
+            default=default,
+            sort_keys=sort_keys,
+            indent=2 if indent else None,
+            separators=None if indent else (',', ':'),
+            ensure_ascii=False
+        ).encode('utf-8')
+    
+    def loads(self, data: Union[bytes, str]) -> Any:
+        return json.loads(data)
+
+
+class OrjsonBackend:
+    name = 'orjson'
+    
+    def __init__(self):
+        if orjson is None:
+            raise RuntimeError('El backend orjson requiere el paquete "orjson"')
+        self._fallback = StdlibJsonBackend()
+    
+    def dumps(
+        self,
+        value: Any,
+        default: Optional[Callable[[Any], Any]] = None,
+        sort_keys: bool = False,
+        indent: bool = False
+    ) -> bytes:
+        option = orjson.OPT_PASSTHROUGH_DATETIME
+        if sort_keys:
+            option |= orjson.OPT_SORT_KEYS
+        if indent:
+            option |= orjson.OPT_INDENT_2
+        try:
+            return orjson.dumps(value, default=default, option=option)
+        except orjson.JSONEncodeError:
+            return self._fallback.dumps(value, default, sort_keys, indent)
+    
+    def loads(self, data: Union[bytes, str]) -> Any:
+        return orjson.loads(data)
+
+
+JSON_BACKENDS = {
+    StdlibJsonBackend.name: StdlibJsonBackend,
+    OrjsonBackend.name: OrjsonBackend
+}
+
+
+def get_json_backend(name: str = 'auto'):
+    if name == 'auto':
+        name = OrjsonBackend.name if orjson is not None else StdlibJsonBackend.name
+    if name not in JSON_BACKENDS:
+        raise ValueError(f'Backend JSON desconocido: {name}')
+    return JSON_BACKENDS[name]()
+
+
+json_backend = get_json_backend(Config.JSON_BACKEND)
+
+
+def dumps_bytes(value: Any, default: Optional[Callable[[Any], Any]] = None, sort_keys: bool = False) -> bytes:
+    return json_backend.dumps(value, default, sort_keys)
+
+
+def dumps(value: Any, default: Optional[Callable[[Any], Any]] = None, sort_keys: bool = False) -> str:
+    return json_backend.dumps(value, default, sort_keys).decode('utf-8')
+
+
+def loads(data: Union[bytes, str]) -> Any:
+    return json_backend.loads(data)
+
+
+class JsonCodecProvider(DefaultJSONProvider):
+    def _dumps_bytes(self, obj: Any, **kwargs: Any) -> bytes:
+        return json_backend.dumps(
+            obj,
+            kwargs.get('default', self.default),
+            kwargs.get('sort_keys', self.sort_keys),
+            bool(kwargs.get('indent'))
+        )
+    
+    def dumps(self, obj: Any, **kwargs: Any) -> str:
+        return self._dumps_bytes(obj, **kwargs).decode('utf-8')
+    
+    def loads(self, s: Union[str, bytes], **kwargs: Any) -> Any:
+        return json_backend.loads(s)
+    
+    def response(self, *args: Any, **kwargs: Any):
+        obj = self._prepare_response_obj(args, kwargs)
+        indent = (self.compact is None and self._app.debug) or self.compact is False
+        return self._app.response_class(
+            self._dumps_bytes(obj, indent=indent) + b'\n', mimetype=self.mimetype
+        )
@@ -1,27 +1,100 @@
+import atexit
+import copy
+import json
 import logging
 import os
-from logging.handlers import RotatingFileHandler
+import queue
+import random
+import threading
+from datetime import datetime, timezone
+from logging.handlers import RotatingFileHandler, QueueHandler, QueueListener
 from pathlib import Path
+from typing import List, Optional
 
+_RESERVED_ATTRS = set(vars(logging.makeLogRecord({}))) | {'message', 'asctime'}
 
-def setup_logger(name: str = __name__) -> logging.Logger:
-    logger = logging.getLogger(name)
-    
-    if logger.handlers:
-        return logger
-    
-    log_level = os.environ.get('LOG_LEVEL', 'INFO').upper()
-    logger.setLevel(getattr(logging, log_level, logging.INFO))
+_DEFAULT_SAMPLED_LOGGERS = ','.join([
+    'app.services.chat_orchestrator',
+    'app.services.conversation_service',
+    'app.services.llm_selector_service',
+    'app.services.rate_limiter_service',
+    'app.services.redis_service',
+    'app.services.usage_service',
+    'app.middleware'
+])
+
+_handlers: Optional[List[logging.Handler]] = None
+_queue_handler: Optional[QueueHandler] = None
+_listener: Optional[QueueListener] = None
+_sampling_filter: Optional[logging.Filter] = None
+_setup_lock = threading.Lock()
+
+
+class JsonFormatter(logging.Formatter):
+    def format(self, record: logging.LogRecord) -> str:
+        entry = {
+            'timestamp': datetime.fromtimestamp(record.created, timezone.utc).isoformat(),
+            'level': record.levelname,
+            'logger': record.name,
+            'message': record.getMessage(),
+            'process': record.process,
+            'thread': record.threadName
+        }
+        
+        for key, value in record.__dict__.items():
+            if key not in _RESERVED_ATTRS and not key.startswith('_'):
+                entry[key] = value
+        
+        if record.exc_info:
+            entry['exc_info'] = self.formatException(record.exc_info)
+        elif record.exc_text:
+            entry['exc_info'] = record.exc_text
+        if record.stack_info:
+            entry['stack_info'] = self.formatStack(record.stack_info)
+        
+        return json.dumps(entry, default=str, ensure_ascii=False)
+
+
+class _PreparedQueueHandler(QueueHandler):
+    def prepare(self, record: logging.LogRecord) -> logging.LogRecord:
+        record = copy.copy(record)
+        record.message = record.getMessage()
+        record.msg = record.message
+        record.args = None
+        if record.exc_info:
+            record.exc_text = logging.Formatter().formatException(record.exc_info)
+            record.exc_info = None
+        return record
+
+
+class SamplingFilter(logging.Filter):
+    def __init__(self, rate: float, prefixes: List[str], max_level: int = logging.INFO):
+        super().__init__()
+        self.rate = rate
+        self.prefixes = tuple(prefixes)
+        self.max_level = max_level
     
-    formatter = logging.Formatter(
+    def filter(self, record: logging.LogRecord) -> bool:
+        if record.levelno > self.max_level or not record.name.startswith(self.prefixes):
+            return True
+        return random.random() < self.rate
+
+
+def _build_formatter() -> logging.Formatter:
+    if os.environ.get('LOG_FORMAT', 'text').lower() == 'json':
+        return JsonFormatter()
+    return logging.Formatter(
         '%(asctime)s - %(name)s - %(levelname)s - %(message)s',
         datefmt='%Y-%m-%d %H:%M:%S'
     )
+
+
+def _build_handlers() -> List[logging.Handler]:
+    formatter = _build_formatter()
     
     console_handler = logging.StreamHandler()
     console_handler.setLevel(logging.DEBUG)
     console_handler.setFormatter(formatter)
-    logger.addHandler(console_handler)
     
     log_dir = Path('logs')
     log_dir.mkdir(exist_ok=True)
@@ -33,7 +106,6 @@ def setup_logger(name: str = __name__) -> logging.Logger:
     )
     file_handler.setLevel(logging.INFO)
     file_handler.setFormatter(formatter)
-    logger.addHandler(file_handler)
     
     error_handler = RotatingFileHandler(
         log_dir / 'error.log',
@@ -42,7 +114,80 @@ def setup_logger(name: str = __name__) -> logging.Logger:
     )
     error_handler.setLevel(logging.ERROR)
     error_handler.setFormatter(formatter)
-    logger.addHandler(error_handler)
+    
+    return [console_handler, file_handler, error_handler]
+
+
+def _build_sampling_filter() -> Optional[logging.Filter]:
+    rate = float(os.environ.get('LOG_SAMPLE_RATE', '1.0'))
+    if rate >= 1.0:
+        return None
+    
+    prefixes = os.environ.get('LOG_SAMPLED_LOGGERS', _DEFAULT_SAMPLED_LOGGERS)
+    return SamplingFilter(rate, [prefix.strip() for prefix in prefixes.split(',') if prefix.strip()])
+
+
+def _start_listener():
+    global _listener
+    _listener = QueueListener(_queue_handler.queue, *_handlers, respect_handler_level=True)
+    _listener.start()
+
+
+def _stop_listener():
+    global _listener
+    if _listener is not None:
+        _listener.stop()
+        _listener = None
+
+
+def _restart_listener():
+    if _queue_handler is not None and _listener is None:
+        _start_listener()
+
+
+def _initialize():
+    global _handlers, _queue_handler, _sampling_filter
+    
+    with _setup_lock:
+        if _handlers is not None:
+            return
+        
+        _sampling_filter = _build_sampling_filter()
+        handlers = _build_handlers()
+        
+        if os.environ.get('LOG_MODE', 'sync').lower() == 'queue':
+            _queue_handler = _PreparedQueueHandler(queue.SimpleQueue())
+            _handlers = handlers
+            _start_listener()
+            atexit.register(_stop_listener)
+            os.register_at_fork(
+                before=_stop_listener,
+                after_in_parent=_restart_listener,
+                after_in_child=_restart_listener
+            )
+        else:
+            _handlers = handlers
+
+
+def setup_logger(name: str = __name__) -> logging.Logger:
+    logger = logging.getLogger(name)
+    
+    if logger.handlers:
+        return logger
+    
+    _initialize()
+    
+    log_level = os.environ.get('LOG_LEVEL', 'INFO').upper()
+    logger.setLevel(getattr(logging, log_level, logging.INFO))
+    
+    if _queue_handler is not None:
+        logger.addHandler(_queue_handler)
+    else:
+        for handler in _handlers:
+            logger.addHandler(handler)
+    
+    if _sampling_filter is not None:
+        logger.addFilter(_sampling_filter)
     
     logger.propagate = False
     
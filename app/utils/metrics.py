@@ -0,0 +1,117 @@
+import functools
+import inspect
+import os
+from typing import Dict, Any, Optional, Tuple
+from prometheus_client import (
+    REGISTRY,
+    CONTENT_TYPE_LATEST,
+    CollectorRegistry,
+    Counter,
+    Histogram,
+    generate_latest,
+    multiprocess
+)
+
+FAST_BUCKETS = (0.0005, 0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0)
+PROVIDER_BUCKETS = (0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 20.0, 30.0, 60.0, 120.0)
+
+REQUEST_LATENCY = Histogram(
+    'http_request_duration_seconds',
+    'Latencia de requests HTTP por ruta',
+    ['method', 'route', 'status']
+)
+PROVIDER_LATENCY = Histogram(
+    'llm_provider_request_duration_seconds',
+    'Latencia de llamadas al proveedor LLM',
+    ['integration', 'model'],
+    buckets=PROVIDER_BUCKETS
+)
+STREAM_TIME_TO_FIRST_TOKEN = Histogram(
+    'llm_stream_time_to_first_token_seconds',
+    'Tiempo hasta el primer token en chat en streaming',
+    ['integration', 'model'],
+    buckets=PROVIDER_BUCKETS
+)
+PROVIDER_ERRORS = Counter(
+    'llm_provider_errors_total',
+    'Llamadas al proveedor LLM que fallaron',
+    ['integration', 'model']
+)
+STAGE_LATENCY = Histogram(
+    'chat_stage_duration_seconds',
+    'Tiempo por etapa interna del pipeline de chat',
+    ['stage'],
+    buckets=FAST_BUCKETS
+)
+LLM_SELECTIONS = Counter(
+    'llm_selections_total',
+    'LLMs entregados por el selector',
+    ['llm']
+)
+LLM_SELECTION_FALLBACKS = Counter(
+    'llm_selection_fallbacks_total',
+    'Selecciones que usaron find_all_llms_ordered porque todos los LLMs agotaron su rpd'
+)
+LLM_TOKENS = Counter(
+    'llm_tokens_total',
+    'Tokens reportados por los proveedores',
+    ['integration', 'model', 'type']
+)
+
+CIRCUIT_TRANSITIONS = Counter(
+    'llm_circuit_transitions_total',
+    'Cambios de estado de los circuit breakers por integración',
+    ['integration', 'state']
+)
+
+TOKEN_TYPES = ('prompt', 'completion', 'total')
+
+
+def timed_stage(stage: str):
+    def decorator(func):
+        if inspect.iscoroutinefunction(func):
+            @functools.wraps(func)
+            async def async_wrapper(*args, **kwargs):
+                with STAGE_LATENCY.labels(stage).time():
+                    return await func(*args, **kwargs)
+            return async_wrapper
+        
+        @functools.wraps(func)
+        def wrapper(*args, **kwargs):
+            with STAGE_LATENCY.labels(stage).time():
+                return func(*args, **kwargs)
+        return wrapper
+    return decorator
+
+
+def observe_provider_call(integration: str, model: str, duration: float, failed: bool = False):
+    PROVIDER_LATENCY.labels(integration, model).observe(duration)
+    if failed:
+        PROVIDER_ERRORS.labels(integration, model).inc()
+
+
+def record_token_usage(integration: str, model: str, usage: Optional[Dict[str, Any]]):
+    if not usage:
+        return
+    for token_type in TOKEN_TYPES:
+        value = usage.get(f'{token_type}_tokens')
+        if value:
+            LLM_TOKENS.labels(integration, model, token_type).inc(value)
+
+
+def _multiprocess_dir() -> Optional[str]:
+    return os.environ.get('PROMETHEUS_MULTIPROC_DIR') or os.environ.get('prometheus_multiproc_dir')
+
+
+def render_metrics() -> Tuple[bytes, str]:
+    if _multiprocess_dir():
+        registry = CollectorRegistry()
+        multiprocess.MultiProcessCollector(registry)
+    else:
+        registry = REGISTRY
+    return generate_latest(registry), CONTENT_TYPE_LATEST
+
+
+def mark_process_dead(pid: int):
+    if _multiprocess_dir():
+        multiprocess.mark_process_dead(pid)
@@ -0,0 +1,21 @@
+import hashlib
+import json
+from typing import Dict, List, Optional, Sequence
+
+
+def build_request_key(
+    integration: str,
+    model: str,
+    mapped_messages: List[Dict[str, str]],
+    fields: Optional[Sequence[str]] = None
+) -> str:
+    request = {'integration': integration, 'model': model, 'messages': mapped_messages}
+    if fields is not None:
+        request['fields'] = list(fields)
+    payload = json.dumps(
+        request,
+        sort_keys=True,
+        separators=(',', ':'),
+        ensure_ascii=False
+    )
+    return hashlib.sha256(payload.encode('utf-8')).hexdigest()
@@ -0,0 +1,53 @@
+from typing import Any, Dict, Iterable, Optional, Tuple
+
+RESPONSE_FIELDS = (
+    'text',
+    'content',
+    'outputs',
+    'model',
+    'usage',
+    'finish_reason',
+    'safety_ratings',
+    'citations',
+    'grounding_metadata'
+)
+
+REQUIRED_FIELDS = ('text', 'usage')
+
+
+def parse_fields(value: Any) -> Optional[Tuple[str, ...]]:
+    if value is None or value == '':
+        return None
+    
+    if isinstance(value, str):
+        names = [name.strip() for name in value.split(',') if name.strip()]
+    elif isinstance(value, (list, tuple)):
+        names = [str(name).strip() for name in value]
+    else:
+        raise ValueError('El campo "fields" debe ser una lista o un texto separado por comas')
+    
+    if not names:
+        return None
+    
+    unknown = [name for name in names if name not in RESPONSE_FIELDS]
+    if unknown:
+        raise ValueError(f'Campos desconocidos: {", ".join(unknown)}')
+    
+    return normalize_fields(names)
+
+
+def normalize_fields(fields: Iterable[str]) -> Tuple[str, ...]:
+    requested = set(fields)
+    return tuple(field for field in RESPONSE_FIELDS if field in requested)
+
+
+def with_required_fields(fields: Optional[Iterable[str]]) -> Optional[Tuple[str, ...]]:
+    if fields is None:
+        return None
+    return normalize_fields((*fields, *REQUIRED_FIELDS))
+
+
+def project_response(response: Dict[str, Any], fields: Optional[Iterable[str]]) -> Dict[str, Any]:
+    if fields is None:
+        return response
+    return {field: response[field] for field in fields if field in response}
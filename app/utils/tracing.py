@@ -0,0 +1,54 @@
+import contextlib
+import time
+from contextvars import ContextVar, Token
+from typing import List, Optional, Tuple
+
+_current_spans: ContextVar[Optional[List[Tuple[str, float]]]] = ContextVar('current_spans', default=None)
+_NULL_SPAN = contextlib.nullcontext()
+
+
+class _Span:
+    __slots__ = ('spans', 'name', 'started_at')
+    
+    def __init__(self, spans: List[Tuple[str, float]], name: str):
+        self.spans = spans
+        self.name = name
+        self.started_at = 0.0
+    
+    def __enter__(self):
+        self.started_at = time.perf_counter()
+        return self
+    
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.spans.append((self.name, time.perf_counter() - self.started_at))
+        return False
+
+
+def span(name: str):
+    spans = _current_spans.get()
+    if spans is None:
+        return _NULL_SPAN
+    return _Span(spans, name)
+
+
+def start_trace() -> Token:
+    return _current_spans.set([])
+
+
+def end_trace(token: Token):
+    _current_spans.reset(token)
+
+
+def get_spans() -> List[Tuple[str, float]]:
+    return list(_current_spans.get() or ())
+
+
+def format_server_timing(spans: List[Tuple[str, float]], total: Optional[float] = None) -> str:
+    durations = {}
+    for name, duration in spans:
+        durations[name] = durations.get(name, 0.0) + duration
+    
+    if total is not None:
+        durations['total'] = total
+    
+    return ', '.join(f'{name};dur={round(duration * 1000, 2)}' for name, duration in durations.items())
@@ -0,0 +1,31 @@
+import functools
+from datetime import datetime, timedelta, timezone
+from typing import Optional
+from zoneinfo import ZoneInfo
+from app.config import Config
+
+
+@functools.lru_cache(maxsize=None)
+def get_reset_timezone(integration: Optional[str] = None) -> ZoneInfo:
+    return ZoneInfo(Config.USAGE_RESET_TIMEZONES.get(integration, Config.USAGE_DEFAULT_RESET_TIMEZONE))
+
+
+def _window_day(integration: Optional[str], now: Optional[datetime], offset: int) -> datetime:
+    now = now or datetime.now(timezone.utc)
+    local_now = now.astimezone(get_reset_timezone(integration))
+    day = local_now.date() - timedelta(days=offset)
+    return datetime(day.year, day.month, day.day, tzinfo=local_now.tzinfo)
+
+
+def current_window_bucket(integration: Optional[str] = None, now: Optional[datetime] = None, offset: int = 0) -> str:
+    return _window_day(integration, now, offset).strftime('%Y-%m-%d')
+
+
+def current_window_start(integration: Optional[str] = None, now: Optional[datetime] = None, offset: int = 0) -> datetime:
+    start = _window_day(integration, now, offset)
+    return start.astimezone(timezone.utc).replace(tzinfo=None)
+
+
+def window_expires_at(integration: Optional[str] = None, now: Optional[datetime] = None, grace_seconds: int = 0) -> int:
+    next_start = _window_day(integration, now, -1)
+    return int(next_start.timestamp()) + grace_seconds
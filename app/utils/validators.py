@@ -1,5 +1,9 @@
+import ipaddress
 import re
+import socket
 from typing import Tuple
+from urllib.parse import urlsplit
+from app.config import Config
 
 
 def validate_email(email: str) -> Tuple[bool, str]:
@@ -31,3 +35,33 @@ def validate_password(password: str) -> Tuple[bool, str]:
         return False, 'La contraseña debe contener al menos un número'
     
     return True, ''
+
+
+def validate_webhook_url(url: str) -> Tuple[bool, str]:
+    parts = urlsplit(url) if isinstance(url, str) else None
+    if parts is None or parts.scheme not in ('http', 'https') or not parts.hostname:
+        return False, 'El webhook debe ser una URL http o https'
+    
+    try:
+        port = parts.port
+    except ValueError:
+        return False, 'Puerto de webhook inválido'
+    
+    allowed_hosts = Config.JOB_WEBHOOK_ALLOWED_HOSTS
+    if allowed_hosts and parts.hostname.lower() not in allowed_hosts:
+        return False, f'Host de webhook no permitido: {parts.hostname}'
+    
+    if Config.JOB_WEBHOOK_ALLOW_PRIVATE:
+        return True, ''
+    
+    try:
+        addresses = socket.getaddrinfo(parts.hostname, port, proto=socket.IPPROTO_TCP)
+    except (socket.gaierror, UnicodeError, ValueError):
+        return False, f'No se pudo resolver el host del webhook: {parts.hostname}'
+    
+    for address in addresses:
+        ip = ipaddress.ip_address(address[4][0].split('%')[0])
+        if not ip.is_global:
+            return False, f'El webhook no puede apuntar a una dirección interna: {ip}'
+    
+    return True, ''
@@ -0,0 +1,75 @@
+import argparse
+import json
+import platform
+import subprocess
+import sys
+from datetime import datetime, timezone
+
+from benchmarks.environment import install_fake_redis, create_benchmark_app
+from benchmarks.stub_server import StubLLMServer
+from benchmarks import scenarios
+
+
+def _git_commit() -> str:
+    try:
+        return subprocess.check_output(['git', 'rev-parse', 'HEAD'], stderr=subprocess.DEVNULL).decode().strip()
+    except Exception:
+        return 'unknown'
+
+
+def _parse_lengths(value: str):
+    return [int(length) for length in value.split(',') if length.strip()]
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description='Benchmarks offline de los hot paths de multi-llm-api')
+    parser.add_argument('--iterations', type=int, default=200)
+    parser.add_argument('--lengths', type=_parse_lengths, default=[2, 20, 100, 500])
+    parser.add_argument('--stub-latency', type=float, default=0.0, help='Latencia del proveedor stub en segundos')
+    parser.add_argument('--stub-tokens-per-second', type=float, default=0.0, help='0 desactiva el retardo por token')
+    parser.add_argument('--stub-completion-tokens', type=int, default=32)
+    parser.add_argument('--output', help='Archivo JSON de salida (por defecto stdout)')
+    args = parser.parse_args(argv)
+    
+    install_fake_redis()
+    
+    with StubLLMServer(
+        latency=args.stub_latency,
+        tokens_per_second=args.stub_tokens_per_second,
+        completion_tokens=args.stub_completion_tokens
+    ) as stub:
+        app = create_benchmark_app(stub.base_url)
+        
+        results = []
+        results += scenarios.bench_gemini_map_response(args.iterations)
+        results += scenarios.bench_select_llm(app, args.iterations)
+        results += scenarios.bench_get_conversation_history(args.lengths, args.iterations)
+        results += scenarios.bench_orchestrator_chat(app, args.lengths, args.iterations)
+    
+    report = {
+        'meta': {
+            'commit': _git_commit(),
+            'timestamp': datetime.now(timezone.utc).isoformat(),
+            'python': sys.version.split()[0],
+            'platform': platform.platform(),
+            'params': {
+                'iterations': args.iterations,
+                'lengths': args.lengths,
+                'stub_latency': args.stub_latency,
+                'stub_tokens_per_second': args.stub_tokens_per_second,
+                'stub_completion_tokens': args.stub_completion_tokens
+            }
+        },
+        'results': results
+    }
+    
+    output = json.dumps(report, indent=2)
+    if args.output:
+        with open(args.output, 'w') as f:
+            f.write(output)
+    else:
+        print(output)
+
+
+if __name__ == '__main__':
+    main()
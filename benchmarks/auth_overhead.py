@@ -0,0 +1,64 @@
+import argparse
+import json
+
+from benchmarks.environment import install_fake_redis
+from benchmarks.timing import measure
+from app import create_app, db
+from app.config import Config
+from app.middleware.auth_middleware import auth_required
+from app.models.user import User
+from app.services.auth_cache_service import auth_cache
+from app.services.auth_service import AuthService
+
+
+def _create_token(app) -> str:
+    with app.app_context():
+        db.create_all()
+        user = User.query.filter_by(username='bench').first()
+        if user is None:
+            user = AuthService.create_user('bench', 'bench@example.com', 'Bench1234!')
+        return AuthService.generate_tokens(user)['access_token']
+
+
+def bench_auth_required(app, iterations: int):
+    token = _create_token(app)
+    view = auth_required(lambda: None)
+    headers = {'Authorization': f'Bearer {token}'}
+    
+    def call():
+        with app.test_request_context('/api/health', headers=headers):
+            view()
+    
+    def baseline():
+        with app.test_request_context('/api/health', headers=headers):
+            pass
+    
+    results = [{'scenario': 'request_context_baseline', **measure(baseline, iterations)}]
+    
+    enabled = auth_cache.enabled
+    try:
+        auth_cache.enabled = False
+        results.append({'scenario': 'auth_required_uncached', **measure(call, iterations)})
+        
+        auth_cache.enabled = True
+        auth_cache.clear()
+        results.append({'scenario': 'auth_required_cached', **measure(call, iterations)})
+    finally:
+        auth_cache.enabled = enabled
+    
+    return results
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description='Overhead por request de auth_required con y sin caché')
+    parser.add_argument('--iterations', type=int, default=2000)
+    args = parser.parse_args(argv)
+    
+    install_fake_redis()
+    app = create_app(Config)
+    
+    print(json.dumps(bench_auth_required(app, args.iterations), indent=2))
+
+
+if __name__ == '__main__':
+    main()
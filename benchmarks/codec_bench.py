@@ -0,0 +1,106 @@
+import argparse
+import json
+import random
+from typing import Any, Dict, List
+
+from app.utils.codecs import build_message_codec
+from benchmarks.timing import measure
+
+SENTENCES = [
+    'Claro, te explico paso a paso cómo configurar el entorno de desarrollo.',
+    'Primero instala las dependencias con pip y crea un entorno virtual.',
+    'Luego define las variables de entorno necesarias en el archivo .env.',
+    'Si el servidor responde con un error 429, espera unos segundos y reintenta.',
+    'La consulta devuelve una lista de registros ordenados por fecha de creación.',
+    'Here is an example of the request body you can send to the endpoint.',
+    'The function returns None when the conversation does not exist yet.',
+    'Recuerda que el token de acceso expira después de una hora.',
+    'Puedes usar el parámetro conversation_id para continuar una conversación.',
+    'In short, the cache avoids calling the provider for identical prompts.'
+]
+
+CONFIGURATIONS = [
+    ('json', 'none'),
+    ('msgpack', 'none'),
+    ('json', 'zlib'),
+    ('json', 'zstd'),
+    ('msgpack', 'zlib'),
+    ('msgpack', 'zstd')
+]
+
+
+def build_turns(count: int, seed: int = 7) -> List[Dict[str, str]]:
+    rng = random.Random(seed)
+    messages = []
+    for i in range(count):
+        if i % 2 == 0:
+            content = ' '.join(rng.choice(SENTENCES) for _ in range(rng.randint(1, 3)))
+            messages.append({'role': 'user', 'content': content})
+        else:
+            content = '\n\n'.join(
+                ' '.join(rng.choice(SENTENCES) for _ in range(rng.randint(3, 6)))
+                for _ in range(rng.randint(2, 5))
+            )
+            messages.append({'role': 'model', 'content': content})
+    return messages
+
+
+def bench_codec(codec_name: str, compression: str, turns: List[int], iterations: int, threshold: int) -> List[Dict[str, Any]]:
+    try:
+        codec = build_message_codec(codec_name, compression, threshold)
+    except RuntimeError as e:
+        return [{'codec': f'{codec_name}+{compression}', 'skipped': str(e)}]
+    
+    results = []
+    for count in turns:
+        messages = build_turns(count)
+        encoded = [codec.encode(message) for message in messages]
+        json_bytes = sum(len(json.dumps(message)) for message in messages)
+        stored_bytes = sum(len(payload) for payload in encoded)
+        
+        results.append({
+            'codec': codec.name,
+            'turns': count,
+            'bytes': stored_bytes,
+            'ratio_vs_json': round(stored_bytes / json_bytes, 3),
+            'encode': measure(lambda: [codec.encode(message) for message in messages], iterations),
+            'decode': measure(lambda: [codec.decode(payload) for payload in encoded], iterations)
+        })
+    return results
+
+
+def _parse_turns(value: str):
+    return [int(turns) for turns in value.split(',') if turns.strip()]
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description='Bytes almacenados y tiempo de codificación por codec de conversación')
+    parser.add_argument('--iterations', type=int, default=200)
+    parser.add_argument('--turns', type=_parse_turns, default=[10, 50, 200, 1000])
+    parser.add_argument('--threshold', type=int, default=1024, help='Bytes a partir de los cuales se comprime un mensaje')
+    parser.add_argument('--output', help='Archivo JSON de salida (por defecto stdout)')
+    args = parser.parse_args(argv)
+    
+    results = []
+    for codec_name, compression in CONFIGURATIONS:
+        results += bench_codec(codec_name, compression, args.turns, args.iterations, args.threshold)
+    
+    report = {
+        'params': {
+            'iterations': args.iterations,
+            'turns': args.turns,
+            'threshold': args.threshold
+        },
+        'results': results
+    }
+    
+    output = json.dumps(report, indent=2)
+    if args.output:
+        with open(args.output, 'w') as f:
+            f.write(output)
+    else:
+        print(output)
+
+
+if __name__ == '__main__':
+    main()
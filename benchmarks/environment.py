@@ -0,0 +1,48 @@
+import os
+
+os.environ.setdefault('DATABASE_URL', 'sqlite://')
+os.environ.setdefault('USAGE_FLUSH_ENABLED', 'false')
+os.environ.setdefault('LOG_LEVEL', 'WARNING')
+
+from app import create_app, db
+from app.config import Config
+from app.factories.llm_service_factory import LLMServiceFactory
+from app.models.llm import LLM
+from app.models.usage import Usage
+from app.services import redis_service
+from app.services.llm_routing_table import llm_routing_table
+from benchmarks.fake_redis import FakeRedis
+from benchmarks.stub_llm_service import StubLLMService, STUB_INTEGRATION
+
+
+def install_fake_redis() -> FakeRedis:
+    client = FakeRedis()
+    redis_service._redis_client = client
+    redis_service._redis_binary_client = client
+    return client
+
+
+def create_benchmark_app(stub_base_url: str, llm_count: int = 3):
+    app = create_app(Config)
+    
+    with app.app_context():
+        db.create_all()
+        Usage.query.delete()
+        LLM.query.delete()
+        db.session.commit()
+        
+        for priority in range(1, llm_count + 1):
+            llm = LLM(
+                name=f'stub-{priority}',
+                integration=STUB_INTEGRATION,
+                priority=priority,
+                rpm=0,
+                tpm=0,
+                rpd=10 ** 9
+            )
+            db.session.add(llm)
+        db.session.commit()
+    
+    LLMServiceFactory.register_service(StubLLMService(stub_base_url))
+    llm_routing_table.invalidate()
+    return app
@@ -0,0 +1,243 @@
+import fnmatch
+import threading
+import time
+from typing import Any, Dict, List, Optional
+
+
+class FakeRedisPipeline:
+    def __init__(self, client: 'FakeRedis'):
+        self._client = client
+        self._commands = []
+    
+    def __getattr__(self, name: str):
+        method = getattr(self._client, name)
+        
+        def queue(*args, **kwargs):
+            self._commands.append((method, args, kwargs))
+            return self
+        
+        return queue
+    
+    def execute(self) -> List[Any]:
+        with self._client._lock:
+            results = [method(*args, **kwargs) for method, args, kwargs in self._commands]
+        self._commands = []
+        return results
+    
+    def __enter__(self):
+        return self
+    
+    def __exit__(self, *exc_info):
+        self._commands = []
+
+
+class FakeRedis:
+    def __init__(self):
+        self._data: Dict[str, Any] = {}
+        self._expires: Dict[str, float] = {}
+        self._lock = threading.RLock()
+    
+    def _purge(self, key: str):
+        expires_at = self._expires.get(key)
+        if expires_at is not None and expires_at <= time.time():
+            self._data.pop(key, None)
+            self._expires.pop(key, None)
+    
+    def _get(self, key: str, factory=None):
+        self._purge(key)
+        if key not in self._data and factory is not None:
+            self._data[key] = factory()
+        return self._data.get(key)
+    
+    @staticmethod
+    def _encode(value: Any):
+        return value if isinstance(value, (bytes, str)) else str(value)
+    
+    def pipeline(self, transaction: bool = True) -> FakeRedisPipeline:
+        return FakeRedisPipeline(self)
+    
+    def ping(self) -> bool:
+        return True
+    
+    def flushall(self):
+        with self._lock:
+            self._data.clear()
+            self._expires.clear()
+    
+    def get(self, key: str) -> Optional[str]:
+        with self._lock:
+            return self._get(key)
+    
+    def set(self, key: str, value: Any, ex: Optional[int] = None, px: Optional[int] = None, nx: bool = False):
+        with self._lock:
+            if nx and self._get(key) is not None:
+                return None
+            self._data[key] = self._encode(value)
+            self._expires.pop(key, None)
+            if ex is not None:
+                self._expires[key] = time.time() + ex
+            if px is not None:
+                self._expires[key] = time.time() + px / 1000
+            return True
+    
+    def setex(self, key: str, ttl: int, value: Any) -> bool:
+        return self.set(key, value, ex=ttl)
+    
+    def mget(self, keys: List[str]) -> List[Optional[str]]:
+        with self._lock:
+            return [self._get(key) for key in keys]
+    
+    def incr(self, key: str, amount: int = 1) -> int:
+        with self._lock:
+            value = int(self._get(key) or 0) + amount
+            self._data[key] = str(value)
+            return value
+    
+    def incrby(self, key: str, amount: int = 1) -> int:
+        return self.incr(key, amount)
+    
+    def delete(self, *keys: str) -> int:
+        with self._lock:
+            deleted = 0
+            for key in keys:
+                self._purge(key)
+                if self._data.pop(key, None) is not None:
+                    deleted += 1
+                self._expires.pop(key, None)
+            return deleted
+    
+    def exists(self, *keys: str) -> int:
+        with self._lock:
+            return sum(1 for key in keys if self._get(key) is not None)
+    
+    def type(self, key: str) -> str:
+        with self._lock:
+            value = self._get(key)
+            if value is None:
+                return 'none'
+            if isinstance(value, list):
+                return 'list'
+            if isinstance(value, dict):
+                return 'hash'
+            if isinstance(value, _SortedSet):
+                return 'zset'
+            return 'string'
+    
+    def keys(self, pattern: str = '*') -> List[str]:
+        with self._lock:
+            for key in list(self._data):
+                self._purge(key)
+            return [key for key in self._data if fnmatch.fnmatchcase(key, pattern)]
+    
+    def scan_iter(self, match: str = '*', count: Optional[int] = None):
+        return iter(self.keys(match))
+    
+    def expire(self, key: str, ttl: int) -> bool:
+        with self._lock:
+            if self._get(key) is None:
+                return False
+            self._expires[key] = time.time() + ttl
+            return True
+    
+    def expireat(self, key: str, when: int) -> bool:
+        with self._lock:
+            if self._get(key) is None:
+                return False
+            self._expires[key] = float(when)
+            return True
+    
+    def ttl(self, key: str) -> int:
+        with self._lock:
+            if self._get(key) is None:
+                return -2
+            expires_at = self._expires.get(key)
+            if expires_at is None:
+                return -1
+            return max(int(expires_at - time.time()), 0)
+    
+    def rpush(self, key: str, *values: Any) -> int:
+        with self._lock:
+            items = self._get(key, list)
+            items.extend(self._encode(value) for value in values)
+            return len(items)
+    
+    def lrange(self, key: str, start: int, end: int) -> List[str]:
+        with self._lock:
+            items = self._get(key) or []
+            end = len(items) if end == -1 else end + 1
+            return list(items[start:end])
+    
+    def llen(self, key: str) -> int:
+        with self._lock:
+            return len(self._get(key) or [])
+    
+    def hset(self, key: str, field: Optional[str] = None, value: Any = None, mapping: Optional[Dict] = None) -> int:
+        with self._lock:
+            fields = self._get(key, dict)
+            updates = dict(mapping or {})
+            if field is not None:
+                updates[field] = value
+            added = sum(1 for name in updates if name not in fields)
+            fields.update({name: self._encode(item) for name, item in updates.items()})
+            return added
+    
+    def hget(self, key: str, field: str) -> Optional[str]:
+        with self._lock:
+            return (self._get(key) or {}).get(field)
+    
+    def hgetall(self, key: str) -> Dict[str, str]:
+        with self._lock:
+            return dict(self._get(key) or {})
+    
+    def hkeys(self, key: str) -> List[str]:
+        with self._lock:
+            return list((self._get(key) or {}).keys())
+    
+    def hincrby(self, key: str, field: str, amount: int = 1) -> int:
+        with self._lock:
+            fields = self._get(key, dict)
+            value = int(fields.get(field, 0)) + amount
+            fields[field] = str(value)
+            return value
+    
+    def hdel(self, key: str, *fields: str) -> int:
+        with self._lock:
+            values = self._get(key) or {}
+            return sum(1 for field in fields if values.pop(field, None) is not None)
+    
+    def zadd(self, key: str, mapping: Dict[str, float]) -> int:
+        with self._lock:
+            zset = self._get(key, _SortedSet)
+            added = sum(1 for member in mapping if member not in zset.scores)
+            zset.scores.update({member: float(score) for member, score in mapping.items()})
+            return added
+    
+    def zrem(self, key: str, *members: str) -> int:
+        with self._lock:
+            zset = self._get(key) or _SortedSet()
+            return sum(1 for member in members if zset.scores.pop(member, None) is not None)
+    
+    def zcard(self, key: str) -> int:
+        with self._lock:
+            return len((self._get(key) or _SortedSet()).scores)
+    
+    def zremrangebyscore(self, key: str, minimum: float, maximum: float) -> int:
+        with self._lock:
+            zset = self._get(key) or _SortedSet()
+            stale = [member for member, score in zset.scores.items() if minimum <= score <= maximum]
+            for member in stale:
+                del zset.scores[member]
+            return len(stale)
+    
+    def zrange(self, key: str, start: int, end: int, withscores: bool = False):
+        with self._lock:
+            zset = self._get(key) or _SortedSet()
+            ordered = sorted(zset.scores.items(), key=lambda item: (item[1], item[0]))
+            end = len(ordered) if end == -1 else end + 1
+            selected = ordered[start:end]
+            return selected if withscores else [member for member, _ in selected]
+
+
+class _SortedSet:
+    def __init__(self):
+        self.scores: Dict[str, float] = {}
@@ -0,0 +1,99 @@
+import argparse
+import json
+from typing import Any, Dict, List
+
+from flask import Flask
+from app.adapters.gemini_adapter import GeminiAdapter
+from app.utils import json_codec
+from app.utils.codecs import JsonCodec
+from benchmarks.codec_bench import build_turns
+from benchmarks.scenarios import build_gemini_interaction
+from benchmarks.timing import measure
+
+
+def bench_backend(backend: Any, app: Flask, turns: List[int], iterations: int) -> List[Dict[str, Any]]:
+    previous = json_codec.json_backend
+    json_codec.json_backend = backend
+    codec = JsonCodec()
+    results = []
+    
+    try:
+        with app.app_context():
+            response = GeminiAdapter.map_response(build_gemini_interaction())
+            results.append({
+                'backend': backend.name,
+                'scenario': 'jsonify.adapter_response',
+                'params': {'outputs': 3},
+                **measure(lambda: app.json.response({'status': 'success', 'data': response}), iterations)
+            })
+            
+            for count in turns:
+                messages = build_turns(count)
+                encoded = [codec.encode(message) for message in messages]
+                history = {'status': 'success', 'data': {'conversation_id': 'bench', 'model': 'stub-1', 'messages': messages}}
+                
+                results.append({
+                    'backend': backend.name,
+                    'scenario': 'jsonify.conversation_history',
+                    'params': {'turns': count},
+                    **measure(lambda: app.json.response(history), iterations)
+                })
+                results.append({
+                    'backend': backend.name,
+                    'scenario': 'conversation.encode',
+                    'params': {'turns': count},
+                    **measure(lambda: [codec.encode(message) for message in messages], iterations)
+                })
+                results.append({
+                    'backend': backend.name,
+                    'scenario': 'conversation.decode',
+                    'params': {'turns': count},
+                    **measure(lambda: [codec.decode(payload) for payload in encoded], iterations)
+                })
+    finally:
+        json_codec.json_backend = previous
+    
+    return results
+
+
+def _parse_turns(value: str):
+    return [int(turns) for turns in value.split(',') if turns.strip()]
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description='Costo de serialización JSON por backend con historiales largos')
+    parser.add_argument('--iterations', type=int, default=200)
+    parser.add_argument('--turns', type=_parse_turns, default=[100, 500, 2000])
+    parser.add_argument('--output', help='Archivo JSON de salida (por defecto stdout)')
+    args = parser.parse_args(argv)
+    
+    app = Flask(__name__)
+    app.json = json_codec.JsonCodecProvider(app)
+    
+    results = []
+    for name in json_codec.JSON_BACKENDS:
+        try:
+            backend = json_codec.get_json_backend(name)
+        except RuntimeError as e:
+            results.append({'backend': name, 'skipped': str(e)})
+            continue
+        results += bench_backend(backend, app, args.turns, args.iterations)
+    
+    report = {
+        'params': {
+            'iterations': args.iterations,
+            'turns': args.turns
+        },
+        'results': results
+    }
+    
+    output = json.dumps(report, indent=2)
+    if args.output:
+        with open(args.output, 'w') as f:
+            f.write(output)
+    else:
+        print(output)
+
+
+if __name__ == '__main__':
+    main()
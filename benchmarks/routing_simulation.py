@@ -0,0 +1,151 @@
+import argparse
+import json
+import math
+import random
+from typing import Dict, Any, List
+
+from benchmarks.timing import summarize
+from app.services.routing_policy import PriorityRoutingPolicy, AdaptiveRoutingPolicy, RoutingPolicy
+
+DEFAULT_PROFILES = [
+    {
+        'name': 'primary',
+        'priority': 1,
+        'median_latency': 0.8,
+        'sigma': 0.35,
+        'error_rate': 0.01,
+        'degraded': {'start': 0.3, 'end': 0.7, 'latency_factor': 6.0, 'error_rate': 0.4}
+    },
+    {'name': 'secondary', 'priority': 2, 'median_latency': 1.0, 'sigma': 0.3, 'error_rate': 0.01},
+    {'name': 'tertiary', 'priority': 3, 'median_latency': 1.4, 'sigma': 0.3, 'error_rate': 0.02}
+]
+
+
+class SimulatedLLM:
+    __slots__ = ('id', 'name', 'priority', 'profile')
+    
+    def __init__(self, llm_id: int, profile: Dict[str, Any]):
+        self.id = llm_id
+        self.name = profile['name']
+        self.priority = profile['priority']
+        self.profile = profile
+    
+    def sample(self, progress: float, rng: random.Random, error_latency: float):
+        median = self.profile['median_latency']
+        error_rate = self.profile['error_rate']
+        
+        degraded = self.profile.get('degraded')
+        if degraded and degraded['start'] <= progress < degraded['end']:
+            median *= degraded['latency_factor']
+            error_rate = degraded['error_rate']
+        
+        if rng.random() < error_rate:
+            return error_latency, False
+        return rng.lognormvariate(math.log(median), self.profile['sigma']), True
+
+
+def simulate(
+    policy: RoutingPolicy,
+    llms: List[SimulatedLLM],
+    requests: int,
+    max_attempts: int,
+    error_latency: float,
+    concurrency: int,
+    seed: int
+) -> Dict[str, Any]:
+    rng = random.Random(seed)
+    candidates = [(llm, 0) for llm in sorted(llms, key=lambda llm: llm.priority)]
+    
+    latencies = []
+    failures = 0
+    attempts_total = 0
+    served_by = {llm.name: 0 for llm in llms}
+    
+    for index in range(requests):
+        progress = index / requests
+        elapsed = 0.0
+        succeeded = False
+        
+        for llm, _ in policy.order(candidates)[:max_attempts]:
+            attempts_total += 1
+            latency, success = llm.sample(progress, rng, error_latency)
+            elapsed += latency
+            policy.record_outcome(llm, latency, success)
+            if success:
+                served_by[llm.name] += 1
+                succeeded = True
+                break
+        
+        if not succeeded:
+            failures += 1
+        latencies.append(elapsed)
+    
+    summary = summarize(latencies)
+    summary.pop('ops_per_sec')
+    return {
+        'policy': policy.name,
+        'success_rate': round(1 - failures / requests, 4),
+        'attempts_per_request': round(attempts_total / requests, 3),
+        'throughput_rps': round(concurrency / (sum(latencies) / requests), 2),
+        'traffic_share': {name: round(count / requests, 4) for name, count in served_by.items()},
+        **summary
+    }
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description='Simulación de políticas de ruteo: priority vs adaptive')
+    parser.add_argument('--requests', type=int, default=20000)
+    parser.add_argument('--concurrency', type=int, default=32, help='Workers concurrentes para estimar throughput')
+    parser.add_argument('--max-attempts', type=int, default=3)
+    parser.add_argument('--error-latency', type=float, default=5.0, help='Segundos que cuesta un intento fallido')
+    parser.add_argument('--probe-ratio', type=float, default=0.05)
+    parser.add_argument('--seed', type=int, default=7)
+    parser.add_argument('--profiles', help='Archivo JSON con perfiles de LLM (por defecto, primario degradado a mitad de la corrida)')
+    parser.add_argument('--output', help='Archivo JSON de salida (por defecto stdout)')
+    args = parser.parse_args(argv)
+    
+    profiles = DEFAULT_PROFILES
+    if args.profiles:
+        with open(args.profiles) as f:
+            profiles = json.load(f)
+    
+    llms = [SimulatedLLM(index + 1, profile) for index, profile in enumerate(profiles)]
+    policies = [
+        PriorityRoutingPolicy(),
+        AdaptiveRoutingPolicy(probe_ratio=args.probe_ratio, rng=random.Random(args.seed))
+    ]
+    
+    results = [
+        simulate(policy, llms, args.requests, args.max_attempts, args.error_latency, args.concurrency, args.seed)
+        for policy in policies
+    ]
+    baseline, adaptive = results
+    
+    report = {
+        'params': {
+            'requests': args.requests,
+            'concurrency': args.concurrency,
+            'max_attempts': args.max_attempts,
+            'error_latency': args.error_latency,
+            'probe_ratio': args.probe_ratio,
+            'seed': args.seed,
+            'profiles': profiles
+        },
+        'results': results,
+        'improvement': {
+            'throughput_ratio': round(adaptive['throughput_rps'] / baseline['throughput_rps'], 3),
+            'p99_ratio': round(adaptive['p99_ms'] / baseline['p99_ms'], 3),
+            'success_rate_delta': round(adaptive['success_rate'] - baseline['success_rate'], 4)
+        }
+    }
+    
+    output = json.dumps(report, indent=2)
+    if args.output:
+        with open(args.output, 'w') as f:
+            f.write(output)
+    else:
+        print(output)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,94 @@
+import uuid
+from types import SimpleNamespace
+from typing import Any, Dict, List
+from flask import Flask
+from app.adapters.gemini_adapter import GeminiAdapter
+from app.services.chat_orchestrator import ChatOrchestrator
+from app.services.llm_selector_service import LLMSelectorService
+from app.services.redis_service import save_message, get_conversation_history
+from benchmarks.timing import measure
+
+
+def build_messages(length: int) -> List[Dict[str, str]]:
+    messages = []
+    for i in range(length):
+        role = 'user' if i % 2 == 0 else 'model'
+        messages.append({
+            'role': role,
+            'content': f'Mensaje {i} de la conversación de prueba con algo de texto adicional para simular un turno real.'
+        })
+    return messages
+
+
+def seed_conversation(length: int) -> str:
+    conversation_id = str(uuid.uuid4())
+    save_message({
+        'conversation_id': conversation_id,
+        'model': 'stub-1',
+        'messages': build_messages(length)
+    })
+    return conversation_id
+
+
+def build_gemini_interaction(outputs: int = 3) -> Any:
+    rating = SimpleNamespace(category='HARM_CATEGORY_HARASSMENT', probability='NEGLIGIBLE', blocked=False)
+    citation = SimpleNamespace(start_index=0, end_index=42, uri='https://example.com', title='Ejemplo', license=None)
+    return SimpleNamespace(
+        outputs=[
+            SimpleNamespace(
+                type='text',
+                text=f'Salida {i} del modelo con contenido de ejemplo.',
+                content=None,
+                safety_ratings=[rating, rating, rating],
+                citations=[citation]
+            ) for i in range(outputs)
+        ],
+        model='gemini-2.5-flash',
+        usage=SimpleNamespace(prompt_token_count=120, completion_token_count=80, total_token_count=200),
+        finish_reason='STOP',
+        safety_ratings=[rating, rating],
+        citations=[citation]
+    )
+
+
+def bench_orchestrator_chat(app: Flask, lengths: List[int], iterations: int) -> List[Dict[str, Any]]:
+    orchestrator = ChatOrchestrator()
+    results = []
+    with app.app_context():
+        for length in lengths:
+            stats = measure(
+                lambda conversation_id: orchestrator.chat('Hola, ¿cómo estás?', conversation_id),
+                iterations,
+                setup=lambda: seed_conversation(length)
+            )
+            results.append({'scenario': 'chat_orchestrator.chat', 'params': {'conversation_length': length}, **stats})
+    return results
+
+
+def bench_gemini_map_response(iterations: int) -> List[Dict[str, Any]]:
+    interaction = build_gemini_interaction()
+    results = []
+    for fields in (None, ('text', 'usage')):
+        stats = measure(lambda: GeminiAdapter.map_response(interaction, fields), iterations)
+        results.append({
+            'scenario': 'gemini_adapter.map_response',
+            'params': {'outputs': 3, 'fields': list(fields) if fields else 'all'},
+            **stats
+        })
+    return results
+
+
+def bench_select_llm(app: Flask, iterations: int) -> List[Dict[str, Any]]:
+    selector = LLMSelectorService()
+    with app.app_context():
+        stats = measure(selector.select_llm, iterations)
+    return [{'scenario': 'llm_selector_service.select_llm', 'params': {}, **stats}]
+
+
+def bench_get_conversation_history(lengths: List[int], iterations: int) -> List[Dict[str, Any]]:
+    results = []
+    for length in lengths:
+        conversation_id = seed_conversation(length)
+        stats = measure(lambda: get_conversation_history(conversation_id), iterations)
+        results.append({'scenario': 'redis_service.get_conversation_history', 'params': {'conversation_length': length}, **stats})
+    return results
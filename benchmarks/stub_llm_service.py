@@ -0,0 +1,20 @@
+from app.services.llm.ngrok_llm_service import NgrokLLMService
+
+STUB_INTEGRATION = 'stub'
+
+
+class StubLLMService(NgrokLLMService):
+    def __init__(self, base_url: str, model: str = 'stub-model'):
+        super().__init__()
+        self.base_url = base_url
+        self.api_key = None
+        self.model = model
+    
+    def get_model_name(self) -> str:
+        return self.model
+    
+    def supports_integration(self, integration: str) -> bool:
+        return integration == STUB_INTEGRATION
+    
+    def get_integration_name(self) -> str:
+        return STUB_INTEGRATION
@@ -0,0 +1,136 @@
+import json
+import socket
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Any, Dict, List
+
+
+class _StubHandler(BaseHTTPRequestHandler):
+    protocol_version = 'HTTP/1.1'
+    server: '_StubHTTPServer'
+    
+    def setup(self):
+        super().setup()
+        self.connection.setsockopt(socket.IPPROTO_TCP, socket.TCP_NODELAY, 1)
+    
+    def log_message(self, format: str, *args: Any):
+        pass
+    
+    def _send_json(self, status: int, body: Dict[str, Any]):
+        payload = json.dumps(body).encode('utf-8')
+        self.send_response(status)
+        self.send_header('Content-Type', 'application/json')
+        self.send_header('Content-Length', str(len(payload)))
+        self.end_headers()
+        self.wfile.write(payload)
+    
+    def _write_chunk(self, data: bytes):
+        self.wfile.write(b'%x\r\n%s\r\n' % (len(data), data))
+        self.wfile.flush()
+    
+    def do_POST(self):
+        if self.path != '/v1/chat/completions':
+            self._send_json(404, {'error': 'not found'})
+            return
+        
+        length = int(self.headers.get('Content-Length', 0))
+        request = json.loads(self.rfile.read(length) or b'{}')
+        messages = request.get('messages', [])
+        model = request.get('model', 'stub-model')
+        
+        tokens = self.server.build_tokens(messages)
+        prompt_tokens = sum(len((message.get('content') or '').split()) for message in messages)
+        usage = {
+            'prompt_tokens': prompt_tokens,
+            'completion_tokens': len(tokens),
+            'total_tokens': prompt_tokens + len(tokens)
+        }
+        
+        time.sleep(self.server.latency)
+        
+        if not request.get('stream'):
+            time.sleep(len(tokens) * self.server.token_interval)
+            self._send_json(200, {
+                'id': 'stub-completion',
+                'object': 'chat.completion',
+                'model': model,
+                'text': ''.join(tokens),
+                'choices': [{
+                    'index': 0,
+                    'message': {'role': 'assistant', 'content': ''.join(tokens)},
+                    'finish_reason': 'stop'
+                }],
+                'usage': usage,
+                'finish_reason': 'stop'
+            })
+            return
+        
+        self.send_response(200)
+        self.send_header('Content-Type', 'text/event-stream')
+        self.send_header('Transfer-Encoding', 'chunked')
+        self.end_headers()
+        
+        for token in tokens:
+            time.sleep(self.server.token_interval)
+            chunk = {
+                'object': 'chat.completion.chunk',
+                'model': model,
+                'choices': [{'index': 0, 'delta': {'content': token}, 'finish_reason': None}]
+            }
+            self._write_chunk(f'data: {json.dumps(chunk)}\n\n'.encode('utf-8'))
+        
+        final_chunk = {
+            'object': 'chat.completion.chunk',
+            'model': model,
+            'choices': [{'index': 0, 'delta': {}, 'finish_reason': 'stop'}],
+            'usage': usage
+        }
+        self._write_chunk(f'data: {json.dumps(final_chunk)}\n\ndata: [DONE]\n\n'.encode('utf-8'))
+        self._write_chunk(b'')
+
+
+class _StubHTTPServer(ThreadingHTTPServer):
+    daemon_threads = True
+    
+    def __init__(self, address, latency: float, tokens_per_second: float, completion_tokens: int):
+        super().__init__(address, _StubHandler)
+        self.latency = latency
+        self.token_interval = 1.0 / tokens_per_second if tokens_per_second > 0 else 0.0
+        self.completion_tokens = completion_tokens
+    
+    def build_tokens(self, messages: List[Dict[str, str]]) -> List[str]:
+        return [f'token{i} ' for i in range(self.completion_tokens)]
+
+
+class StubLLMServer:
+    def __init__(
+        self,
+        host: str = '127.0.0.1',
+        port: int = 0,
+        latency: float = 0.0,
+        tokens_per_second: float = 0.0,
+        completion_tokens: int = 32
+    ):
+        self._server = _StubHTTPServer((host, port), latency, tokens_per_second, completion_tokens)
+        self._thread = None
+    
+    @property
+    def base_url(self) -> str:
+        host, port = self._server.server_address[:2]
+        return f'http://{host}:{port}'
+    
+    def start(self) -> 'StubLLMServer':
+        self._thread = threading.Thread(target=self._server.serve_forever, name='stub-llm-server', daemon=True)
+        self._thread.start()
+        return self
+    
+    def stop(self):
+        self._server.shutdown()
+        self._server.server_close()
+    
+    def __enter__(self):
+        return self.start()
+    
+    def __exit__(self, *exc_info):
+        self.stop()
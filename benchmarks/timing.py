@@ -0,0 +1,42 @@
+import statistics
+import time
+from typing import Any, Callable, Dict, List, Optional
+
+
+def _percentile(samples: List[float], percentile: float) -> float:
+    ordered = sorted(samples)
+    index = min(int(round(percentile / 100 * (len(ordered) - 1))), len(ordered) - 1)
+    return ordered[index]
+
+
+def summarize(samples: List[float]) -> Dict[str, float]:
+    total = sum(samples)
+    return {
+        'iterations': len(samples),
+        'mean_ms': round(statistics.fmean(samples) * 1000, 4),
+        'p50_ms': round(_percentile(samples, 50) * 1000, 4),
+        'p95_ms': round(_percentile(samples, 95) * 1000, 4),
+        'p99_ms': round(_percentile(samples, 99) * 1000, 4),
+        'min_ms': round(min(samples) * 1000, 4),
+        'max_ms': round(max(samples) * 1000, 4),
+        'ops_per_sec': round(len(samples) / total, 2) if total else 0.0
+    }
+
+
+def measure(
+    fn: Callable[..., Any],
+    iterations: int,
+    warmup: int = 3,
+    setup: Optional[Callable[[], Any]] = None
+) -> Dict[str, float]:
+    for _ in range(warmup):
+        fn(setup()) if setup else fn()
+    
+    samples = []
+    for _ in range(iterations):
+        argument = setup() if setup else None
+        started_at = time.perf_counter()
+        fn(argument) if setup else fn()
+        samples.append(time.perf_counter() - started_at)
+    
+    return summarize(samples)
@@ -0,0 +1,34 @@
+import os
+
+server_mode = os.environ.get('SERVER_MODE', 'wsgi').lower()
+
+request_budget = max(
+    float(os.environ.get('CHAT_FAILOVER_DEADLINE', '60')),
+    float(os.environ.get('BATCH_CAPACITY_WAIT', '120'))
+)
+
+bind = f"0.0.0.0:{os.environ.get('PORT', 9000)}"
+workers = int(os.environ.get('WEB_CONCURRENCY', '4'))
+timeout = int(os.environ.get('GUNICORN_TIMEOUT', request_budget + 30))
+graceful_timeout = timeout
+
+if server_mode == 'asgi':
+    wsgi_app = 'asgi:app'
+    worker_class = 'uvicorn.workers.UvicornWorker'
+else:
+    wsgi_app = 'run:app'
+    worker_class = 'gthread'
+    threads = int(os.environ.get('GUNICORN_THREADS', '32'))
+
+
+def post_worker_init(worker):
+    if server_mode == 'asgi':
+        return
+    from app.services.usage_flusher import start_usage_flusher
+    start_usage_flusher(worker.wsgi)
+
+
+def child_exit(server, worker):
+    if os.environ.get('PROMETHEUS_MULTIPROC_DIR') or os.environ.get('prometheus_multiproc_dir'):
+        from prometheus_client import multiprocess
+        multiprocess.mark_process_dead(worker.pid)
@@ -0,0 +1,45 @@
+from app import create_app
+from app.config import Config
+from app.models.base import db
+from app.services.llm_routing_table import llm_routing_table
+from app.utils.logger import get_logger
+from sqlalchemy import text
+
+logger = get_logger(__name__)
+
+
+def migrate_add_context_tokens():
+    app = create_app(Config)
+    
+    with app.app_context():
+        try:
+            logger.info('Verificando si la columna context_tokens existe...')
+            
+            result = db.session.execute(text("PRAGMA table_info(llm)"))
+            columns = [row[1] for row in result.fetchall()]
+            
+            if 'context_tokens' in columns:
+                logger.info('La columna context_tokens ya existe, no es necesario migrar')
+                return
+            
+            logger.info('Agregando columna context_tokens a la tabla llm...')
+            db.session.execute(text('''
+                ALTER TABLE llm 
+                ADD COLUMN context_tokens INTEGER NOT NULL DEFAULT 0
+            '''))
+            db.session.commit()
+            llm_routing_table.invalidate()
+            
+            logger.info('Columna context_tokens agregada exitosamente')
+            
+        except Exception as e:
+            db.session.rollback()
+            if 'duplicate column name' in str(e).lower() or 'already exists' in str(e).lower():
+                logger.info('La columna context_tokens ya existe, no es necesario migrar')
+            else:
+                logger.error(f'Error durante la migración: {str(e)}')
+                raise
+
+
+if __name__ == '__main__':
+    migrate_add_context_tokens()
@@ -1,6 +1,7 @@
 from app import create_app
 from app.config import Config
 from app.models.base import db
+from app.services.llm_routing_table import llm_routing_table
 from app.utils.logger import get_logger
 from sqlalchemy import text
 
@@ -42,6 +43,7 @@ def migrate_add_integration():
                         {'integration': integration, 'id': llm_id}
                     )
                 db.session.commit()
+                llm_routing_table.invalidate()
                 logger.info('Registros actualizados exitosamente')
             else:
                 logger.info('No hay registros que actualizar')
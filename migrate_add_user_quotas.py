@@ -0,0 +1,46 @@
+from app import create_app
+from app.config import Config
+from app.models.base import db
+from app.models.api_key import ApiKey
+from app.models.user_usage import UserUsage
+from app.utils.logger import get_logger
+from sqlalchemy import text
+
+logger = get_logger(__name__)
+
+
+def migrate_add_user_quotas():
+    app = create_app(Config)
+    
+    with app.app_context():
+        try:
+            logger.info('Verificando si la columna tier existe en users...')
+            
+            result = db.session.execute(text("PRAGMA table_info(users)"))
+            columns = [row[1] for row in result.fetchall()]
+            
+            if 'tier' in columns:
+                logger.info('La columna tier ya existe, no es necesario agregarla')
+            else:
+                logger.info('Agregando columna tier a la tabla users...')
+                db.session.execute(text(f'''
+                    ALTER TABLE users 
+                    ADD COLUMN tier VARCHAR(32) NOT NULL DEFAULT '{Config.QUOTA_DEFAULT_TIER}'
+                '''))
+                db.session.commit()
+                logger.info('Columna tier agregada exitosamente')
+            
+            logger.info('Creando tablas api_keys y user_usage si no existen...')
+            ApiKey.__table__.create(db.engine, checkfirst=True)
+            UserUsage.__table__.create(db.engine, checkfirst=True)
+            
+            logger.info('Migración de cuotas por usuario completada exitosamente')
+            
+        except Exception as e:
+            db.session.rollback()
+            logger.error(f'Error durante la migración: {str(e)}')
+            raise
+
+
+if __name__ == '__main__':
+    migrate_add_user_quotas()
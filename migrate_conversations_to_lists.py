@@ -0,0 +1,16 @@
+from app.services.redis_service import migrate_legacy_conversations
+from app.utils.logger import get_logger
+from dotenv import load_dotenv
+load_dotenv()
+
+logger = get_logger(__name__)
+
+
+def migrate_conversations_to_lists():
+    logger.info('Migrando conversaciones en formato JSON a listas de Redis...')
+    migrated = migrate_legacy_conversations()
+    logger.info(f'{migrated} conversaciones migradas exitosamente')
+
+
+if __name__ == '__main__':
+    migrate_conversations_to_lists()
@@ -0,0 +1,64 @@
+from app import create_app
+from app.config import Config
+from app.models.base import db
+from app.models.usage import Usage
+from app.services.llm_routing_table import llm_routing_table
+from app.utils.usage_windows import current_window_start
+from app.utils.logger import get_logger
+from sqlalchemy import text
+
+logger = get_logger(__name__)
+
+
+def migrate_usage_ledger():
+    app = create_app(Config)
+    
+    with app.app_context():
+        try:
+            logger.info('Verificando si la tabla usage ya es un historial por ventana...')
+            
+            result = db.session.execute(text("PRAGMA table_info(usage)"))
+            columns = [row[1] for row in result.fetchall()]
+            
+            if not columns:
+                logger.info('La tabla usage no existe, creándola con el nuevo esquema')
+                Usage.__table__.create(db.engine)
+                return
+            
+            if 'window_start' in columns:
+                logger.info('La tabla usage ya tiene la columna window_start, no es necesario migrar')
+                return
+            
+            result = db.session.execute(text('''
+                SELECT usage.llm_id, usage.rpd_count, llm.integration
+                FROM usage JOIN llm ON llm.id = usage.llm_id
+            '''))
+            legacy_rows = result.fetchall()
+            
+            logger.info('Reemplazando la tabla usage por el historial por ventana...')
+            db.session.execute(text('ALTER TABLE usage RENAME TO usage_legacy'))
+            db.session.commit()
+            Usage.__table__.create(db.engine)
+            
+            for llm_id, rpd_count, integration in legacy_rows:
+                if rpd_count:
+                    db.session.add(Usage(
+                        llm_id=llm_id,
+                        window_start=current_window_start(integration),
+                        rpd_count=rpd_count
+                    ))
+            
+            db.session.execute(text('DROP TABLE usage_legacy'))
+            db.session.commit()
+            llm_routing_table.invalidate()
+            
+            logger.info(f'Tabla usage migrada exitosamente ({len(legacy_rows)} registros asignados a la ventana actual)')
+            
+        except Exception as e:
+            db.session.rollback()
+            logger.error(f'Error durante la migración: {str(e)}')
+            raise
+
+
+if __name__ == '__main__':
+    migrate_usage_ledger()
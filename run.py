@@ -2,6 +2,7 @@ import os
 from app import create_app
 from app import db
 from app.config import Config
+from app.services.usage_flusher import start_usage_flusher
 from app.utils.logger import get_logger
 
 logger = get_logger(__name__)
@@ -16,5 +17,7 @@ if __name__ == '__main__':
         db.create_all()
         logger.info('Base de datos inicializada')
     
+    start_usage_flusher(app)
+    
     logger.info(f'Servidor corriendo en http://0.0.0.0:{PORT}')
     app.run(debug=True, host='0.0.0.0', port=PORT)
@@ -3,6 +3,8 @@ from app.config import Config
 from app.models.base import db
 from app.models.llm import LLM
 from app.models.usage import Usage
+from app.repositories.llm import LLMRepository
+from app.services.llm_routing_table import llm_routing_table
 from app.utils.logger import get_logger
 import os
 from dotenv import load_dotenv
@@ -27,6 +29,7 @@ def seed_database():
                 'rpm': 5,
                 'tpm': 250000,
                 'rpd': 20,
+                'context_tokens': 32000,
                 'api_key': os.getenv('GEMINI_API_KEY')
             },
             {
@@ -36,6 +39,7 @@ def seed_database():
                 'rpm': 30,
                 'tpm': 15000,
                 'rpd': 14400,
+                'context_tokens': 8000,
                 'api_key': os.getenv('GEMINI_API_KEY')
             },
             {
@@ -45,6 +49,7 @@ def seed_database():
                 'rpm': 120,
                 'tpm': 0,
                 'rpd': 650,
+                'context_tokens': 8000,
                 'api_key': os.getenv('NGROK_API_KEY')
             },
         ]
@@ -73,23 +78,14 @@ def seed_database():
         db.session.commit()
         logger.info(f'Creados {len(created_llms)} registros LLM')
         
-        logger.info('Creando registros Usage...')
-        for llm in created_llms:
-            usage = Usage(rpd_count=0, llm_id=llm.id)
-            db.session.add(usage)
-        
-        db.session.commit()
-        logger.info(f'Creados {len(created_llms)} registros Usage')
+        llm_routing_table.invalidate()
         
         logger.info('Seeder completado exitosamente')
         
         logger.info('Resumen de datos creados:')
-        all_llms = LLM.query.all()
-        for llm in all_llms:
+        for llm, rpd_count in LLMRepository.find_all_with_usage():
             logger.info(f'  - LLM: {llm.name} (ID: {llm.id}, Priority: {llm.priority})')
-            usage = Usage.query.filter_by(llm_id=llm.id).first()
-            if usage:
-                logger.info(f'    Usage: RPD Count = {usage.rpd_count}')
+            logger.info(f'    Usage (ventana actual): RPD Count = {rpd_count}')
 
 
 if __name__ == '__main__':
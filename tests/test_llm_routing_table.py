@@ -0,0 +1,71 @@
+import unittest
+from types import SimpleNamespace
+from unittest import mock
+from app.services import llm_routing_table
+from app.services.llm_routing_table import LLMRoutingTable
+
+
+def build_llm(llm_id: int, priority: int):
+    return SimpleNamespace(
+        id=llm_id,
+        name=f'llm-{llm_id}',
+        integration='gemini',
+        priority=priority,
+        rpm=60,
+        tpm=100000,
+        rpd=1000,
+        context_tokens=8000
+    )
+
+
+class FakeRepository:
+    def __init__(self):
+        self.rows = [(build_llm(1, 1), 0)]
+        self.loads = 0
+    
+    def find_all_with_usage(self):
+        self.loads += 1
+        return list(self.rows)
+
+
+class LLMRoutingTableTest(unittest.TestCase):
+    def setUp(self):
+        self.version = 1
+        self.clock = 100.0
+        patches = [
+            mock.patch.object(llm_routing_table, 'get_routing_version', lambda: self.version),
+            mock.patch.object(llm_routing_table, 'get_usage_counters', lambda entries: None),
+            mock.patch.object(llm_routing_table.time, 'monotonic', lambda: self.clock)
+        ]
+        for patch in patches:
+            patch.start()
+            self.addCleanup(patch.stop)
+        
+        self.repository = FakeRepository()
+        self.table = LLMRoutingTable(
+            repository=self.repository,
+            ttl=3600,
+            version_check_interval=0.05,
+            counter_sync_interval=3600
+        )
+    
+    def test_reloads_when_version_changes(self):
+        self.assertEqual([llm.id for llm in self.table.get_llms()], [1])
+        
+        self.repository.rows = [(build_llm(2, 1), 0), (build_llm(1, 2), 0)]
+        self.version = 2
+        self.clock += 0.1
+        
+        self.assertEqual([llm.id for llm in self.table.get_llms()], [2, 1])
+        self.assertEqual(self.repository.loads, 2)
+    
+    def test_does_not_reload_when_version_is_unchanged(self):
+        self.table.get_llms()
+        self.clock += 0.1
+        self.table.get_llms()
+        
+        self.assertEqual(self.repository.loads, 1)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,71 @@
+import unittest
+from types import SimpleNamespace
+from unittest import mock
+from app.services import rate_limiter_service
+from app.services.rate_limiter_service import SlidingWindowRateLimiter
+
+
+class FakeRedis:
+    def __init__(self):
+        self.zsets = {}
+        self.hashes = {}
+    
+    def zcount(self, key, minimum, maximum):
+        return sum(1 for score in self.zsets.get(key, {}).values() if score >= minimum)
+    
+    def zrange(self, key, start, end, withscores=False):
+        members = sorted(self.zsets.get(key, {}).items(), key=lambda item: item[1])
+        return members[start:end + 1]
+    
+    def hgetall(self, key):
+        return dict(self.hashes.get(key, {}))
+
+
+class SlidingWindowRateLimiterTest(unittest.TestCase):
+    def setUp(self):
+        self.redis = FakeRedis()
+        self.now = 1000.0
+        patches = [
+            mock.patch.object(rate_limiter_service, 'get_redis_client', lambda: self.redis),
+            mock.patch.object(rate_limiter_service.time, 'time', lambda: self.now)
+        ]
+        for patch in patches:
+            patch.start()
+            self.addCleanup(patch.stop)
+        
+        self.limiter = SlidingWindowRateLimiter(window_seconds=60, enabled=True)
+        self.llm = SimpleNamespace(id=1, name='llm-1', rpm=2, tpm=100)
+    
+    def test_retry_after_uses_rpm_window_when_requests_are_exhausted(self):
+        self.redis.zsets['ratelimit:rpm:1'] = {'a': 970.0, 'b': 990.0}
+        
+        self.assertEqual(self.limiter.retry_after(self.llm), 31)
+    
+    def test_retry_after_uses_tpm_window_when_tokens_are_exhausted(self):
+        self.redis.zsets['ratelimit:rpm:1'] = {'a': 995.0}
+        self.redis.hashes['ratelimit:tpm:1'] = {'950': '60', '980': '30'}
+        
+        self.assertEqual(self.limiter.retry_after(self.llm, estimated_tokens=20), 11)
+        self.assertEqual(self.limiter.retry_after(self.llm, estimated_tokens=80), 41)
+    
+    def test_retry_after_ignores_tpm_without_limit(self):
+        self.llm.rpm = 1
+        self.llm.tpm = 0
+        self.redis.zsets['ratelimit:rpm:1'] = {'a': 995.0}
+        self.redis.hashes['ratelimit:tpm:1'] = {'995': '40'}
+        
+        self.assertEqual(self.limiter.retry_after(self.llm, estimated_tokens=20), 56)
+    
+    def test_retry_after_ignores_rpm_without_limit(self):
+        self.llm.rpm = 0
+        self.redis.zsets['ratelimit:rpm:1'] = {'a': 995.0}
+        self.redis.hashes['ratelimit:tpm:1'] = {'970': '100'}
+        
+        self.assertEqual(self.limiter.retry_after(self.llm, estimated_tokens=20), 31)
+    
+    def test_retry_after_waits_full_window_when_estimate_exceeds_tpm(self):
+        self.assertEqual(self.limiter.retry_after(self.llm, estimated_tokens=150), 60)
+
+
+if __name__ == '__main__':
+    unittest.main()
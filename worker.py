@@ -0,0 +1,58 @@
+import argparse
+import multiprocessing
+import signal
+from app import create_app
+from app.config import Config
+from app.services.chat_job_worker import ChatJobWorker
+from app.services.usage_flusher import start_usage_flusher
+from app.utils.metrics import mark_process_dead
+from app.utils.logger import get_logger
+
+logger = get_logger(__name__)
+
+
+def run_worker(index: int):
+    app = create_app(Config)
+    worker = ChatJobWorker(app)
+    usage_flusher = start_usage_flusher(app)
+    
+    signal.signal(signal.SIGTERM, lambda signum, frame: worker.stop())
+    signal.signal(signal.SIGINT, lambda signum, frame: worker.stop())
+    
+    worker.run()
+    
+    if usage_flusher:
+        usage_flusher.stop()
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Workers de jobs de chat sobre Redis Streams')
+    parser.add_argument('--processes', type=int, default=Config.JOB_WORKER_PROCESSES)
+    args = parser.parse_args()
+    
+    logger.info(f'Iniciando {args.processes} workers de chat')
+    
+    processes = [
+        multiprocessing.Process(target=run_worker, args=(index,), name=f'chat-worker-{index}')
+        for index in range(args.processes)
+    ]
+    for process in processes:
+        process.start()
+    
+    def shutdown(signum, frame):
+        for process in processes:
+            if process.is_alive():
+                process.terminate()
+    
+    signal.signal(signal.SIGTERM, shutdown)
+    signal.signal(signal.SIGINT, shutdown)
+    
+    for process in processes:
+        process.join()
+        mark_process_dead(process.pid)
+    
+    logger.info('Workers de chat detenidos')
+
+
+if __name__ == '__main__':
+    main()